@@ -0,0 +1,56 @@
+"""Indexes on the trades, backtests and bots hot query paths
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-06-01 00:00:00
+
+The tables are created by app.initial_data (create_all), which also owns
+new tables such as backtest_trades and bot_performance_daily. Migrations
+only change existing tables. create_all builds these indexes on a new
+database, so they are only added when missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Open trade lookup on every bot tick
+    op.create_index("ix_trades_bot_id_status", "trades", ["bot_id", "status"], if_not_exists=True)
+    op.create_index(
+        "ix_trades_open_bot_id",
+        "trades",
+        ["bot_id"],
+        postgresql_where=sa.text("status = 'open'"),
+        sqlite_where=sa.text("status = 'open'"),
+        if_not_exists=True
+    )
+
+    # Trades of a bot in exit order (performance and trade history)
+    op.create_index("ix_trades_bot_id_exit_time", "trades", ["bot_id", "exit_time", "id"], if_not_exists=True)
+
+    # User's backtests and sweeps, newest first
+    op.create_index("ix_backtests_user_id_created_at", "backtests", ["user_id", "created_at"], if_not_exists=True)
+    op.create_index(
+        "ix_backtest_sweeps_user_id_created_at",
+        "backtest_sweeps",
+        ["user_id", "created_at"],
+        if_not_exists=True
+    )
+
+    # User's bots and bot indicators
+    op.create_index("ix_bots_user_id", "bots", ["user_id"], if_not_exists=True)
+    op.create_index("ix_bot_indicators_bot_id", "bot_indicators", ["bot_id"], if_not_exists=True)
+
+def downgrade() -> None:
+    op.drop_index("ix_bot_indicators_bot_id", table_name="bot_indicators", if_exists=True)
+    op.drop_index("ix_bots_user_id", table_name="bots", if_exists=True)
+    op.drop_index("ix_backtest_sweeps_user_id_created_at", table_name="backtest_sweeps", if_exists=True)
+    op.drop_index("ix_backtests_user_id_created_at", table_name="backtests", if_exists=True)
+    op.drop_index("ix_trades_bot_id_exit_time", table_name="trades", if_exists=True)
+    op.drop_index("ix_trades_open_bot_id", table_name="trades", if_exists=True)
+    op.drop_index("ix_trades_bot_id_status", table_name="trades", if_exists=True)
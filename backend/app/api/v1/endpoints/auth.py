@@ -4,20 +4,29 @@ import logging
 
 from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
-from app.api.deps import get_db
+from app.api.deps import get_async_db
 from app.core.config import settings
-from app.auth.jwt import create_access_token, verify_password
+from app.auth.hashing import PasswordHasherBusy, password_hasher
+from app.auth.jwt import create_access_token
 from app.auth.deps import get_current_user
 
 router = APIRouter()
 
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, try again later",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=schemas.User)
-def register_user(
+async def register_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: schemas.UserCreate,
 ) -> Any:
     """
@@ -27,7 +36,8 @@ def register_user(
         logging.info(f"Received registration request: {user_in}")
         
         # Check if user with this email exists
-        user = db.query(models.User).filter(models.User.email == user_in.email).first()
+        result = await db.execute(select(models.User).filter(models.User.email == user_in.email))
+        user = result.scalars().first()
         if user:
             error_msg = "A user with this email already exists."
             logging.error(error_msg)
@@ -37,7 +47,8 @@ def register_user(
             )
         
         # Check if user with this username exists
-        user = db.query(models.User).filter(models.User.username == user_in.username).first()
+        result = await db.execute(select(models.User).filter(models.User.username == user_in.username))
+        user = result.scalars().first()
         if user:
             error_msg = "A user with this username already exists."
             logging.error(error_msg)
@@ -46,24 +57,28 @@ def register_user(
                 detail=error_msg,
             )
         
+        try:
+            hashed_password = await password_hasher.hash(user_in.password)
+        except PasswordHasherBusy:
+            raise _busy()
+        
         # Create new user
         try:
-            from app.auth.jwt import get_password_hash
             user = models.User(
                 email=user_in.email,
                 username=user_in.username,
-                hashed_password=get_password_hash(user_in.password),
+                hashed_password=hashed_password,
                 first_name=user_in.first_name,
                 last_name=user_in.last_name,
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             
             return user
         except Exception as e:
             logging.error(f"Error creating user: {str(e)}")
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error creating user: {str(e)}",
@@ -78,20 +93,35 @@ def register_user(
         )
 
 @router.post("/login", response_model=schemas.Token)
-def login(
-    db: Session = Depends(get_db),
+async def login(
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    # Try to find user by username
-    user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user:
-        # Try to find user by email
-        user = db.query(models.User).filter(models.User.email == form_data.username).first()
+    # Find user by username or email, the username wins if both match
+    result = await db.execute(
+        select(models.User)
+        .filter(or_(models.User.username == form_data.username, models.User.email == form_data.username))
+        .order_by((models.User.username == form_data.username).desc())
+        .limit(1)
+    )
+    user = result.scalars().first()
+    
+    valid = False
+    if user:
+        try:
+            valid, new_hash = await password_hasher.verify(form_data.password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise _busy()
+        
+        # The hash was made with other cost settings, store the upgraded one
+        if valid and new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
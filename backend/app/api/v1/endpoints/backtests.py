@@ -1,42 +1,50 @@
-from typing import Any, List, Dict
-import asyncio
-import pandas as pd
-import numpy as np
-import json
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any, List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 from datetime import datetime, timedelta
 
 from app import models, schemas
-from app.api.deps import get_db, get_current_user
-from app.bots.trading_bot import TradingBot
-from app.utils import market_data
-from app.indicators.calculator import calculate_indicators
+from app.api.deps import get_db, get_async_db, get_current_user, get_current_user_async
+from app.core.config import settings
+from app.core.responses import FastJSONResponse, fast_json_response
+from app.backtesting.executor import backtest_executor
+from app.backtesting.ledger import legacy_ledger
+from app.backtesting.sweep import SUMMARY_METRICS, count_combinations
+from app.indicators.config import get_indicators_config
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 
-router = APIRouter()
+# Backtest ledgers and sweep results can hold many thousands of entries
+router = APIRouter(default_response_class=FastJSONResponse)
 
-@router.get("/", response_model=List[schemas.Backtest])
-def read_backtests(
-    db: Session = Depends(get_db),
+# Largest page of a backtest ledger
+LEDGER_MAX_LIMIT = 10000
+
+@router.get("/", response_model=List[schemas.BacktestSummary])
+async def read_backtests(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_async),
 ) -> Any:
     """
-    Retrieve all user's backtests.
+    Retrieve all user's backtests, with their summary metrics only.
     """
-    backtests = db.query(models.Backtest).filter(
-        models.Backtest.user_id == current_user.id
-    ).order_by(models.Backtest.created_at.desc()).offset(skip).limit(limit).all()
+    # The results column is deferred on the model, only summary columns are read
+    result = await db.execute(
+        select(models.Backtest).where(
+            models.Backtest.user_id == current_user.id
+        ).order_by(models.Backtest.created_at.desc()).offset(skip).limit(limit)
+    )
     
-    return backtests
+    return fast_json_response(List[schemas.BacktestSummary], result.scalars().all())
 
 @router.post("/", response_model=schemas.Backtest)
-async def create_backtest(
+def create_backtest(
     *,
     db: Session = Depends(get_db),
     backtest_in: schemas.BacktestCreate,
-    background_tasks: BackgroundTasks,
     current_user: models.User = Depends(get_current_user),
 ) -> Any:
     """
@@ -54,22 +62,7 @@ async def create_backtest(
             detail="Bot not found",
         )
     
-    # Get bot indicators
-    bot_indicators = db.query(models.BotIndicator).filter(
-        models.BotIndicator.bot_id == bot.id
-    ).all()
-    
-    indicators_config = {}
-    for bi in bot_indicators:
-        indicator = db.query(models.Indicator).filter(
-            models.Indicator.id == bi.indicator_id
-        ).first()
-        
-        if indicator:
-            indicators_config[indicator.name] = {
-                "parameters": bi.parameters,
-                "base_parameters": indicator.parameters
-            }
+    indicators_config = get_indicators_config(db, bot.id)
     
     # Create backtest record
     backtest = models.Backtest(
@@ -89,15 +82,128 @@ async def create_backtest(
     db.commit()
     db.refresh(backtest)
     
-    # Run backtest in background
-    background_tasks.add_task(
-        run_backtest, 
-        backtest_id=backtest.id, 
-        db=db
-    )
+    # Run backtest in a worker process, it stays pending until picked up
+    backtest_executor.submit(backtest.id)
     
     return backtest
 
+@router.get("/sweeps", response_model=List[schemas.BacktestSweepSummary])
+async def read_backtest_sweeps(
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    current_user: models.User = Depends(get_current_user_async),
+) -> Any:
+    """
+    Retrieve all user's parameter sweeps, without their ranked results.
+    """
+    # The results column is deferred on the model, only summary columns are read
+    result = await db.execute(
+        select(models.BacktestSweep).where(
+            models.BacktestSweep.user_id == current_user.id
+        ).order_by(models.BacktestSweep.created_at.desc()).offset(skip).limit(limit)
+    )
+    
+    return fast_json_response(List[schemas.BacktestSweepSummary], result.scalars().all())
+
+@router.post("/sweeps", response_model=schemas.BacktestSweep)
+def create_backtest_sweep(
+    *,
+    db: Session = Depends(get_db),
+    sweep_in: schemas.BacktestSweepCreate,
+    current_user: models.User = Depends(get_current_user),
+) -> Any:
+    """
+    Create a parameter sweep: one backtest per combination of indicator
+    parameters, sharing a single data fetch.
+    """
+    bot = db.query(models.Bot).filter(
+        models.Bot.id == sweep_in.bot_id,
+        models.Bot.user_id == current_user.id
+    ).first()
+    
+    if not bot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bot not found",
+        )
+    
+    if sweep_in.rank_by not in SUMMARY_METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"rank_by must be one of: {', '.join(SUMMARY_METRICS)}",
+        )
+    
+    indicators_config = get_indicators_config(db, bot.id)
+    
+    # Count before expanding, the grid size is only bounded by the request
+    try:
+        total_combinations = count_combinations(indicators_config, sweep_in.parameter_grid)
+    except (ValueError, KeyError, TypeError, OverflowError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid parameter grid: {e}",
+        )
+    
+    if not total_combinations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The parameter grid is empty",
+        )
+    
+    if total_combinations > settings.BACKTEST_SWEEP_MAX_COMBINATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many combinations ({total_combinations}), the limit is {settings.BACKTEST_SWEEP_MAX_COMBINATIONS}",
+        )
+    
+    sweep = models.BacktestSweep(
+        bot_id=bot.id,
+        user_id=current_user.id,
+        start_date=sweep_in.start_date,
+        end_date=sweep_in.end_date,
+        status="pending",
+        pair=bot.pair,
+        timeframe=bot.timeframe,
+        buy_condition=bot.buy_condition,
+        sell_condition=bot.sell_condition,
+        indicators_config=indicators_config,
+        parameter_grid=sweep_in.parameter_grid,
+        rank_by=sweep_in.rank_by,
+        total_combinations=total_combinations
+    )
+    
+    db.add(sweep)
+    db.commit()
+    db.refresh(sweep)
+    
+    backtest_executor.submit_sweep(sweep.id)
+    
+    return sweep
+
+@router.get("/sweeps/{sweep_id}", response_model=schemas.BacktestSweep)
+def read_backtest_sweep(
+    *,
+    db: Session = Depends(get_db),
+    sweep_id: int,
+    current_user: models.User = Depends(get_current_user),
+) -> Any:
+    """
+    Get a specific parameter sweep with its ranked results.
+    """
+    sweep = db.query(models.BacktestSweep).options(undefer(models.BacktestSweep.results)).filter(
+        models.BacktestSweep.id == sweep_id,
+        models.BacktestSweep.user_id == current_user.id
+    ).first()
+    
+    if not sweep:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sweep not found",
+        )
+    
+    return fast_json_response(schemas.BacktestSweep, sweep)
+
 @router.get("/{backtest_id}", response_model=schemas.Backtest)
 def read_backtest(
     *,
@@ -108,7 +214,7 @@ def read_backtest(
     """
     Get a specific backtest by ID.
     """
-    backtest = db.query(models.Backtest).filter(
+    backtest = db.query(models.Backtest).options(undefer(models.Backtest.results)).filter(
         models.Backtest.id == backtest_id,
         models.Backtest.user_id == current_user.id
     ).first()
@@ -119,9 +225,61 @@ def read_backtest(
             detail="Backtest not found",
         )
     
-    return backtest
+    return fast_json_response(schemas.Backtest, backtest)
+
+@router.get("/{backtest_id}/ledger", response_model=List[schemas.BacktestTrade])
+async def read_backtest_ledger(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    backtest_id: int,
+    limit: int = Query(1000, ge=1, le=LEDGER_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    current_user: models.User = Depends(get_current_user_async),
+) -> Any:
+    """
+    Get the closed trades of a backtest in trade order, each with the equity
+    after it. Buy and sell positions are the entries and exits of the trades.
+    
+    Pass the X-Next-Cursor header of a response as `cursor` to get the next
+    page.
+    """
+    result = await db.execute(
+        select(models.Backtest.id).where(
+            models.Backtest.id == backtest_id,
+            models.Backtest.user_id == current_user.id
+        )
+    )
+    if result.scalar() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backtest not found",
+        )
+    
+    query = select(models.BacktestTrade).where(models.BacktestTrade.backtest_id == backtest_id)
+    if cursor:
+        try:
+            _, trade_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+        query = query.where(models.BacktestTrade.id > trade_id)
+    
+    result = await db.execute(query.order_by(models.BacktestTrade.id).limit(limit))
+    trades = result.scalars().all()
+    
+    if not trades and not cursor:
+        # Run before the ledger table existed, the trades are in the results
+        result = await db.execute(select(models.Backtest.results).where(models.Backtest.id == backtest_id))
+        return fast_json_response(List[schemas.BacktestTrade], legacy_ledger(result.scalar()))
+    
+    response = fast_json_response(List[schemas.BacktestTrade], trades)
+    if trades and len(trades) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(None, trades[-1].id)
+    return response
 
-@router.delete("/{backtest_id}", response_model=schemas.Backtest)
+@router.delete("/{backtest_id}", response_model=schemas.BacktestSummary)
 def delete_backtest(
     *,
     db: Session = Depends(get_db),
@@ -146,249 +304,3 @@ def delete_backtest(
     db.commit()
     
     return backtest
-
-async def run_backtest(backtest_id: int, db: Session) -> None:
-    """
-    Run a backtest and update the results.
-    """
-    # Get the db session in this task context
-    backtest = db.query(models.Backtest).filter(models.Backtest.id == backtest_id).first()
-    
-    if not backtest or backtest.status == "completed":
-        return
-    
-    try:
-        # Update status to running
-        backtest.status = "running"
-        db.add(backtest)
-        db.commit()
-        
-        # Get historical data
-        historical_data = await market_data.get_historical_data(
-            backtest.pair,
-            backtest.timeframe,
-            backtest.start_date,
-            backtest.end_date
-        )
-        
-        # Convert to DataFrame
-        df = market_data.get_dataframe(historical_data)
-        
-        if df.empty:
-            backtest.status = "failed"
-            backtest.results = {"error": "No data available for the selected period"}
-            db.add(backtest)
-            db.commit()
-            return
-        
-        # Calculate indicators
-        df = calculate_indicators(df, backtest.indicators_config)
-        
-        # Run backtest
-        results = simulate_trades(
-            df, 
-            backtest.buy_condition, 
-            backtest.sell_condition
-        )
-        
-        # Update backtest with results
-        backtest.status = "completed"
-        backtest.results = results
-        backtest.win_rate = results.get("win_rate")
-        backtest.profit_factor = results.get("profit_factor")
-        backtest.total_trades = results.get("total_trades")
-        backtest.average_profit = results.get("average_profit")
-        backtest.max_drawdown = results.get("max_drawdown")
-        backtest.sharpe_ratio = results.get("sharpe_ratio")
-        
-        db.add(backtest)
-        db.commit()
-        
-    except Exception as e:
-        # Update status to failed
-        backtest.status = "failed"
-        backtest.results = {"error": str(e)}
-        db.add(backtest)
-        db.commit()
-        print(f"Error running backtest {backtest_id}: {e}")
-
-def simulate_trades(df: pd.DataFrame, buy_condition: str, sell_condition: str) -> Dict[str, Any]:
-    """
-    Simulate trades based on buy and sell conditions.
-    
-    Args:
-        df: DataFrame with OHLCV and indicator data
-        buy_condition: String with the buy condition
-        sell_condition: String with the sell condition
-        
-    Returns:
-        Dictionary with backtest results
-    """
-    trades = []
-    positions = []
-    
-    in_position = False
-    entry_price = 0
-    entry_time = None
-    
-    # Loop through each candle
-    for i, row in df.iterrows():
-        row_dict = row.to_dict()
-        row_dict['time'] = i  # Add time to the dict for condition evaluation
-        
-        if not in_position:
-            # Check buy condition
-            try:
-                buy_result = eval(buy_condition, {"np": np, "pd": pd}, row_dict)
-                
-                if buy_result:
-                    # Enter position
-                    in_position = True
-                    entry_price = row['close']
-                    entry_time = i
-                    
-                    positions.append({
-                        'type': 'buy',
-                        'price': entry_price,
-                        'time': entry_time
-                    })
-            except Exception as e:
-                print(f"Error evaluating buy condition: {e}")
-        else:
-            # Check sell condition
-            try:
-                sell_result = eval(sell_condition, {"np": np, "pd": pd}, row_dict)
-                
-                if sell_result:
-                    # Exit position
-                    exit_price = row['close']
-                    exit_time = i
-                    
-                    # Calculate profit/loss
-                    profit_loss = (exit_price - entry_price) / entry_price * 100
-                    
-                    trades.append({
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'entry_time': entry_time,
-                        'exit_time': exit_time,
-                        'profit_loss': profit_loss,
-                        'profit_loss_amount': exit_price - entry_price
-                    })
-                    
-                    positions.append({
-                        'type': 'sell',
-                        'price': exit_price,
-                        'time': exit_time
-                    })
-                    
-                    in_position = False
-            except Exception as e:
-                print(f"Error evaluating sell condition: {e}")
-    
-    # Close any open position at the end
-    if in_position:
-        exit_price = df.iloc[-1]['close']
-        exit_time = df.index[-1]
-        
-        # Calculate profit/loss
-        profit_loss = (exit_price - entry_price) / entry_price * 100
-        
-        trades.append({
-            'entry_price': entry_price,
-            'exit_price': exit_price,
-            'entry_time': entry_time,
-            'exit_time': exit_time,
-            'profit_loss': profit_loss,
-            'profit_loss_amount': exit_price - entry_price
-        })
-        
-        positions.append({
-            'type': 'sell',
-            'price': exit_price,
-            'time': exit_time
-        })
-    
-    # Calculate statistics
-    total_trades = len(trades)
-    
-    if total_trades == 0:
-        return {
-            'total_trades': 0,
-            'winning_trades': 0,
-            'losing_trades': 0,
-            'win_rate': 0,
-            'profit_factor': 0,
-            'total_profit': 0,
-            'average_profit': 0,
-            'max_drawdown': 0,
-            'sharpe_ratio': 0,
-            'trades': [],
-            'positions': [],
-            'equity_curve': []
-        }
-    
-    winning_trades = sum(1 for trade in trades if trade['profit_loss'] > 0)
-    losing_trades = sum(1 for trade in trades if trade['profit_loss'] <= 0)
-    
-    win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
-    
-    # Calculate profit factor
-    gross_profit = sum(trade['profit_loss_amount'] for trade in trades if trade['profit_loss'] > 0)
-    gross_loss = abs(sum(trade['profit_loss_amount'] for trade in trades if trade['profit_loss'] <= 0))
-    profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
-    
-    total_profit = sum(trade['profit_loss'] for trade in trades)
-    average_profit = total_profit / total_trades if total_trades > 0 else 0
-    
-    # Calculate equity curve
-    equity_curve = []
-    current_equity = 100  # Start with 100 units
-    
-    for trade in trades:
-        current_equity *= (1 + trade['profit_loss'] / 100)
-        equity_curve.append({
-            'time': trade['exit_time'].isoformat(),
-            'equity': current_equity
-        })
-    
-    # Calculate drawdown
-    max_drawdown = 0
-    peak = 100
-    
-    for point in equity_curve:
-        equity = point['equity']
-        if equity > peak:
-            peak = equity
-        
-        drawdown = (peak - equity) / peak * 100
-        max_drawdown = max(max_drawdown, drawdown)
-    
-    # Calculate Sharpe ratio (simplified)
-    returns = [trade['profit_loss'] for trade in trades]
-    mean_return = np.mean(returns)
-    std_return = np.std(returns)
-    sharpe_ratio = mean_return / std_return if std_return > 0 else 0
-    
-    # Convert times to ISO format for JSON serialization
-    for trade in trades:
-        trade['entry_time'] = trade['entry_time'].isoformat()
-        trade['exit_time'] = trade['exit_time'].isoformat()
-    
-    for position in positions:
-        position['time'] = position['time'].isoformat()
-    
-    return {
-        'total_trades': total_trades,
-        'winning_trades': winning_trades,
-        'losing_trades': losing_trades,
-        'win_rate': win_rate,
-        'profit_factor': profit_factor,
-        'total_profit': total_profit,
-        'average_profit': average_profit,
-        'max_drawdown': max_drawdown,
-        'sharpe_ratio': sharpe_ratio,
-        'trades': trades,
-        'positions': positions,
-        'equity_curve': equity_curve
-    } 
\ No newline at end of file
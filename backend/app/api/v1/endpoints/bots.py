@@ -1,15 +1,18 @@
 from typing import Any, List, Dict
 import threading
-from datetime import datetime
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
 
 from app import models, schemas
-from app.api.deps import get_db, get_current_user, get_current_active_superuser
+from app.api.deps import get_db, get_async_db, get_current_user, get_current_user_async, get_current_active_superuser
 from app.bots.trading_bot import TradingBot
+from app.bots.conditions import ConditionError
+from app.core.responses import FastJSONResponse
 from app.utils import telegram
+from app.utils.performance import rollup_filters, trade_statistics, cumulative_profit_series
 
 router = APIRouter()
 
@@ -17,33 +20,22 @@ router = APIRouter()
 active_bots = {}
 
 @router.get("/", response_model=List[schemas.Bot])
-def read_bots(
-    db: Session = Depends(get_db),
+async def read_bots(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_async),
 ) -> Any:
     """
     Retrieve all user's bots.
     """
-    # Check the bot limit based on user's subscription
-    if current_user.subscription:
-        bot_limit = current_user.subscription.bot_limit
-    else:
-        # Default limit for users without a subscription
-        bot_limit = 1
-    
-    # Get the count of user's active bots
-    bot_count = db.query(func.count(models.Bot.id)).filter(
-        models.Bot.user_id == current_user.id,
-        models.Bot.is_active == True
-    ).scalar()
-    
-    bots = db.query(models.Bot).filter(
-        models.Bot.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(models.Bot).where(
+            models.Bot.user_id == current_user.id
+        ).offset(skip).limit(limit)
+    )
     
-    return bots
+    return result.scalars().all()
 
 @router.post("/", response_model=schemas.Bot)
 def create_bot(
@@ -104,19 +96,25 @@ def create_bot(
     return bot
 
 @router.get("/{bot_id}", response_model=schemas.BotWithIndicators)
-def read_bot(
+async def read_bot(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     bot_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_async),
 ) -> Any:
     """
     Get a specific bot by ID.
     """
-    bot = db.query(models.Bot).filter(
-        models.Bot.id == bot_id,
-        models.Bot.user_id == current_user.id
-    ).first()
+    # The indicators and their definitions are loaded with the bot, not one by one
+    result = await db.execute(
+        select(models.Bot).options(
+            selectinload(models.Bot.indicators).joinedload(models.BotIndicator.indicator)
+        ).where(
+            models.Bot.id == bot_id,
+            models.Bot.user_id == current_user.id
+        )
+    )
+    bot = result.scalars().first()
     
     if not bot:
         raise HTTPException(
@@ -221,7 +219,6 @@ def start_bot(
     *,
     db: Session = Depends(get_db),
     bot_id: int,
-    background_tasks: BackgroundTasks,
     current_user: models.User = Depends(get_current_user),
 ) -> Any:
     """
@@ -260,18 +257,24 @@ def start_bot(
         )
     
     # Initialize the trading bot
-    trading_bot = TradingBot(
-        bot_id=bot.id,
-        pair=bot.pair,
-        timeframe=bot.timeframe,
-        buy_condition=bot.buy_condition,
-        sell_condition=bot.sell_condition,
-        db_session=db,
-        telegram_channel=bot.telegram_channel
-    )
+    try:
+        trading_bot = TradingBot(
+            bot_id=bot.id,
+            pair=bot.pair,
+            timeframe=bot.timeframe,
+            buy_condition=bot.buy_condition,
+            sell_condition=bot.sell_condition,
+            db_session=db,
+            telegram_channel=bot.telegram_channel
+        )
+    except ConditionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     
-    # Start the bot in a background thread
-    background_tasks.add_task(trading_bot.start)
+    # Schedule the bot on the shared bot runtime
+    trading_bot.start()
     
     # Store the bot instance
     active_bots[bot.id] = trading_bot
@@ -324,79 +327,34 @@ def stop_bot(
     
     return bot
 
-@router.get("/performance", response_model=Dict[str, Any])
-def get_global_performance(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+@router.get("/performance", response_model=Dict[str, Any], response_class=FastJSONResponse)
+async def get_global_performance(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
 ) -> Any:
     """
     Get global performance statistics for all user's bots.
     """
-    # Get all user's trades
-    trades = db.query(models.Trade).join(
-        models.Bot, models.Trade.bot_id == models.Bot.id
-    ).filter(
-        models.Bot.user_id == current_user.id,
-        models.Trade.status == "closed"
-    ).all()
-    
-    if not trades:
-        return {
-            "total_trades": 0,
-            "winning_trades": 0,
-            "losing_trades": 0,
-            "win_rate": 0,
-            "total_profit_loss": 0,
-            "average_profit_loss": 0,
-        }
-    
-    total_trades = len(trades)
-    winning_trades = sum(1 for trade in trades if trade.profit_loss and trade.profit_loss > 0)
-    losing_trades = sum(1 for trade in trades if trade.profit_loss and trade.profit_loss < 0)
-    
-    win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
-    
-    total_profit_loss = sum(trade.profit_loss for trade in trades if trade.profit_loss is not None)
-    average_profit_loss = total_profit_loss / total_trades if total_trades > 0 else 0
-    
-    # Get time series data for performance chart
-    # (This is a simplified version)
-    time_series = []
-    current_value = 0
-    
-    for trade in sorted(trades, key=lambda x: x.exit_time if x.exit_time else datetime.min):
-        if trade.profit_loss is not None:
-            current_value += trade.profit_loss
-            time_series.append({
-                "time": trade.exit_time.isoformat() if trade.exit_time else None,
-                "value": current_value
-            })
-    
-    return {
-        "total_trades": total_trades,
-        "winning_trades": winning_trades,
-        "losing_trades": losing_trades,
-        "win_rate": win_rate,
-        "total_profit_loss": total_profit_loss,
-        "average_profit_loss": average_profit_loss,
-        "time_series": time_series,
-    }
+    return await db.run_sync(_performance_statistics, rollup_filters(user_id=current_user.id))
 
-@router.get("/{bot_id}/performance", response_model=Dict[str, Any])
-def get_bot_performance(
+@router.get("/{bot_id}/performance", response_model=Dict[str, Any], response_class=FastJSONResponse)
+async def get_bot_performance(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     bot_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_async),
 ) -> Any:
     """
     Get performance statistics for a specific bot.
     """
     # Check if bot exists and belongs to user
-    bot = db.query(models.Bot).filter(
-        models.Bot.id == bot_id,
-        models.Bot.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(models.Bot.id).where(
+            models.Bot.id == bot_id,
+            models.Bot.user_id == current_user.id
+        )
+    )
+    bot = result.scalar()
     
     if not bot:
         raise HTTPException(
@@ -404,13 +362,16 @@ def get_bot_performance(
             detail="Bot not found",
         )
     
-    # Get bot trades
-    trades = db.query(models.Trade).filter(
-        models.Trade.bot_id == bot_id,
-        models.Trade.status == "closed"
-    ).all()
+    return await db.run_sync(_performance_statistics, rollup_filters(bot_id=bot_id))
+
+def _performance_statistics(db: Session, filters: List[Any]) -> Dict[str, Any]:
+    """
+    Sum the daily performance rows matching the filters.
+    """
+    stats = trade_statistics(db, filters)
+    total_trades = stats["total_trades"]
     
-    if not trades:
+    if total_trades == 0:
         return {
             "total_trades": 0,
             "winning_trades": 0,
@@ -420,33 +381,15 @@ def get_bot_performance(
             "average_profit_loss": 0,
         }
     
-    total_trades = len(trades)
-    winning_trades = sum(1 for trade in trades if trade.profit_loss and trade.profit_loss > 0)
-    losing_trades = sum(1 for trade in trades if trade.profit_loss and trade.profit_loss < 0)
-    
-    win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
-    
-    total_profit_loss = sum(trade.profit_loss for trade in trades if trade.profit_loss is not None)
-    average_profit_loss = total_profit_loss / total_trades if total_trades > 0 else 0
-    
-    # Get time series data for performance chart
-    time_series = []
-    current_value = 0
-    
-    for trade in sorted(trades, key=lambda x: x.exit_time if x.exit_time else datetime.min):
-        if trade.profit_loss is not None:
-            current_value += trade.profit_loss
-            time_series.append({
-                "time": trade.exit_time.isoformat() if trade.exit_time else None,
-                "value": current_value
-            })
+    total_profit_loss = stats["total_profit_loss"]
     
     return {
         "total_trades": total_trades,
-        "winning_trades": winning_trades,
-        "losing_trades": losing_trades,
-        "win_rate": win_rate,
+        "winning_trades": stats["winning_trades"],
+        "losing_trades": stats["losing_trades"],
+        "win_rate": (stats["winning_trades"] / total_trades) * 100,
         "total_profit_loss": total_profit_loss,
-        "average_profit_loss": average_profit_loss,
-        "time_series": time_series,
-    } 
\ No newline at end of file
+        "average_profit_loss": total_profit_loss / total_trades,
+        # Running P/L total at the end of each day, downsampled for the chart
+        "time_series": cumulative_profit_series(db, filters),
+    }
@@ -1,15 +1,18 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api.deps import get_db, get_current_user, get_current_active_superuser
+from app.core.config import settings
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Indicator])
 def read_indicators(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -18,8 +21,14 @@ def read_indicators(
     """
     Retrieve all available indicators.
     """
-    indicators = db.query(models.Indicator).filter(models.Indicator.is_active == True).offset(skip).limit(limit).all()
-    return indicators
+    # The catalog is the same for every user, so it is cached once for all
+    return response_cache.respond(
+        request,
+        "indicators",
+        settings.RESPONSE_CACHE_CATALOG_TTL,
+        List[schemas.Indicator],
+        lambda: db.query(models.Indicator).filter(models.Indicator.is_active == True).offset(skip).limit(limit).all()
+    )
 
 @router.post("/", response_model=schemas.Indicator)
 def create_indicator(
@@ -46,6 +55,7 @@ def create_indicator(
     )
     db.add(indicator)
     db.commit()
+    response_cache.invalidate("indicators")
     db.refresh(indicator)
     return indicator
 
@@ -91,6 +101,7 @@ def update_indicator(
     
     db.add(indicator)
     db.commit()
+    response_cache.invalidate("indicators")
     db.refresh(indicator)
     return indicator
 
@@ -115,5 +126,6 @@ def delete_indicator(
     indicator.is_active = False
     db.add(indicator)
     db.commit()
+    response_cache.invalidate("indicators")
     db.refresh(indicator)
     return indicator 
\ No newline at end of file
@@ -1,16 +1,19 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api.deps import get_db, get_current_user, get_current_active_superuser
+from app.core.config import settings
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
 # Tutorial endpoints
 @router.get("/tutorials", response_model=List[schemas.Tutorial])
 def read_tutorials(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -18,33 +21,43 @@ def read_tutorials(
     """
     Retrieve all tutorials.
     """
-    tutorials = db.query(models.Tutorial).filter(
-        models.Tutorial.is_published == True
-    ).offset(skip).limit(limit).all()
-    
-    return tutorials
+    return response_cache.respond(
+        request,
+        "tutorials",
+        settings.RESPONSE_CACHE_MARKETING_TTL,
+        List[schemas.Tutorial],
+        lambda: db.query(models.Tutorial).filter(
+            models.Tutorial.is_published == True
+        ).offset(skip).limit(limit).all()
+    )
 
 @router.get("/tutorials/{slug}", response_model=schemas.Tutorial)
 def read_tutorial(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     slug: str,
 ) -> Any:
     """
     Get a specific tutorial by slug.
     """
-    tutorial = db.query(models.Tutorial).filter(
-        models.Tutorial.slug == slug,
-        models.Tutorial.is_published == True
-    ).first()
-    
-    if not tutorial:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tutorial not found",
-        )
+    def load() -> models.Tutorial:
+        tutorial = db.query(models.Tutorial).filter(
+            models.Tutorial.slug == slug,
+            models.Tutorial.is_published == True
+        ).first()
+        
+        if not tutorial:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tutorial not found",
+            )
+        
+        return tutorial
     
-    return tutorial
+    return response_cache.respond(
+        request, "tutorials", settings.RESPONSE_CACHE_MARKETING_TTL, schemas.Tutorial, load
+    )
 
 @router.post("/tutorials", response_model=schemas.Tutorial)
 def create_tutorial(
@@ -74,6 +87,7 @@ def create_tutorial(
     
     db.add(tutorial)
     db.commit()
+    response_cache.invalidate("tutorials")
     db.refresh(tutorial)
     
     return tutorial
@@ -115,6 +129,7 @@ def update_tutorial(
     
     db.add(tutorial)
     db.commit()
+    response_cache.invalidate("tutorials")
     db.refresh(tutorial)
     
     return tutorial
@@ -138,12 +153,14 @@ def delete_tutorial(
     
     db.delete(tutorial)
     db.commit()
+    response_cache.invalidate("tutorials")
     
     return tutorial
 
 # Opinion endpoints
 @router.get("/opinions", response_model=List[schemas.Opinion])
 def read_opinions(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -151,11 +168,15 @@ def read_opinions(
     """
     Retrieve all opinions.
     """
-    opinions = db.query(models.Opinion).filter(
-        models.Opinion.is_published == True
-    ).offset(skip).limit(limit).all()
-    
-    return opinions
+    return response_cache.respond(
+        request,
+        "opinions",
+        settings.RESPONSE_CACHE_MARKETING_TTL,
+        List[schemas.Opinion],
+        lambda: db.query(models.Opinion).filter(
+            models.Opinion.is_published == True
+        ).offset(skip).limit(limit).all()
+    )
 
 @router.post("/opinions", response_model=schemas.Opinion)
 def create_opinion(
@@ -178,6 +199,7 @@ def create_opinion(
     
     db.add(opinion)
     db.commit()
+    response_cache.invalidate("opinions")
     db.refresh(opinion)
     
     return opinion
@@ -206,6 +228,7 @@ def update_opinion(
     
     db.add(opinion)
     db.commit()
+    response_cache.invalidate("opinions")
     db.refresh(opinion)
     
     return opinion
@@ -229,5 +252,6 @@ def delete_opinion(
     
     db.delete(opinion)
     db.commit()
+    response_cache.invalidate("opinions")
     
     return opinion 
\ No newline at end of file
@@ -1,31 +1,68 @@
-from typing import Any, List, Dict
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+import csv
+import io
+from typing import Any, Iterator, List, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, select
 from datetime import datetime, timedelta
 
 from app import models, schemas
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_async_db, get_current_user, get_current_user_async
+from app.core.database import SessionLocal
+from app.core.responses import FastJSONResponse
+from app.utils import fastjson
+from app.utils.pagination import NEXT_CURSOR_HEADER, after_descending, decode_cursor, encode_cursor
+from app.utils.performance import (
+    rollup_filters,
+    trade_statistics,
+    equity_curve,
+    bot_comparison,
+)
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
+
+# Largest page of the trades list
+TRADES_MAX_LIMIT = 1000
+
+# Trades read per round trip when exporting
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_COLUMNS = [
+    "id",
+    "bot_id",
+    "pair",
+    "timeframe",
+    "type",
+    "status",
+    "entry_price",
+    "exit_price",
+    "quantity",
+    "profit_loss",
+    "profit_loss_percent",
+    "entry_time",
+    "exit_time",
+    "indicators_values",
+    "created_at",
+    "updated_at",
+]
 
 @router.get("/", response_model=schemas.PerformanceSummary)
-def get_performance_summary(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+async def get_performance_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
     timeframe: str = "all",  # all, week, month, year
 ) -> Any:
     """
     Get performance summary for all bots.
     """
     # Filter by time period if specified
-    trades_query = db.query(models.Trade).join(
-        models.Bot, models.Trade.bot_id == models.Bot.id
-    ).filter(
-        models.Bot.user_id == current_user.id,
-        models.Trade.status == "closed"
-    )
-    
+    start_date = None
     if timeframe != "all":
         now = datetime.utcnow()
         if timeframe == "week":
@@ -36,13 +73,12 @@ def get_performance_summary(
             start_date = now - timedelta(days=365)
         else:
             start_date = now - timedelta(days=30)  # Default to month
-        
-        trades_query = trades_query.filter(models.Trade.exit_time >= start_date)
     
-    trades = trades_query.order_by(models.Trade.exit_time).all()
+    filters = rollup_filters(user_id=current_user.id, since=start_date)
     
-    # Calculate performance metrics
-    total_trades = len(trades)
+    # Calculate performance metrics from the daily rollup
+    stats = await db.run_sync(trade_statistics, filters)
+    total_trades = stats["total_trades"]
     
     if total_trades == 0:
         return {
@@ -58,137 +94,156 @@ def get_performance_summary(
             "time_series": []
         }
     
-    winning_trades = sum(1 for trade in trades if trade.profit_loss and trade.profit_loss > 0)
-    losing_trades = sum(1 for trade in trades if trade.profit_loss and trade.profit_loss <= 0)
-    
-    win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
+    win_rate = (stats["winning_trades"] / total_trades) * 100
     
-    # Calculate profit factor
-    gross_profit = sum(trade.profit_loss for trade in trades if trade.profit_loss and trade.profit_loss > 0)
-    gross_loss = abs(sum(trade.profit_loss for trade in trades if trade.profit_loss and trade.profit_loss <= 0))
-    profit_factor = gross_profit / gross_loss if gross_loss > 0 else None
+    gross_loss = stats["gross_loss"]
+    profit_factor = stats["gross_profit"] / gross_loss if gross_loss > 0 else None
     
-    total_profit_loss = sum(trade.profit_loss for trade in trades if trade.profit_loss is not None)
-    average_profit_loss = total_profit_loss / total_trades if total_trades > 0 else 0
+    total_profit_loss = stats["total_profit_loss"]
+    average_profit_loss = total_profit_loss / total_trades
     
-    # Calculate equity curve for time series
-    time_series = []
-    equity = 1000  # Start with 1000 units
-    max_equity = equity
-    max_drawdown = 0
-    
-    for trade in sorted(trades, key=lambda x: x.exit_time):
-        if trade.profit_loss:
-            equity *= (1 + trade.profit_loss / 100)
-            
-            # Calculate drawdown
-            if equity > max_equity:
-                max_equity = equity
-            drawdown = (max_equity - equity) / max_equity * 100
-            max_drawdown = max(max_drawdown, drawdown)
-            
-            time_series.append({
-                "time": trade.exit_time.isoformat(),
-                "equity": equity,
-                "drawdown": drawdown
-            })
+    # Equity curve and drawdown, downsampled for the chart
+    equity = await db.run_sync(equity_curve, filters)
     
     # Calculate Sharpe ratio (simplified)
-    returns = [trade.profit_loss for trade in trades if trade.profit_loss is not None]
-    if returns:
-        import numpy as np
-        mean_return = np.mean(returns)
-        std_return = np.std(returns)
-        sharpe_ratio = mean_return / std_return if std_return > 0 else None
-    else:
-        sharpe_ratio = None
+    mean_return = stats["mean_profit_loss"]
+    std_return = stats["std_profit_loss"]
+    sharpe_ratio = mean_return / std_return if std_return else None
     
     return {
         "total_trades": total_trades,
-        "winning_trades": winning_trades,
-        "losing_trades": losing_trades,
+        "winning_trades": stats["winning_trades"],
+        "losing_trades": stats["losing_trades"],
         "win_rate": win_rate,
         "profit_factor": profit_factor,
         "total_profit_loss": total_profit_loss,
         "average_profit_loss": average_profit_loss,
-        "max_drawdown": max_drawdown,
+        "max_drawdown": equity["max_drawdown"],
         "sharpe_ratio": sharpe_ratio,
-        "time_series": time_series
+        "time_series": equity["time_series"]
     }
 
 @router.get("/trades", response_model=List[schemas.Trade])
-def get_trades(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
-    skip: int = 0,
-    limit: int = 100,
+async def get_trades(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=TRADES_MAX_LIMIT),
+    cursor: Optional[str] = None,
 ) -> Any:
     """
-    Get all trades for the user.
+    Get all trades for the user, most recently closed first.
+    
+    Pass the X-Next-Cursor header of a response as `cursor` to get the next
+    page; unlike `skip`, its cost does not grow with the page depth. `skip`
+    is ignored when a cursor is given.
     """
-    trades = db.query(models.Trade).join(
+    query = select(models.Trade).join(
         models.Bot, models.Trade.bot_id == models.Bot.id
-    ).filter(
+    ).where(
         models.Bot.user_id == current_user.id
-    ).order_by(desc(models.Trade.exit_time)).offset(skip).limit(limit).all()
+    )
+    
+    if cursor:
+        try:
+            exit_time, trade_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+        query = query.where(after_descending(models.Trade.exit_time, models.Trade.id, exit_time, trade_id))
+    else:
+        query = query.offset(skip)
+    
+    result = await db.execute(query.order_by(
+        models.Trade.exit_time.desc().nulls_first(),
+        models.Trade.id.desc()
+    ).limit(limit))
+    trades = result.scalars().all()
+    
+    if trades and len(trades) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(trades[-1].exit_time, trades[-1].id)
     
     return trades
 
-@router.get("/bots/comparison", response_model=List[Dict[str, Any]])
-def get_bot_performance_comparison(
-    db: Session = Depends(get_db),
+@router.get("/trades/export")
+def export_trades(
     current_user: models.User = Depends(get_current_user),
+    format: str = "csv",  # csv, ndjson
 ) -> Any:
     """
-    Get performance comparison for all bots.
+    Stream all trades of the user as CSV or newline-delimited JSON.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}",
+        )
+    
+    return StreamingResponse(
+        _stream_trades(current_user.id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="trades.{format}"'},
+    )
+
+def _stream_trades(user_id: int, format: str) -> Iterator[str]:
     """
-    bot_performances = []
+    Yield the user's trades in chunks of EXPORT_BATCH_SIZE rows.
     
-    # Get all user's bots
-    bots = db.query(models.Bot).filter(
-        models.Bot.user_id == current_user.id
-    ).all()
-    
-    for bot in bots:
-        # Get closed trades for this bot
-        trades = db.query(models.Trade).filter(
-            models.Trade.bot_id == bot.id,
-            models.Trade.status == "closed"
-        ).all()
-        
-        total_trades = len(trades)
-        
-        if total_trades == 0:
-            bot_performances.append({
-                "bot_id": bot.id,
-                "bot_name": bot.name,
-                "pair": bot.pair,
-                "timeframe": bot.timeframe,
-                "total_trades": 0,
-                "win_rate": 0,
-                "profit_loss": 0,
-                "is_active": bot.is_active,
-                "is_running": bot.is_running
-            })
-            continue
+    The rows are read through a server-side cursor, so memory use does not
+    depend on the number of trades. The generator runs after the request's
+    session is closed and uses its own.
+    """
+    db = SessionLocal()
+    try:
+        trades = models.Trade.__table__
+        result = db.execute(
+            select(*(trades.c[column] for column in EXPORT_COLUMNS)).join(
+                models.Bot.__table__, trades.c.bot_id == models.Bot.id
+            ).where(
+                models.Bot.user_id == user_id
+            ).order_by(
+                trades.c.exit_time.desc().nulls_first(),
+                trades.c.id.desc()
+            ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
         
-        winning_trades = sum(1 for trade in trades if trade.profit_loss and trade.profit_loss > 0)
-        win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
-        total_profit_loss = sum(trade.profit_loss for trade in trades if trade.profit_loss is not None)
+        if format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
         
-        bot_performances.append({
-            "bot_id": bot.id,
-            "bot_name": bot.name,
-            "pair": bot.pair,
-            "timeframe": bot.timeframe,
-            "total_trades": total_trades,
-            "win_rate": win_rate,
-            "profit_loss": total_profit_loss,
-            "is_active": bot.is_active,
-            "is_running": bot.is_running
-        })
-    
-    # Sort by profit_loss (best performing first)
-    bot_performances.sort(key=lambda x: x["profit_loss"], reverse=True)
-    
-    return bot_performances 
\ No newline at end of file
+        for rows in result.partitions():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer) if format == "csv" else None
+            
+            for row in rows:
+                values = {column: _export_value(value) for column, value in zip(EXPORT_COLUMNS, row)}
+                
+                if writer:
+                    writer.writerow([
+                        fastjson.dumps_str(value) if isinstance(value, dict) else value
+                        for value in values.values()
+                    ])
+                else:
+                    buffer.write(fastjson.dumps_str(values) + "\n")
+            
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+@router.get("/bots/comparison", response_model=List[Dict[str, Any]])
+async def get_bot_performance_comparison(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+) -> Any:
+    """
+    Get performance comparison for all bots.
+    """
+    # Best performing first, aggregated in a single grouped query
+    return await db.run_sync(bot_comparison, current_user.id)
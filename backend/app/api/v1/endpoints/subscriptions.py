@@ -1,15 +1,19 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api.deps import get_db, get_current_user, get_current_active_superuser
+from app.auth.cache import user_cache
+from app.core.config import settings
+from app.utils.response_cache import response_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Subscription])
 def read_subscriptions(
+    request: Request,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -17,8 +21,13 @@ def read_subscriptions(
     """
     Retrieve all subscription plans.
     """
-    subscriptions = db.query(models.Subscription).filter(models.Subscription.is_active == True).offset(skip).limit(limit).all()
-    return subscriptions
+    return response_cache.respond(
+        request,
+        "subscriptions",
+        settings.RESPONSE_CACHE_CATALOG_TTL,
+        List[schemas.Subscription],
+        lambda: db.query(models.Subscription).filter(models.Subscription.is_active == True).offset(skip).limit(limit).all()
+    )
 
 @router.post("/", response_model=schemas.Subscription)
 def create_subscription(
@@ -38,6 +47,7 @@ def create_subscription(
     )
     db.add(subscription)
     db.commit()
+    response_cache.invalidate("subscriptions")
     db.refresh(subscription)
     return subscription
 
@@ -82,6 +92,7 @@ def update_subscription(
     
     db.add(subscription)
     db.commit()
+    response_cache.invalidate("subscriptions")
     db.refresh(subscription)
     return subscription
 
@@ -106,6 +117,7 @@ def delete_subscription(
     subscription.is_active = False
     db.add(subscription)
     db.commit()
+    response_cache.invalidate("subscriptions")
     db.refresh(subscription)
     return subscription
 
@@ -136,4 +148,5 @@ def upgrade_subscription(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    user_cache.invalidate(current_user.id)
     return current_user 
\ No newline at end of file
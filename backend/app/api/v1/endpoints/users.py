@@ -1,11 +1,11 @@
 from typing import Any, List
 
 from fastapi import APIRouter, Body, Depends, HTTPException, status
-from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api.deps import get_db, get_current_user, get_current_active_superuser
+from app.auth.cache import user_cache
 from app.auth.jwt import get_password_hash, verify_password
 
 router = APIRouter()
@@ -42,20 +42,22 @@ def update_user_me(
     """
     Update own user.
     """
-    user_data = jsonable_encoder(current_user)
     update_data = user_in.dict(exclude_unset=True)
     
     if "password" in update_data and update_data["password"]:
         update_data["hashed_password"] = get_password_hash(update_data["password"])
         del update_data["password"]
     
-    for field in user_data:
-        if field in update_data:
-            setattr(current_user, field, update_data[field])
+    for field, value in update_data.items():
+        if hasattr(models.User, field):
+            setattr(current_user, field, value)
     
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    
+    # Also covers the deactivation, done by setting is_active
+    user_cache.invalidate(current_user.id)
     return current_user
 
 @router.get("/{user_id}", response_model=schemas.User)
@@ -0,0 +1,159 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app import models
+from app.core.config import settings
+
+# Columns never kept in the cache, loaded from the database if accessed
+EXCLUDED_COLUMNS = ("hashed_password",)
+
+class UserCacheBackend(ABC):
+    """
+    Storage of the user cache.
+
+    Values are dictionaries of column values. A backend shared by the
+    workers (Redis, memcached...) can be plugged in with set_backend, so
+    an invalidation in one worker is seen by all of them.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached value, None if missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        """Store a value for ttl seconds"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value, if present"""
+
+class InMemoryUserCacheBackend(UserCacheBackend):
+    """Per-process backend, the least recently used entries are evicted first"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+class UserCache:
+    """
+    Short-lived cache of the authenticated users, keyed by user id.
+
+    It saves the users SELECT run by get_current_user on every request.
+    Cached users are rebuilt as detached instances and merged into the
+    request's session without a query, so endpoints can still update them
+    and load their relationships. Endpoints changing a user must call
+    invalidate; other changes are picked up when the entry expires.
+
+    Args:
+        backend: Storage of the cached users
+        ttl: Seconds a user is cached, 0 disables the cache
+    """
+
+    def __init__(self, backend: UserCacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    def set_backend(self, backend: UserCacheBackend) -> None:
+        """Replace the storage, e.g. with one shared by the workers"""
+        self.backend = backend
+
+    def get_user(self, db: Session, user_id: int) -> Optional[models.User]:
+        """
+        Get a user from the cache, or from the database on a miss.
+
+        Args:
+            db: Database session the user is attached to
+            user_id: ID of the user
+
+        Returns:
+            The user, or None if it does not exist
+        """
+        data = self._get(user_id)
+        if data is not None:
+            return db.merge(self._restore(data), load=False)
+
+        user = db.query(models.User).filter(models.User.id == user_id).first()
+        if user is not None:
+            self._set(user)
+        return user
+
+    async def get_user_async(self, db: AsyncSession, user_id: int) -> Optional[models.User]:
+        """Same as get_user, with an async session"""
+        data = self._get(user_id)
+        if data is not None:
+            return await db.merge(self._restore(data), load=False)
+
+        user = await db.get(models.User, user_id)
+        if user is not None:
+            self._set(user)
+        return user
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user from the cache after it was changed"""
+        self.backend.delete(self._key(user_id))
+
+    def _get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        if self.ttl <= 0:
+            return None
+        return self.backend.get(self._key(user_id))
+
+    def _set(self, user: models.User) -> None:
+        if self.ttl <= 0:
+            return
+
+        data = {
+            column.key: getattr(user, column.key)
+            for column in inspect(models.User).column_attrs
+            if column.key not in EXCLUDED_COLUMNS
+        }
+        self.backend.set(self._key(user.id), data, self.ttl)
+
+    def _restore(self, data: Dict[str, Any]) -> models.User:
+        # The instance is marked as loaded from the database, the excluded
+        # columns are expired and loaded only if accessed
+        user = models.User(**data)
+        make_transient_to_detached(user)
+        return user
+
+    def _key(self, user_id: int) -> str:
+        return f"user:{user_id}"
+
+user_cache = UserCache(
+    InMemoryUserCacheBackend(max_size=settings.USER_CACHE_MAX_SIZE),
+    ttl=settings.USER_CACHE_TTL
+)
@@ -7,6 +7,7 @@ from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app import models, schemas
+from app.auth.cache import user_cache
 from app.core.config import settings
 from app.core.database import SessionLocal
 from app.auth.jwt import pwd_context
@@ -35,7 +36,7 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(models.User).filter(models.User.id == token_data.sub).first()
+    user = user_cache.get_user(db, token_data.sub) if token_data.sub is not None else None
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.auth.jwt import pwd_context
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password operations are already queued"""
+
+class PasswordHasher:
+    """
+    Runs the password hashing and verification in a dedicated thread pool.
+
+    bcrypt is deliberately slow, so running it in the threadpool shared by
+    the sync endpoints lets a burst of logins starve the rest of the API.
+    Here it gets its own bounded pool: at most max_workers hashes run at
+    once and at most max_pending operations are accepted, the next ones
+    are rejected with PasswordHasherBusy instead of queueing forever.
+
+    Args:
+        max_workers: Number of hashes computed concurrently
+        max_pending: Number of operations running or queued before rejecting
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Queueing metrics, guarded by the lock
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password with the current CryptContext settings.
+
+        Args:
+            password: Plain password
+
+        Returns:
+            The password hash
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password, rehashing it if the hash uses outdated settings
+        (e.g. BCRYPT_ROUNDS was changed).
+
+        Args:
+            password: Plain password
+            hashed_password: Stored hash
+
+        Returns:
+            Tuple of (valid, new_hash), new_hash is None unless the stored
+            hash should be replaced
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queueing metrics of the pool since startup"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait": self._total_wait / self._completed if self._completed else 0.0,
+                "max_wait": self._max_wait,
+                "avg_run": self._total_run / self._completed if self._completed else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads, dropping the operations not started yet"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        with self._lock:
+            rejected = self._pending >= self.max_pending
+            if rejected:
+                self._rejected += 1
+            else:
+                self._pending += 1
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="password-hasher",
+                    )
+                pool = self._pool
+
+        if rejected:
+            logger.warning(f"Password hasher queue is full: {self.stats()}")
+            raise PasswordHasherBusy("Too many password operations in progress")
+
+        # The slot is released by the worker, so an operation whose caller
+        # went away still counts until it has actually run
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(pool, self._timed, fn, args, time.monotonic())
+        except RuntimeError:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await future
+
+    def _timed(self, fn: Callable, args: Tuple, submitted_at: float) -> Any:
+        started_at = time.monotonic()
+        with self._lock:
+            self._running += 1
+
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.monotonic()
+            with self._lock:
+                self._pending -= 1
+                self._running -= 1
+                self._completed += 1
+                self._total_wait += started_at - submitted_at
+                self._max_wait = max(self._max_wait, started_at - submitted_at)
+                self._total_run += finished_at - started_at
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -0,0 +1 @@
+# Backtesting package initialization 
\ No newline at end of file
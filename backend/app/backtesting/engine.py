@@ -0,0 +1,344 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.bots.conditions import ConditionError, compile_condition
+
+logger = logging.getLogger(__name__)
+
+ENGINE_LEGACY = "legacy"
+ENGINE_VECTORIZED = "vectorized"
+ENGINES = (ENGINE_LEGACY, ENGINE_VECTORIZED)
+
+def simulate_trades(
+    df: pd.DataFrame,
+    buy_condition: str,
+    sell_condition: str,
+    engine: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Simulate trades based on buy and sell conditions.
+
+    Args:
+        df: DataFrame with OHLCV and indicator data
+        buy_condition: String with the buy condition
+        sell_condition: String with the sell condition
+        engine: 'legacy' or 'vectorized', defaults to settings.BACKTEST_ENGINE
+
+    Returns:
+        Dictionary with backtest results
+    """
+    engine = engine or settings.BACKTEST_ENGINE
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown backtest engine: {engine}")
+
+    if engine == ENGINE_VECTORIZED:
+        try:
+            return simulate_trades_vectorized(df, buy_condition, sell_condition)
+        except ConditionError:
+            raise
+        except Exception as e:
+            # Conditions that cannot be evaluated column-wise still work row by row
+            logger.warning(f"Vectorized engine failed, falling back to legacy engine: {e}")
+
+    return simulate_trades_legacy(df, buy_condition, sell_condition)
+
+def simulate_trades_legacy(df: pd.DataFrame, buy_condition: str, sell_condition: str) -> Dict[str, Any]:
+    """
+    Simulate trades by evaluating the conditions candle by candle.
+
+    Args:
+        df: DataFrame with OHLCV and indicator data
+        buy_condition: String with the buy condition
+        sell_condition: String with the sell condition
+
+    Returns:
+        Dictionary with backtest results
+    """
+    buy = compile_condition(buy_condition)
+    sell = compile_condition(sell_condition)
+
+    trades = []
+    positions = []
+
+    in_position = False
+    entry_price = 0
+    entry_time = None
+
+    # Loop through each candle
+    for i, row in df.iterrows():
+        row_dict = row.to_dict()
+        row_dict['time'] = i  # Add time to the dict for condition evaluation
+
+        if not in_position:
+            # Check buy condition
+            try:
+                buy_result = buy.evaluate(row_dict)
+
+                if buy_result:
+                    # Enter position
+                    in_position = True
+                    entry_price = row['close']
+                    entry_time = i
+
+                    positions.append({
+                        'type': 'buy',
+                        'price': entry_price,
+                        'time': entry_time
+                    })
+            except Exception as e:
+                logger.error(f"Error evaluating buy condition: {e}")
+        else:
+            # Check sell condition
+            try:
+                sell_result = sell.evaluate(row_dict)
+
+                if sell_result:
+                    # Exit position
+                    exit_price = row['close']
+                    exit_time = i
+
+                    # Calculate profit/loss
+                    profit_loss = (exit_price - entry_price) / entry_price * 100
+
+                    trades.append({
+                        'entry_price': entry_price,
+                        'exit_price': exit_price,
+                        'entry_time': entry_time,
+                        'exit_time': exit_time,
+                        'profit_loss': profit_loss,
+                        'profit_loss_amount': exit_price - entry_price
+                    })
+
+                    positions.append({
+                        'type': 'sell',
+                        'price': exit_price,
+                        'time': exit_time
+                    })
+
+                    in_position = False
+            except Exception as e:
+                logger.error(f"Error evaluating sell condition: {e}")
+
+    # Close any open position at the end
+    if in_position:
+        exit_price = df.iloc[-1]['close']
+        exit_time = df.index[-1]
+
+        # Calculate profit/loss
+        profit_loss = (exit_price - entry_price) / entry_price * 100
+
+        trades.append({
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'entry_time': entry_time,
+            'exit_time': exit_time,
+            'profit_loss': profit_loss,
+            'profit_loss_amount': exit_price - entry_price
+        })
+
+        positions.append({
+            'type': 'sell',
+            'price': exit_price,
+            'time': exit_time
+        })
+
+    return summarize_trades(trades, positions)
+
+def simulate_trades_vectorized(df: pd.DataFrame, buy_condition: str, sell_condition: str) -> Dict[str, Any]:
+    """
+    Simulate trades by evaluating each condition once over whole columns.
+
+    The boolean signal arrays are then resolved into entries and exits with
+    NumPy index searches, so the cost grows with the number of trades rather
+    than with the number of candles.
+
+    Args:
+        df: DataFrame with OHLCV and indicator data
+        buy_condition: String with the buy condition
+        sell_condition: String with the sell condition
+
+    Returns:
+        Dictionary with the same structure as simulate_trades_legacy
+    """
+    buy = compile_condition(buy_condition)
+    sell = compile_condition(sell_condition)
+
+    if df.empty:
+        return summarize_trades([], [])
+
+    buy_signals = buy.evaluate_vectorized(df)
+    sell_signals = sell.evaluate_vectorized(df)
+
+    entries, exits = resolve_positions(buy_signals, sell_signals)
+
+    close = df['close'].to_numpy(dtype=float)
+    index = df.index
+
+    trades = []
+    positions = []
+
+    for entry, exit_ in zip(entries, exits):
+        entry_price = close[entry]
+        exit_price = close[exit_]
+
+        trades.append({
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'entry_time': index[entry],
+            'exit_time': index[exit_],
+            'profit_loss': (exit_price - entry_price) / entry_price * 100,
+            'profit_loss_amount': exit_price - entry_price
+        })
+
+        positions.append({
+            'type': 'buy',
+            'price': entry_price,
+            'time': index[entry]
+        })
+        positions.append({
+            'type': 'sell',
+            'price': exit_price,
+            'time': index[exit_]
+        })
+
+    return summarize_trades(trades, positions)
+
+def resolve_positions(buy_signals: np.ndarray, sell_signals: np.ndarray) -> Tuple[List[int], List[int]]:
+    """
+    Resolve the entry/exit state machine from boolean signal arrays.
+
+    A position is opened on the first buy signal while flat and closed on the
+    first sell signal after the entry candle. A position still open on the
+    last candle is closed there.
+
+    Args:
+        buy_signals: Boolean array of buy signals
+        sell_signals: Boolean array of sell signals
+
+    Returns:
+        Tuple of entry indices and exit indices
+    """
+    buy_idx = np.flatnonzero(buy_signals)
+    sell_idx = np.flatnonzero(sell_signals)
+    last = len(buy_signals) - 1
+
+    entries = []
+    exits = []
+    position = 0
+
+    while True:
+        k = np.searchsorted(buy_idx, position)
+        if k >= len(buy_idx):
+            break
+        entry = int(buy_idx[k])
+
+        m = np.searchsorted(sell_idx, entry + 1)
+        exit_ = int(sell_idx[m]) if m < len(sell_idx) else last
+
+        entries.append(entry)
+        exits.append(exit_)
+
+        if m >= len(sell_idx):
+            break
+        position = exit_ + 1
+
+    return entries, exits
+
+def summarize_trades(trades: List[Dict[str, Any]], positions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Calculate backtest statistics from a list of simulated trades.
+
+    Args:
+        trades: List of trades with timestamp entry/exit times
+        positions: List of buy/sell positions with timestamp times
+
+    Returns:
+        Dictionary with backtest results
+    """
+    total_trades = len(trades)
+
+    if total_trades == 0:
+        return {
+            'total_trades': 0,
+            'winning_trades': 0,
+            'losing_trades': 0,
+            'win_rate': 0,
+            'profit_factor': 0,
+            'total_profit': 0,
+            'average_profit': 0,
+            'max_drawdown': 0,
+            'sharpe_ratio': 0,
+            'trades': [],
+            'positions': [],
+            'equity_curve': []
+        }
+
+    winning_trades = sum(1 for trade in trades if trade['profit_loss'] > 0)
+    losing_trades = sum(1 for trade in trades if trade['profit_loss'] <= 0)
+
+    win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
+
+    # Calculate profit factor
+    gross_profit = sum(trade['profit_loss_amount'] for trade in trades if trade['profit_loss'] > 0)
+    gross_loss = abs(sum(trade['profit_loss_amount'] for trade in trades if trade['profit_loss'] <= 0))
+    profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+
+    total_profit = sum(trade['profit_loss'] for trade in trades)
+    average_profit = total_profit / total_trades if total_trades > 0 else 0
+
+    # Calculate equity curve
+    equity_curve = []
+    current_equity = 100  # Start with 100 units
+
+    for trade in trades:
+        current_equity *= (1 + trade['profit_loss'] / 100)
+        equity_curve.append({
+            'time': trade['exit_time'].isoformat(),
+            'equity': current_equity
+        })
+
+    # Calculate drawdown
+    max_drawdown = 0
+    peak = 100
+
+    for point in equity_curve:
+        equity = point['equity']
+        if equity > peak:
+            peak = equity
+
+        drawdown = (peak - equity) / peak * 100
+        max_drawdown = max(max_drawdown, drawdown)
+
+    # Calculate Sharpe ratio (simplified)
+    returns = [trade['profit_loss'] for trade in trades]
+    mean_return = np.mean(returns)
+    std_return = np.std(returns)
+    sharpe_ratio = mean_return / std_return if std_return > 0 else 0
+
+    # Convert times to ISO format for JSON serialization
+    for trade in trades:
+        trade['entry_time'] = trade['entry_time'].isoformat()
+        trade['exit_time'] = trade['exit_time'].isoformat()
+
+    for position in positions:
+        position['time'] = position['time'].isoformat()
+
+    return {
+        'total_trades': total_trades,
+        'winning_trades': winning_trades,
+        'losing_trades': losing_trades,
+        'win_rate': win_rate,
+        'profit_factor': profit_factor,
+        'total_profit': total_profit,
+        'average_profit': average_profit,
+        'max_drawdown': max_drawdown,
+        'sharpe_ratio': sharpe_ratio,
+        'trades': trades,
+        'positions': positions,
+        'equity_curve': equity_curve
+    }
@@ -0,0 +1,122 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.backtesting.runner import mark_backtest_failed, run_backtest
+from app.backtesting.sweep import run_sweep
+
+logger = logging.getLogger(__name__)
+
+class BacktestExecutor:
+    """
+    Runs backtests in a bounded pool of worker processes.
+    
+    Simulations are CPU bound, so they are kept out of the API workers:
+    the API only records the backtest as pending and submits its ID here.
+    Each worker process opens its own database sessions.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self._pool = None
+        self._lock = threading.Lock()
+    
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """The process pool, created on first use"""
+        with self._lock:
+            if self._pool is None:
+                # Spawn rather than fork: the API process holds threads and
+                # pooled database connections that must not leak into workers
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+    
+    def submit(self, backtest_id: int) -> Future:
+        """
+        Queue a pending backtest for execution.
+        
+        Args:
+            backtest_id: ID of the backtest to run
+            
+        Returns:
+            Future resolved when the worker has finished
+        """
+        future = self.run(run_backtest, backtest_id)
+        future.add_done_callback(lambda f: self._on_backtest_done(backtest_id, f))
+        return future
+    
+    def submit_sweep(self, sweep_id: int) -> threading.Thread:
+        """
+        Start a parameter sweep.
+        
+        The sweep is coordinated from a lightweight thread that only waits
+        on the pool: data preparation and the combinations run in workers.
+        
+        Args:
+            sweep_id: ID of the sweep to run
+            
+        Returns:
+            The coordinating thread
+        """
+        thread = threading.Thread(target=run_sweep, args=(sweep_id, self), daemon=True)
+        thread.start()
+        return thread
+    
+    def run(self, fn: Callable, *args: Any) -> Future:
+        """
+        Run a picklable function in the pool, recreating it if a worker died.
+        
+        Args:
+            fn: Module-level function to run
+            *args: Arguments passed to the function
+            
+        Returns:
+            Future with the function result
+        """
+        try:
+            return self.pool.submit(fn, *args)
+        except BrokenProcessPool:
+            logger.warning("Backtest process pool is broken, restarting it")
+            self._reset_pool()
+            return self.pool.submit(fn, *args)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes, dropping backtests not started yet"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+    
+    def _reset_pool(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+    
+    def _on_backtest_done(self, backtest_id: int, future: Future) -> None:
+        if future.cancelled():
+            error = "Backtest was cancelled"
+        elif future.exception() is not None:
+            error = str(future.exception()) or type(future.exception()).__name__
+        else:
+            return
+        
+        # The worker could not record the failure itself (e.g. it crashed)
+        logger.error(f"Backtest {backtest_id} did not complete: {error}")
+        db = SessionLocal()
+        try:
+            mark_backtest_failed(db, backtest_id, error)
+        except Exception as e:
+            logger.error(f"Error marking backtest {backtest_id} as failed: {e}")
+        finally:
+            db.close()
+
+backtest_executor = BacktestExecutor(max_workers=settings.BACKTEST_MAX_WORKERS)
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Per-trade lists of the simulation results, stored in backtest_trades
+LEDGER_KEYS = ("trades", "positions", "equity_curve")
+
+def store_ledger(db: Session, backtest_id: int, results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Insert the trades of simulation results in the backtest ledger.
+
+    Positions are the entry and exit of each trade and the equity curve has
+    one point per trade, so a ledger row holds all three. The caller
+    commits.
+
+    Args:
+        db: Database session
+        backtest_id: ID of the backtest
+        results: Results returned by simulate_trades
+
+    Returns:
+        The results without the per-trade lists, stored in the backtest row
+    """
+    rows = [
+        {
+            "backtest_id": backtest_id,
+            "entry_time": _to_datetime(trade["entry_time"]),
+            "exit_time": _to_datetime(trade["exit_time"]),
+            "entry_price": float(trade["entry_price"]),
+            "exit_price": float(trade["exit_price"]),
+            "profit_loss": float(trade["profit_loss"]),
+            "profit_loss_amount": float(trade["profit_loss_amount"]),
+            "equity": float(point["equity"]),
+        }
+        for trade, point in zip(results.get("trades", []), results.get("equity_curve", []))
+    ]
+
+    if rows:
+        db.execute(insert(models.BacktestTrade), rows)
+
+    return {key: value for key, value in results.items() if key not in LEDGER_KEYS}
+
+def legacy_ledger(results: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the ledger of a backtest run before the ledger table existed,
+    whose trades are still in the results document.
+
+    Args:
+        results: Results document of the backtest
+
+    Returns:
+        Ledger rows in trade order, empty if there are none
+    """
+    if not results:
+        return []
+
+    return [
+        {
+            "entry_time": trade["entry_time"],
+            "exit_time": trade["exit_time"],
+            "entry_price": trade["entry_price"],
+            "exit_price": trade["exit_price"],
+            "profit_loss": trade["profit_loss"],
+            "profit_loss_amount": trade["profit_loss_amount"],
+            "equity": point["equity"],
+        }
+        for trade, point in zip(results.get("trades", []), results.get("equity_curve", []))
+    ]
+
+def _to_datetime(value: Any) -> datetime:
+    # simulate_trades returns the times in ISO format
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
@@ -0,0 +1,107 @@
+import logging
+
+from app import models
+from app.core.database import SessionLocal
+from app.utils import market_data
+from app.indicators.calculator import calculate_indicators, required_indicators
+from app.bots.conditions import referenced_names
+from app.backtesting.engine import simulate_trades
+from app.backtesting.ledger import store_ledger
+
+logger = logging.getLogger(__name__)
+
+def run_backtest(backtest_id: int) -> None:
+    """
+    Run a backtest and update the results.
+    
+    Meant to be executed in a backtest worker process: it opens its own
+    database session and drives the status from pending to running and
+    then to completed or failed.
+    
+    Args:
+        backtest_id: ID of the backtest to run
+    """
+    db = SessionLocal()
+    try:
+        backtest = db.query(models.Backtest).filter(models.Backtest.id == backtest_id).first()
+        
+        if not backtest or backtest.status == "completed":
+            return
+        
+        try:
+            # Update status to running
+            backtest.status = "running"
+            db.add(backtest)
+            db.commit()
+            
+            # Get historical data
+            df = market_data.run(
+                market_data.get_historical_dataframe(
+                    backtest.pair,
+                    backtest.timeframe,
+                    backtest.start_date,
+                    backtest.end_date
+                )
+            )
+            
+            if df.empty:
+                backtest.status = "failed"
+                backtest.results = {"error": "No data available for the selected period"}
+                db.add(backtest)
+                db.commit()
+                return
+            
+            # Calculate only the indicator columns the conditions use
+            names = referenced_names(backtest.buy_condition, backtest.sell_condition)
+            df = calculate_indicators(
+                df,
+                required_indicators(backtest.indicators_config or {}, names),
+                columns=names
+            )
+            
+            # Run backtest
+            results = simulate_trades(
+                df,
+                backtest.buy_condition,
+                backtest.sell_condition
+            )
+            
+            # Update backtest with results, the trades go to the ledger table
+            backtest.status = "completed"
+            backtest.results = store_ledger(db, backtest.id, results)
+            backtest.win_rate = results.get("win_rate")
+            backtest.profit_factor = results.get("profit_factor")
+            backtest.total_trades = results.get("total_trades")
+            backtest.average_profit = results.get("average_profit")
+            backtest.max_drawdown = results.get("max_drawdown")
+            backtest.sharpe_ratio = results.get("sharpe_ratio")
+            
+            db.add(backtest)
+            db.commit()
+            
+        except Exception as e:
+            # Update status to failed
+            logger.error(f"Error running backtest {backtest_id}: {e}")
+            db.rollback()
+            mark_backtest_failed(db, backtest_id, str(e))
+    finally:
+        db.close()
+
+def mark_backtest_failed(db, backtest_id: int, error: str) -> None:
+    """
+    Set a backtest to failed and store the error message.
+    
+    Args:
+        db: Database session
+        backtest_id: ID of the backtest
+        error: Error message stored in the results
+    """
+    backtest = db.query(models.Backtest).filter(models.Backtest.id == backtest_id).first()
+    
+    if not backtest or backtest.status == "completed":
+        return
+    
+    backtest.status = "failed"
+    backtest.results = {"error": error}
+    db.add(backtest)
+    db.commit()
@@ -0,0 +1,358 @@
+import itertools
+import logging
+import math
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app import models
+from app.core.database import SessionLocal
+from app.utils import market_data
+from app.indicators.calculator import calculate_indicators, indicator_columns, required_indicators
+from app.bots.conditions import referenced_names
+from app.backtesting.engine import simulate_trades
+
+logger = logging.getLogger(__name__)
+
+# Metrics kept for each combination, the trade lists are dropped
+SUMMARY_METRICS = (
+    'total_trades',
+    'winning_trades',
+    'losing_trades',
+    'win_rate',
+    'profit_factor',
+    'total_profit',
+    'average_profit',
+    'max_drawdown',
+    'sharpe_ratio',
+)
+
+# Metrics where a lower value ranks better
+ASCENDING_METRICS = ('max_drawdown',)
+
+def parameter_count(spec: Any) -> int:
+    """
+    Count the values of a parameter specification without building them.
+
+    Args:
+        spec: A list of values, a single value, or a range given as
+            {"start": 7, "stop": 28, "step": 1} (stop is inclusive)
+
+    Returns:
+        Number of values
+
+    Raises:
+        ValueError: If a range is invalid or its bounds are not finite
+    """
+    if isinstance(spec, list):
+        return len(spec)
+
+    if isinstance(spec, dict):
+        start, stop, step = _range_bounds(spec)
+        return max(int(math.floor((stop - start) / step + 1e-9)) + 1, 0)
+
+    return 1
+
+def parameter_values(spec: Any) -> List[Any]:
+    """
+    Expand a parameter specification into the list of values to try.
+
+    Args:
+        spec: A list of values, a single value, or a range given as
+            {"start": 7, "stop": 28, "step": 1} (stop is inclusive)
+
+    Returns:
+        List of parameter values
+    """
+    if isinstance(spec, list):
+        return spec
+
+    if isinstance(spec, dict):
+        start, stop, step = _range_bounds(spec)
+        values = [start + i * step for i in range(parameter_count(spec))]
+
+        if all(isinstance(v, int) for v in (start, stop, step)):
+            return values
+        return [round(v, 10) for v in values]
+
+    return [spec]
+
+def _range_bounds(spec: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+    start = spec["start"]
+    stop = spec["stop"]
+    step = spec.get("step", 1)
+
+    for value in (start, stop, step):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"Range bounds must be finite numbers, got {value!r}")
+
+    if step <= 0:
+        raise ValueError("Range step must be positive")
+
+    # The count itself must be finite too, e.g. a huge stop with a tiny step
+    if not math.isfinite((stop - start) / step):
+        raise ValueError("Range is too large")
+
+    return start, stop, step
+
+def count_combinations(
+    indicators_config: Dict[str, Dict[str, Any]],
+    parameter_grid: Dict[str, Dict[str, Any]]
+) -> int:
+    """
+    Count the parameter combinations of a sweep without building them, so
+    oversized grids are rejected before any memory is used.
+
+    Args:
+        indicators_config: The bot's indicator configuration
+        parameter_grid: Parameter specifications per indicator name
+
+    Returns:
+        Number of combinations, 0 if the grid is empty
+
+    Raises:
+        ValueError: If the grid references an unknown indicator or has an
+            invalid or empty parameter specification
+    """
+    total = 1 if parameter_grid else 0
+    for indicator_name, parameters in parameter_grid.items():
+        if indicator_name not in indicators_config:
+            raise ValueError(f"Indicator {indicator_name} is not configured on this bot")
+
+        for parameter, spec in parameters.items():
+            count = parameter_count(spec)
+            if not count:
+                raise ValueError(f"No values to try for {indicator_name} {parameter}")
+            total *= count
+
+    return total
+
+def expand_parameter_grid(
+    indicators_config: Dict[str, Dict[str, Any]],
+    parameter_grid: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Build every parameter combination of a sweep.
+
+    Args:
+        indicators_config: The bot's indicator configuration
+        parameter_grid: Parameter specifications per indicator name
+
+    Returns:
+        List of combinations, each mapping indicator names to parameter overrides
+    """
+    axes = []
+    for indicator_name, parameters in parameter_grid.items():
+        if indicator_name not in indicators_config:
+            raise ValueError(f"Indicator {indicator_name} is not configured on this bot")
+
+        for parameter, spec in parameters.items():
+            values = parameter_values(spec)
+            if not values:
+                raise ValueError(f"No values to try for {indicator_name} {parameter}")
+            axes.append([(indicator_name, parameter, value) for value in values])
+
+    combinations = []
+    for selection in itertools.product(*axes):
+        combination = {}
+        for indicator_name, parameter, value in selection:
+            combination.setdefault(indicator_name, {})[parameter] = value
+        combinations.append(combination)
+
+    return combinations
+
+def prepare_sweep_data(
+    pair: str,
+    timeframe: str,
+    start_date: Any,
+    end_date: Any,
+    fixed_config: Dict[str, Dict[str, Any]],
+    names: Optional[FrozenSet[str]] = None
+) -> pd.DataFrame:
+    """
+    Fetch the OHLCV data once and add the indicators that are not swept.
+
+    Args:
+        pair: Trading pair
+        timeframe: Timeframe of the candles
+        start_date: Start of the sweep period
+        end_date: End of the sweep period
+        fixed_config: Configuration of the indicators shared by every combination
+        names: Names used by the conditions, only those columns are kept
+
+    Returns:
+        DataFrame shared by every combination
+    """
+    df = market_data.run(
+        market_data.get_historical_dataframe(pair, timeframe, start_date, end_date)
+    )
+
+    return calculate_indicators(df, fixed_config, columns=names)
+
+def evaluate_sweep_chunk(
+    df: pd.DataFrame,
+    indicators_config: Dict[str, Dict[str, Any]],
+    combinations: List[Dict[str, Dict[str, Any]]],
+    buy_condition: str,
+    sell_condition: str
+) -> List[Dict[str, Any]]:
+    """
+    Backtest a batch of parameter combinations on the shared data.
+
+    The conditions reference the column names of the bot's own parameters
+    (e.g. RSI_14), so the columns computed for a combination (e.g. RSI_7)
+    are renamed to those before the simulation.
+
+    Args:
+        df: DataFrame with OHLCV data and the non-swept indicators
+        indicators_config: The bot's indicator configuration
+        combinations: Parameter overrides to evaluate
+        buy_condition: String with the buy condition
+        sell_condition: String with the sell condition
+
+    Returns:
+        Summary metrics for each combination
+    """
+    summaries = []
+    names = referenced_names(buy_condition, sell_condition)
+
+    for combination in combinations:
+        try:
+            config = {}
+            aliases = {}
+            for indicator_name, overrides in combination.items():
+                base = indicators_config[indicator_name]
+
+                # A swept indicator the conditions do not use cannot change the result
+                if not names.intersection(indicator_columns(indicator_name, base)):
+                    continue
+
+                config[indicator_name] = {
+                    **base,
+                    "parameters": {**(base.get("parameters") or {}), **overrides}
+                }
+                aliases.update(zip(
+                    indicator_columns(indicator_name, config[indicator_name]),
+                    indicator_columns(indicator_name, base)
+                ))
+
+            columns = [column for column, base_column in aliases.items() if base_column in names]
+            combination_df = calculate_indicators(df, config, columns=columns).rename(columns=aliases)
+            results = simulate_trades(combination_df, buy_condition, sell_condition)
+
+            summary = {metric: _to_float(results.get(metric)) for metric in SUMMARY_METRICS}
+        except Exception as e:
+            summary = {"error": str(e)}
+
+        summary["parameters"] = combination
+        summaries.append(summary)
+
+    return summaries
+
+def rank_results(results: List[Dict[str, Any]], rank_by: str) -> List[Dict[str, Any]]:
+    """
+    Sort sweep results best first and number them.
+
+    Args:
+        results: Summary metrics for each combination
+        rank_by: Metric used for the ranking
+
+    Returns:
+        The ranked results; failed combinations come last
+    """
+    descending = rank_by not in ASCENDING_METRICS
+
+    def sort_key(result):
+        value = result.get(rank_by)
+        if value is None or "error" in result or (isinstance(value, float) and math.isnan(value)):
+            return (1, 0)
+        return (0, -value if descending else value)
+
+    ranked = sorted(results, key=sort_key)
+    for rank, result in enumerate(ranked, start=1):
+        result["rank"] = rank
+
+    return ranked
+
+def run_sweep(sweep_id: int, executor: Any) -> None:
+    """
+    Run a parameter sweep, fanning the combinations out to the worker pool.
+
+    Args:
+        sweep_id: ID of the sweep to run
+        executor: BacktestExecutor whose process pool runs the work
+    """
+    db = SessionLocal()
+    try:
+        sweep = db.query(models.BacktestSweep).filter(models.BacktestSweep.id == sweep_id).first()
+
+        if not sweep or sweep.status == "completed":
+            return
+
+        try:
+            sweep.status = "running"
+            db.add(sweep)
+            db.commit()
+
+            indicators_config = sweep.indicators_config or {}
+            combinations = expand_parameter_grid(indicators_config, sweep.parameter_grid)
+            names = referenced_names(sweep.buy_condition, sweep.sell_condition)
+            fixed_config = required_indicators({
+                name: config for name, config in indicators_config.items()
+                if name not in sweep.parameter_grid
+            }, names)
+
+            # Data and shared indicators are computed once for every combination
+            df = executor.run(
+                prepare_sweep_data,
+                sweep.pair,
+                sweep.timeframe,
+                sweep.start_date,
+                sweep.end_date,
+                fixed_config,
+                names
+            ).result()
+
+            if df.empty:
+                raise ValueError("No data available for the selected period")
+
+            # A couple of chunks per worker keeps the pool busy until the end
+            chunk_count = min(len(combinations), executor.max_workers * 2)
+            chunks = [combinations[i::chunk_count] for i in range(chunk_count)]
+
+            futures = [
+                executor.run(
+                    evaluate_sweep_chunk,
+                    df,
+                    indicators_config,
+                    chunk,
+                    sweep.buy_condition,
+                    sweep.sell_condition
+                )
+                for chunk in chunks
+            ]
+
+            results = []
+            for future in futures:
+                results.extend(future.result())
+
+            sweep.status = "completed"
+            sweep.results = rank_results(results, sweep.rank_by)
+            db.add(sweep)
+            db.commit()
+
+        except Exception as e:
+            logger.error(f"Error running sweep {sweep_id}: {e}")
+            db.rollback()
+            sweep.status = "failed"
+            sweep.error = str(e)
+            db.add(sweep)
+            db.commit()
+    finally:
+        db.close()
+
+def _to_float(value: Any) -> Any:
+    if isinstance(value, (np.floating, np.integer)):
+        return value.item()
+    return value
@@ -0,0 +1,319 @@
+import ast
+import copy
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Builtins a condition may call, e.g. `abs(close - open) > ATR_14`
+ALLOWED_FUNCTIONS = frozenset({"abs", "min", "max", "round"})
+
+# NumPy functions a condition may call, e.g. `np.log(close) > 4`
+ALLOWED_NUMPY_FUNCTIONS = frozenset({
+    "abs", "sqrt", "log", "log10", "exp", "sign", "floor", "ceil", "round",
+    "isnan", "isfinite", "minimum", "maximum",
+})
+
+# Largest number of digits `round` may round to, rounding an integer to
+# -n digits computes 10 ** n exactly
+MAX_ROUND_DIGITS = 15
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.Name, ast.Load, ast.Constant, ast.Call, ast.Attribute,
+)
+
+_SCALAR_GLOBALS = {
+    "__builtins__": {},
+    "np": np,
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+}
+
+_VECTOR_GLOBALS = {
+    "__builtins__": {},
+    "np": np,
+}
+
+# Builtins that do not work element-wise are swapped for their NumPy versions
+_VECTOR_FUNCTIONS = {
+    "abs": "abs",
+    "min": "minimum",
+    "max": "maximum",
+    "round": "round",
+}
+
+class ConditionError(ValueError):
+    """Raised when a buy/sell condition cannot be compiled."""
+
+class CompiledCondition:
+    """
+    A buy/sell condition parsed and validated once.
+
+    Holds two code objects: one evaluated against a single candle and one
+    evaluated against whole columns, where `and`/`or`/`not` are rewritten to
+    their element-wise NumPy equivalents.
+    """
+
+    def __init__(self, source: str, names: FrozenSet[str], code: Any, vector_code: Any):
+        self.source = source
+        self.names = names
+        self.code = code
+        self.vector_code = vector_code
+
+    def evaluate(self, values: Dict[str, Any]) -> bool:
+        """
+        Evaluate the condition for a single candle.
+
+        Args:
+            values: Mapping of column names to values for one candle
+
+        Returns:
+            The truth value of the condition
+        """
+        return bool(eval(self.code, _SCALAR_GLOBALS, values))
+
+    def evaluate_vectorized(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the condition over every candle at once.
+
+        Args:
+            df: DataFrame with OHLCV and indicator data
+
+        Returns:
+            Boolean array with one entry per candle
+        """
+        namespace = {column: df[column].to_numpy() for column in df.columns if column in self.names}
+        if "time" in self.names:
+            namespace["time"] = df.index
+
+        result = eval(self.vector_code, _VECTOR_GLOBALS, namespace)
+        signals = np.broadcast_to(np.asarray(result), (len(df),))
+
+        # NaN is truthy for Python's bool(), keep the same semantics here
+        if signals.dtype.kind == 'f':
+            return signals != 0
+
+        return signals.astype(bool)
+
+    def __repr__(self) -> str:
+        return f"CompiledCondition({self.source!r})"
+
+@lru_cache(maxsize=1024)
+def compile_condition(expression: str) -> CompiledCondition:
+    """
+    Parse, validate and compile a condition, caching the result by its text.
+
+    Args:
+        expression: The condition, e.g. "RSI_14 < 30 and close > SMA_50"
+
+    Returns:
+        The compiled condition, shared by every caller using the same text
+
+    Raises:
+        ConditionError: If the expression is not valid Python or uses
+            anything outside the allowed names and operators
+    """
+    if not expression or not expression.strip():
+        raise ConditionError("Condition is empty")
+
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ConditionError(f"Invalid condition syntax: {e.msg}")
+
+    names = _ConditionValidator().validate(tree)
+    tree = ast.fix_missing_locations(_FloatPowerTransformer().visit(tree))
+
+    code = compile(tree, "<condition>", "eval")
+    vector_tree = _VectorizingTransformer().visit(copy.deepcopy(tree))
+    vector_code = compile(ast.fix_missing_locations(vector_tree), "<condition>", "eval")
+
+    return CompiledCondition(expression, names, code, vector_code)
+
+def validate_condition(expression: str, allowed_names: Optional[Iterable[str]] = None) -> CompiledCondition:
+    """
+    Compile a condition and check it only references known columns.
+
+    Args:
+        expression: The condition to validate
+        allowed_names: Column names the condition may reference, any
+            identifier is accepted when None
+
+    Returns:
+        The compiled condition
+
+    Raises:
+        ConditionError: If the condition is invalid or references unknown names
+    """
+    condition = compile_condition(expression)
+
+    if allowed_names is not None:
+        unknown = condition.names - set(allowed_names) - {"time"}
+        if unknown:
+            raise ConditionError(f"Unknown names in condition: {', '.join(sorted(unknown))}")
+
+    return condition
+
+def referenced_names(*expressions: str) -> FrozenSet[str]:
+    """
+    Get the column names used by a set of conditions.
+
+    Args:
+        expressions: The conditions, e.g. a bot's buy and sell conditions
+
+    Returns:
+        Names referenced by any of the conditions
+
+    Raises:
+        ConditionError: If a condition is invalid
+    """
+    names = set()
+    for expression in expressions:
+        names |= compile_condition(expression).names
+    return frozenset(names)
+
+class _ConditionValidator(ast.NodeVisitor):
+    """Reject any syntax outside the condition whitelist and collect column names."""
+
+    def validate(self, tree: ast.AST) -> FrozenSet[str]:
+        self.names = set()
+        self.visit(tree)
+        return frozenset(self.names)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ConditionError(f"Unsupported syntax in condition: {type(node).__name__}")
+        super().generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id.startswith("_"):
+            raise ConditionError(f"Invalid name in condition: {node.id}")
+        if node.id == "np" or node.id in ALLOWED_FUNCTIONS:
+            raise ConditionError(f"'{node.id}' can only be used as a function call")
+        self.names.add(node.id)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if isinstance(node.value, str):
+            # "a" * 10 ** 10 would build a 10 GB string
+            raise ConditionError("Text can only be compared, e.g. `trend == 'up'`")
+        if not isinstance(node.value, (int, float)) and node.value is not None:
+            raise ConditionError(f"Unsupported constant in condition: {node.value!r}")
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        for op in node.ops:
+            self.visit(op)
+        for operand in [node.left] + node.comparators:
+            if not (isinstance(operand, ast.Constant) and isinstance(operand.value, str)):
+                self.visit(operand)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        raise ConditionError("Attribute access is only allowed on NumPy function calls")
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if node.keywords:
+            raise ConditionError("Keyword arguments are not allowed in conditions")
+
+        func = node.func
+        if isinstance(func, ast.Name):
+            if func.id not in ALLOWED_FUNCTIONS:
+                raise ConditionError(f"Function not allowed in condition: {func.id}")
+        elif (
+            isinstance(func, ast.Attribute)
+            and isinstance(func.value, ast.Name)
+            and func.value.id == "np"
+        ):
+            if func.attr not in ALLOWED_NUMPY_FUNCTIONS:
+                raise ConditionError(f"Function not allowed in condition: np.{func.attr}")
+        else:
+            raise ConditionError("Only simple function calls are allowed in conditions")
+
+        if (func.attr if isinstance(func, ast.Attribute) else func.id) == "round" and len(node.args) > 1:
+            digits = node.args[1]
+            if isinstance(digits, ast.UnaryOp) and isinstance(digits.op, (ast.USub, ast.UAdd)):
+                digits = digits.operand
+            if (
+                not isinstance(digits, ast.Constant)
+                or type(digits.value) is not int
+                or digits.value > MAX_ROUND_DIGITS
+            ):
+                raise ConditionError(f"round() digits must be a whole number between -{MAX_ROUND_DIGITS} and {MAX_ROUND_DIGITS}")
+
+        for arg in node.args:
+            self.visit(arg)
+
+class _FloatPowerTransformer(ast.NodeTransformer):
+    """
+    Compute `**` in floating point, `a ** b` becomes `np.float_power(a, b)`.
+
+    Python raises integers to a power exactly, so `9 ** 9 ** 9` or
+    `abs(9 ** 10) ** 10 ** 10` would never finish. In floating point the
+    result overflows to inf instead.
+    """
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return _numpy_call("float_power", node.left, node.right)
+        return node
+
+class _VectorizingTransformer(ast.NodeTransformer):
+    """
+    Rewrite a condition so it can be applied to whole columns.
+
+    `and`, `or`, `not` and chained comparisons cannot be applied to arrays,
+    so `RSI_14 < 30 and close > SMA_50` becomes
+    `np.logical_and(RSI_14 < 30, close > SMA_50)`.
+    """
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        func = "logical_and" if isinstance(node.op, ast.And) else "logical_or"
+        return _reduce_numpy_call(func, node.values)
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return _numpy_call("logical_not", node.operand)
+        return node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+
+        # a < b < c -> np.logical_and(a < b, b < c)
+        comparisons = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            comparisons.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+
+        return _reduce_numpy_call("logical_and", comparisons)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Name):
+            func = _VECTOR_FUNCTIONS[node.func.id]
+            if func in ("minimum", "maximum"):
+                return _reduce_numpy_call(func, node.args)
+            return _numpy_call(func, *node.args)
+        return node
+
+def _numpy_call(func: str, *args: ast.AST) -> ast.Call:
+    return ast.Call(
+        func=ast.Attribute(value=ast.Name(id="np", ctx=ast.Load()), attr=func, ctx=ast.Load()),
+        args=list(args),
+        keywords=[]
+    )
+
+def _reduce_numpy_call(func: str, args: list) -> ast.AST:
+    result = args[0]
+    for arg in args[1:]:
+        result = _numpy_call(func, result, arg)
+    return result
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import random
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+from app.utils import market_data
+from app.utils.timeframes import timeframe_to_timedelta
+from app.bots.runtime import BotRuntime, bot_runtime
+
+logger = logging.getLogger(__name__)
+
+# Fetches tried when filling the history before giving up until a bot needs more
+HISTORY_FETCH_ATTEMPTS = 10
+
+class MarketFeed:
+    """
+    Candles of one (pair, timeframe) shared by every bot watching it.
+
+    The feed polls the market data API once per tick, keeps a rolling buffer
+    of the most recent candles and pushes it to its subscribers when a new
+    candle is published. The buffer is sized from the warm-up of the most
+    demanding subscriber; once filled, only the candles newer than the
+    buffer are fetched, and older ones only if a subscriber needs more.
+
+    Ticks are aligned on candle closes: the feed sleeps until the current
+    candle closes, wakes shortly after with some jitter so feeds do not hit
+    the provider all at once, and retries with exponential backoff until
+    the new candle is published.
+    """
+
+    def __init__(self, pair: str, timeframe: str, buffer_size: int):
+        self.pair = pair
+        self.timeframe = timeframe
+        self.buffer_size = buffer_size
+        self.subscribers: Dict[int, Any] = {}
+        self.candles = pd.DataFrame()
+        self.last_time: Optional[str] = None
+        self.end_date: Optional[datetime] = None
+        self.duration = timeframe_to_timedelta(timeframe)
+        self._history_exhausted = 0
+        self._retries = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def check_interval(self) -> float:
+        """Poll as often as the most demanding subscriber, when candle closes are unknown"""
+        intervals = [bot.check_interval for bot in list(self.subscribers.values())]
+        return min(intervals) if intervals else settings.MARKET_FEED_POLL_INTERVAL
+
+    def next_delay(self) -> float:
+        """
+        Get the number of seconds to wait before the next tick.
+
+        Returns:
+            Seconds until shortly after the current candle closes, or the
+            backoff delay if that candle should already have been published
+        """
+        if self.duration is None:
+            return self.check_interval
+
+        if self.end_date is None:
+            return self._backoff_delay()
+
+        # The latest candle is stamped with its open time
+        next_close = pd.Timestamp(self.end_date) + self.duration
+        wait = (next_close - pd.Timestamp.now(tz="UTC")).total_seconds()
+
+        if wait <= 0:
+            return self._backoff_delay()
+
+        self._retries = 0
+        return wait + settings.BOT_CANDLE_CLOSE_DELAY + random.uniform(0, settings.BOT_CANDLE_CLOSE_JITTER)
+
+    def _backoff_delay(self) -> float:
+        delay = min(
+            settings.BOT_RETRY_INITIAL_DELAY * 2 ** self._retries,
+            settings.BOT_RETRY_MAX_DELAY
+        )
+        self._retries += 1
+        return delay
+
+    @property
+    def history_size(self) -> int:
+        """Number of candles the most demanding subscriber needs"""
+        sizes = [bot.required_candles for bot in list(self.subscribers.values())]
+        return max(sizes, default=1)
+
+    async def tick(self) -> None:
+        """Poll for a new candle and notify the subscribers"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            last_data = await market_data.get_last_price(self.pair, self.timeframe)
+
+            if last_data and last_data['time'] != self.last_time:
+                self.end_date = datetime.fromisoformat(last_data['time'].replace('Z', '+00:00'))
+                if not self.candles.empty:
+                    # The last buffered candle may still have been forming, fetch it again
+                    await self._fetch(self.candles.index[-1], self.end_date)
+                self.last_time = last_data['time']
+
+            # Older candles are only fetched when a subscriber needs more history
+            if self.end_date is not None and self.history_size > max(len(self.candles), self._history_exhausted):
+                await self._extend_history(self.end_date)
+
+            self.candles = self.candles.iloc[-max(self.buffer_size, self.history_size):]
+
+            if self.candles.empty:
+                return
+
+            # Bots skip candles they have already seen, so subscribers that
+            # joined since the last candle are brought up to date here
+            candles = self.candles
+            subscribers = list(self.subscribers.values())
+            await asyncio.gather(*(bot.on_candle(candles) for bot in subscribers))
+
+    async def _extend_history(self, end_date: datetime) -> None:
+        """Fetch older candles until the buffer covers the subscribers' warm-up"""
+        cursor = self.candles.index[0] if not self.candles.empty else pd.Timestamp(end_date)
+        duration = self.duration or pd.Timedelta(days=1)
+
+        for _ in range(HISTORY_FETCH_ATTEMPTS):
+            missing = self.history_size - len(self.candles)
+            if missing <= 0:
+                return
+
+            # Ask for exactly the missing candles, closures and gaps in the
+            # data are covered by the next attempt, further back
+            start = cursor - duration * (missing if not self.candles.empty else missing - 1)
+            await self._fetch(start, cursor)
+            cursor = start
+
+        if len(self.candles) < self.history_size:
+            logger.warning(
+                f"Only {len(self.candles)} of {self.history_size} candles available for {self.pair} {self.timeframe}"
+            )
+            self._history_exhausted = self.history_size
+
+    async def _fetch(self, start_date: datetime, end_date: datetime) -> None:
+        df = await market_data.get_historical_dataframe(
+            self.pair,
+            self.timeframe,
+            start_date,
+            end_date
+        )
+
+        if df.empty:
+            return
+
+        if not self.candles.empty:
+            df = pd.concat([self.candles, df])
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+
+        self.candles = df
+
+class MarketDataHub:
+    """
+    Subscription hub fanning market data out to running bots.
+
+    Each distinct (pair, timeframe) gets one MarketFeed scheduled on the bot
+    runtime, so calls to the market data API scale with the number of
+    markets being watched rather than with the number of bots.
+    """
+
+    def __init__(self, runtime: BotRuntime, buffer_size: int):
+        self.runtime = runtime
+        self.buffer_size = buffer_size
+        self._feeds: Dict[Tuple[str, str], MarketFeed] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, bot: Any) -> None:
+        """
+        Subscribe a bot to the feed of its pair and timeframe.
+
+        Args:
+            bot: TradingBot exposing bot_id, pair, timeframe, check_interval,
+                required_candles and an async on_candle(candles)
+        """
+        key = (bot.pair, bot.timeframe)
+
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = MarketFeed(bot.pair, bot.timeframe, self.buffer_size)
+                self._feeds[key] = feed
+
+            feed.subscribers[bot.bot_id] = bot
+
+            # (Re)scheduling runs the feed now, so the new bot gets the current candle
+            self.runtime.add(key, feed)
+
+    def unsubscribe(self, bot: Any) -> None:
+        """
+        Unsubscribe a bot, the feed is dropped with its last subscriber.
+
+        Args:
+            bot: TradingBot previously subscribed
+        """
+        key = (bot.pair, bot.timeframe)
+
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                return
+
+            feed.subscribers.pop(bot.bot_id, None)
+
+            if not feed.subscribers:
+                self.runtime.remove(key)
+                del self._feeds[key]
+
+market_hub = MarketDataHub(bot_runtime, buffer_size=settings.MARKET_FEED_BUFFER_SIZE)
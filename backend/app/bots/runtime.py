@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class BotRuntime:
+    """
+    Drives every running trading bot from a single event loop.
+
+    The loop lives in one background thread. Jobs (the market feeds the bots
+    subscribe to) are kept in a heap ordered by their next tick time, so the
+    scheduler only ever sleeps until the earliest due job, whatever the
+    number of jobs. Each tick runs as a coroutine and the number of ticks in
+    flight is bounded by a semaphore.
+    """
+
+    def __init__(self, max_concurrent_ticks: int):
+        self.max_concurrent_ticks = max_concurrent_ticks
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # Only touched from the loop thread
+        self._jobs: Dict[Hashable, Any] = {}
+        self._generations: Dict[Hashable, int] = {}
+        self._schedule: List[Tuple[float, int, Hashable, int]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks = set()
+
+    def add(self, key: Hashable, job: Any) -> None:
+        """
+        Schedule a job, its first tick runs as soon as possible.
+
+        Adding a key that is already scheduled replaces the job and moves its
+        next tick to now.
+
+        Args:
+            key: Unique key of the job
+            job: Object exposing an async tick() and next_delay(), the
+                number of seconds to wait after a tick before the next one
+        """
+        self._ensure_started()
+        self._loop.call_soon_threadsafe(self._add, key, job)
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Unschedule a job. A tick already in flight is allowed to finish.
+
+        Args:
+            key: Key of the job to remove
+        """
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._remove, key)
+
+    def shutdown(self, timeout: float = 10) -> None:
+        """Stop the event loop and wait for its thread to exit"""
+        with self._start_lock:
+            if self._loop is None:
+                return
+
+            loop, thread = self._loop, self._thread
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=timeout)
+
+            self._loop = None
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._loop is not None:
+                return
+
+            ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                args=(ready,),
+                name="bot-runtime",
+                daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_ticks)
+        scheduler = self._loop.create_task(self._run_scheduler())
+        ready.set()
+
+        try:
+            self._loop.run_forever()
+        finally:
+            scheduler.cancel()
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+            self._jobs.clear()
+            self._generations.clear()
+            self._schedule.clear()
+
+    def _add(self, key: Hashable, job: Any) -> None:
+        # A new generation invalidates heap entries left by a previous add
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._jobs[key] = job
+        self._push(key, generation, self._loop.time())
+
+    def _remove(self, key: Hashable) -> None:
+        self._jobs.pop(key, None)
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _push(self, key: Hashable, generation: int, due: float) -> None:
+        heapq.heappush(self._schedule, (due, next(self._sequence), key, generation))
+        self._wakeup.set()
+
+    async def _run_scheduler(self) -> None:
+        while True:
+            if not self._schedule:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            due, _, key, generation = self._schedule[0]
+            delay = due - self._loop.time()
+
+            if delay > 0:
+                # Sleep until the earliest tick, or until a job is added
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            heapq.heappop(self._schedule)
+
+            if self._generations.get(key) != generation:
+                continue
+
+            task = self._loop.create_task(self._tick(key, self._jobs[key], generation))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _tick(self, key: Hashable, job: Any, generation: int) -> None:
+        async with self._semaphore:
+            # The job may have been removed while waiting for a slot
+            if self._generations.get(key) != generation:
+                return
+
+            try:
+                await job.tick()
+            except Exception as e:
+                logger.error(f"Error in bot runtime job {key}: {e}")
+
+        if self._generations.get(key) == generation:
+            try:
+                delay = job.next_delay()
+            except Exception as e:
+                logger.error(f"Error scheduling bot runtime job {key}: {e}")
+                delay = settings.MARKET_FEED_POLL_INTERVAL
+
+            self._push(key, generation, self._loop.time() + max(delay, 0))
+
+bot_runtime = BotRuntime(max_concurrent_ticks=settings.BOT_MAX_CONCURRENT_TICKS)
@@ -1,5 +1,3 @@
-import threading
-import time
 import asyncio
 import pandas as pd
 import numpy as np
@@ -10,14 +8,25 @@ from sqlalchemy.orm import Session
 import traceback
 
 from app import models
-from app.utils import market_data, telegram
-from app.indicators.calculator import calculate_indicators
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.utils import telegram
+from app.utils.performance import add_closed_trade
+from app.indicators.calculator import calculate_indicators, required_indicators, warmup_period
+from app.indicators.registry import create_streaming_indicators
+from app.indicators.config import get_indicators_config
+from app.bots.conditions import compile_condition
+from app.bots.market_hub import market_hub
 
 logger = logging.getLogger(__name__)
 
 class TradingBot:
     """
-    Trading bot that runs in a separate thread and executes trades based on conditions.
+    Trading bot that executes trades based on conditions.
+
+    The bot does not own a thread or poll the market data API itself: it
+    subscribes to the market hub, which pushes new candles of its pair and
+    timeframe from the shared bot runtime.
     """
     
     def __init__(
@@ -29,127 +38,102 @@ class TradingBot:
         sell_condition: str,
         db_session: Session,
         telegram_channel: Optional[str] = None,
-        check_interval: int = 60,  # seconds
+        check_interval: int = 60,  # seconds, only used for timeframes with no known duration
     ):
         self.bot_id = bot_id
         self.pair = pair
         self.timeframe = timeframe
         self.buy_condition = buy_condition
         self.sell_condition = sell_condition
-        self.db_session = db_session
         self.telegram_channel = telegram_channel
         self.check_interval = check_interval
         
+        # Parse the conditions once, invalid expressions are rejected here
+        self.buy_rule = compile_condition(buy_condition)
+        self.sell_rule = compile_condition(sell_condition)
+        
         self.running = False
-        self.thread = None
         self.indicators = {}
         self.last_check = None
         
-        # Load indicators from database
-        self._load_indicators()
+        # Load indicators from database, the session is only used here since
+        # ticks run outside the request that started the bot
+        self._load_indicators(db_session)
+        
+        # Only the indicator columns used by the conditions are calculated
+        self.condition_names = self.buy_rule.names | self.sell_rule.names
+        self.indicators = required_indicators(self.indicators, self.condition_names)
+        
+        # Candles the indicators need before their values are reliable, plus the current one
+        self.required_candles = warmup_period(self.indicators) + 1
+        
+        # Indicators updated candle by candle, None falls back to a full recalculation
+        self.indicator_stream = None
+        if settings.BOT_STREAMING_INDICATORS:
+            self.indicator_stream = create_streaming_indicators(self.indicators)
     
-    def _load_indicators(self):
+    def _load_indicators(self, db: Session):
         """Load indicators configured for this bot"""
         try:
-            bot_indicators = self.db_session.query(models.BotIndicator).filter(
-                models.BotIndicator.bot_id == self.bot_id
-            ).all()
-            
-            for bi in bot_indicators:
-                indicator = self.db_session.query(models.Indicator).filter(
-                    models.Indicator.id == bi.indicator_id
-                ).first()
-                
-                if indicator:
-                    self.indicators[indicator.name] = {
-                        "parameters": bi.parameters,
-                        "base_parameters": indicator.parameters
-                    }
+            self.indicators.update(get_indicators_config(db, self.bot_id))
         except Exception as e:
             logger.error(f"Error loading indicators: {e}")
             traceback.print_exc()
     
     def start(self):
-        """Start the trading bot in a new thread"""
+        """Subscribe the trading bot to its market feed"""
         if self.running:
             logger.info(f"Bot {self.bot_id} is already running")
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._run)
-        self.thread.daemon = True
-        self.thread.start()
+        market_hub.subscribe(self)
         
         logger.info(f"Bot {self.bot_id} started")
     
     def stop(self):
-        """Stop the trading bot"""
+        """Unsubscribe the trading bot from its market feed"""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=10)
+        market_hub.unsubscribe(self)
         
         logger.info(f"Bot {self.bot_id} stopped")
     
-    def _run(self):
-        """Main loop of the trading bot"""
-        while self.running:
-            try:
-                # Check for new data and execute trading logic
-                self._check_and_execute()
-                
-                # Sleep until next check
-                time.sleep(self.check_interval)
-            except Exception as e:
-                logger.error(f"Error in bot {self.bot_id}: {e}")
-                traceback.print_exc()
-                time.sleep(self.check_interval)  # Still sleep on error
-    
-    def _check_and_execute(self):
-        """Check for new data and execute trading logic"""
-        # Use asyncio to get last price
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    async def on_candle(self, candles: pd.DataFrame):
+        """
+        Execute trading logic when the market feed has a new candle.
+        
+        Args:
+            candles: Recent candles of the bot's pair and timeframe, shared
+                with the other bots watching the same market
+        """
+        # Skip candles we have already checked
+        if candles.empty or (self.last_check is not None and candles.index[-1] == self.last_check):
+            return
         
         try:
-            # Get last price data
-            last_data = loop.run_until_complete(
-                market_data.get_last_price(self.pair, self.timeframe)
-            )
-            
-            # If no data or if we've already checked this candle, skip
-            if not last_data or (self.last_check and last_data['time'] == self.last_check):
-                return
-            
-            # Get some historical data for indicators
-            end_date = datetime.fromisoformat(last_data['time'].replace('Z', '+00:00'))
-            
-            # Get data for the last 200 candles (or what's appropriate for your indicators)
-            # This is to have enough data to calculate indicators
-            if 'h' in self.timeframe:
-                start_date = end_date - pd.Timedelta(hours=200)
-            else:
-                start_date = end_date - pd.Timedelta(days=200)
-            
-            historical_data = loop.run_until_complete(
-                market_data.get_historical_data(
-                    self.pair, 
-                    self.timeframe,
-                    start_date,
-                    end_date
-                )
-            )
-            
-            # Convert to DataFrame
-            df = market_data.get_dataframe(historical_data)
+            # Indicators and database work are blocking, keep them off the event loop
+            await asyncio.to_thread(self._execute, candles)
             
-            # Calculate indicators
-            df = calculate_indicators(df, self.indicators)
-            
-            # Evaluate conditions on the last row
-            last_row = df.iloc[-1].to_dict()
+            # Update last check time
+            self.last_check = candles.index[-1]
             
+        except Exception as e:
+            logger.error(f"Error in bot {self.bot_id}: {e}")
+            traceback.print_exc()
+    
+    def _execute(self, df: pd.DataFrame):
+        """Calculate indicators and open or close a trade on the last candle"""
+        if df.empty:
+            return
+        
+        # Evaluate conditions on the last row, the Series keeps its time as name
+        last_candle = self._last_candle(df)
+        last_row = last_candle.to_dict()
+        
+        db = SessionLocal()
+        try:
             # Check if there's an open trade for this bot
-            open_trade = self.db_session.query(models.Trade).filter(
+            open_trade = db.query(models.Trade).filter(
                 models.Trade.bot_id == self.bot_id,
                 models.Trade.status == 'open'
             ).first()
@@ -157,36 +141,51 @@ class TradingBot:
             if open_trade:
                 # We have an open trade, check sell condition
                 try:
-                    sell_result = eval(self.sell_condition, {"np": np, "pd": pd}, last_row)
+                    sell_result = self.sell_rule.evaluate(last_row)
                     
                     if sell_result:
                         # Close the trade
-                        self._close_trade(open_trade, last_row)
+                        self._close_trade(db, open_trade, last_candle)
                 except Exception as e:
                     logger.error(f"Error evaluating sell condition: {e}")
                     traceback.print_exc()
             else:
                 # No open trade, check buy condition
                 try:
-                    buy_result = eval(self.buy_condition, {"np": np, "pd": pd}, last_row)
+                    buy_result = self.buy_rule.evaluate(last_row)
                     
                     if buy_result:
                         # Open a new trade
-                        self._open_trade(last_row)
+                        self._open_trade(db, last_candle)
                 except Exception as e:
                     logger.error(f"Error evaluating buy condition: {e}")
                     traceback.print_exc()
-            
-            # Update last check time
-            self.last_check = last_data['time']
-            
-        except Exception as e:
-            logger.error(f"Error in check_and_execute: {e}")
-            traceback.print_exc()
         finally:
-            loop.close()
+            db.close()
+    
+    def _last_candle(self, df: pd.DataFrame) -> pd.Series:
+        """Get the OHLCV and indicator values of the last candle"""
+        if self.indicator_stream is None:
+            return calculate_indicators(df, self.indicators, columns=self.condition_names).iloc[-1]
+        
+        # Only closed candles are streamed, the last one may still be forming
+        closed = df.iloc[:-1]
+        last_time = self.indicator_stream.last_time
+        
+        # Prime again if the feed has moved past the streamed candles
+        if last_time is not None and not closed.empty and last_time < closed.index[0]:
+            self.indicator_stream = create_streaming_indicators(self.indicators)
+        
+        self.indicator_stream.update(closed)
+        
+        current = df.iloc[-1]
+        values = {
+            name: value for name, value in self.indicator_stream.peek(current.to_dict()).items()
+            if name in self.condition_names
+        }
+        return pd.Series({**current.to_dict(), **values}, name=current.name)
     
-    def _open_trade(self, data: Dict[str, Any]):
+    def _open_trade(self, db: Session, data: pd.Series):
         """Open a new trade based on the current data"""
         try:
             # For simplicity, we'll use the close price
@@ -212,14 +211,14 @@ class TradingBot:
                 }
             )
             
-            self.db_session.add(trade)
-            self.db_session.commit()
+            db.add(trade)
+            db.commit()
             
             logger.info(f"Opened trade {trade.id} at price {entry_price}")
             
             # Send Telegram notification if configured
             if self.telegram_channel:
-                bot = self.db_session.query(models.Bot).filter(models.Bot.id == self.bot_id).first()
+                bot = db.query(models.Bot).filter(models.Bot.id == self.bot_id).first()
                 bot_name = bot.name if bot else f"Bot {self.bot_id}"
                 
                 telegram.send_trade_signal(
@@ -235,7 +234,7 @@ class TradingBot:
             logger.error(f"Error opening trade: {e}")
             traceback.print_exc()
     
-    def _close_trade(self, trade: models.Trade, data: Dict[str, Any]):
+    def _close_trade(self, db: Session, trade: models.Trade, data: pd.Series):
         """Close an existing trade based on the current data"""
         try:
             # For simplicity, we'll use the close price
@@ -256,14 +255,17 @@ class TradingBot:
             trade.profit_loss_percent = profit_loss_percent
             trade.status = "closed"
             
-            self.db_session.add(trade)
-            self.db_session.commit()
+            db.add(trade)
+            
+            # Keep the daily performance read by the dashboards up to date
+            add_closed_trade(db, trade)
+            db.commit()
             
             logger.info(f"Closed trade {trade.id} at price {exit_price} with P/L: {profit_loss:.2f} ({profit_loss_percent:.2f}%)")
             
             # Send Telegram notification if configured
             if self.telegram_channel:
-                bot = self.db_session.query(models.Bot).filter(models.Bot.id == self.bot_id).first()
+                bot = db.query(models.Bot).filter(models.Bot.id == self.bot_id).first()
                 bot_name = bot.name if bot else f"Bot {self.bot_id}"
                 
                 message = f"SELL SIGNAL - {bot_name}\n\n"
@@ -9,6 +9,11 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    USER_CACHE_TTL: float = 30.0  # seconds an authenticated user is cached, 0 disables
+    USER_CACHE_MAX_SIZE: int = 10000
+    BCRYPT_ROUNDS: int = 12  # existing hashes are upgraded on the next login
+    PASSWORD_HASH_WORKERS: int = 4  # hashes computed concurrently
+    PASSWORD_HASH_MAX_PENDING: int = 64  # running or queued, more are rejected
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = []
@@ -44,13 +49,53 @@ class Settings(BaseSettings):
             path=f"{values.data.get('POSTGRES_DB') or ''}",
         )
     
+    # Async engine used by the endpoints running on the event loop
+    DB_ASYNC_POOL_SIZE: int = 20
+    DB_ASYNC_MAX_OVERFLOW: int = 10
+    
     # External APIs
     MARKET_DATA_API: str
     MARKET_DATA_API_USERNAME: str
     MARKET_DATA_API_PASSWORD: str
+    MARKET_DATA_TOKEN_TTL: int = 900  # seconds, used when the token has no expiry
+    MARKET_DATA_TIMEOUT: float = 30.0
+    MARKET_DATA_MAX_CONNECTIONS: int = 20
+    MARKET_DATA_CACHE_ENABLED: bool = True
+    MARKET_DATA_CACHE_DIR: str = ".cache/candles"
+    MARKET_DATA_CACHE_MAX_SEGMENTS: int = 16  # appended files before they are merged
+    MARKET_DATA_CACHE_EMPTY_RANGE_TTL: float = 3600.0  # seconds a fetch without candles is trusted
     
     # Telegram
     TELEGRAM_BOT_TOKEN: str
+    TELEGRAM_CHAT_MIN_INTERVAL: float = 3.0  # seconds between messages to one chat
+    TELEGRAM_MAX_MESSAGES_PER_SECOND: int = 25  # across all chats
+    TELEGRAM_COALESCE_DELAY: float = 0.5  # wait for more messages before sending
+    TELEGRAM_MAX_CONCURRENT_SENDS: int = 4
+    TELEGRAM_MAX_RETRIES: int = 3
+    
+    # Bots
+    BOT_MAX_CONCURRENT_TICKS: int = 50
+    MARKET_FEED_POLL_INTERVAL: int = 60  # seconds
+    MARKET_FEED_BUFFER_SIZE: int = 500  # candles kept per (pair, timeframe)
+    BOT_STREAMING_INDICATORS: bool = True  # False recalculates indicators on every candle
+    BOT_CANDLE_CLOSE_DELAY: float = 2.0  # seconds to wait after a candle close
+    BOT_CANDLE_CLOSE_JITTER: float = 3.0  # random extra delay, spreads the feeds out
+    BOT_RETRY_INITIAL_DELAY: float = 1.0  # backoff while a closed candle is not published
+    BOT_RETRY_MAX_DELAY: float = 60.0
+    
+    # Backtesting
+    BACKTEST_ENGINE: str = "vectorized"  # legacy, vectorized
+    BACKTEST_MAX_WORKERS: Optional[int] = None  # Defaults to the number of CPUs
+    BACKTEST_SWEEP_MAX_COMBINATIONS: int = 500
+    
+    # Performance
+    PERFORMANCE_MAX_POINTS: int = 500  # time series points returned to charts
+    
+    # Response cache of the public read-mostly endpoints
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_MARKETING_TTL: int = 300  # seconds, tutorials and opinions
+    RESPONSE_CACHE_CATALOG_TTL: int = 60  # seconds, indicators and subscriptions
     
     class Config:
         case_sensitive = True
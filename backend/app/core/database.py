@@ -1,14 +1,31 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.utils import fastjson
 
 # Convert the URL to a string before passing to create_engine
 db_url = str(settings.SQLALCHEMY_DATABASE_URI)
-engine = create_engine(db_url, pool_pre_ping=True)
+
+# JSON columns (e.g. backtest results) are written with fastjson: faster on
+# large documents, and PostgreSQL rejects the NaN/Infinity of the stdlib encoder
+engine = create_engine(db_url, pool_pre_ping=True, json_serializer=fastjson.dumps_str)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Same database through asyncpg, for endpoints running on the event loop
+# instead of the threadpool
+async_engine = create_async_engine(
+    make_url(db_url).set(drivername="postgresql+asyncpg"),
+    pool_pre_ping=True,
+    pool_size=settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+    json_serializer=fastjson.dumps_str,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency to get the DB session
@@ -17,4 +34,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
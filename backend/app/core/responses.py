@@ -0,0 +1,44 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.utils import fastjson
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with app.utils.fastjson.
+
+    Used by the routes returning large payloads (backtest results,
+    performance series). Unlike JSONResponse it accepts NaN and infinite
+    floats, written as null.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return fastjson.dumps(content)
+
+def fast_json_response(response_model: Any, data: Any) -> FastJSONResponse:
+    """
+    Validate data against a response model and render it as JSON.
+
+    FastAPI passes the result of an endpoint through jsonable_encoder,
+    which walks every value of the payload in Python and dominates the
+    response time of multi-megabyte backtest results. Returning this
+    response skips it, the model is dumped by pydantic-core and rendered
+    by fastjson.
+
+    Args:
+        response_model: Response model of the route
+        data: ORM objects or dictionaries to return
+
+    Returns:
+        The response
+    """
+    adapter = type_adapter(response_model)
+    return FastJSONResponse(adapter.dump_python(adapter.validate_python(data, from_attributes=True)))
+
+@lru_cache(maxsize=None)
+def type_adapter(response_model: Any) -> TypeAdapter:
+    """Cached pydantic adapter of a response model"""
+    return TypeAdapter(response_model)
@@ -1,15 +1,27 @@
+import logging
 import pandas as pd
-import numpy as np
-import ta
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
 
-def calculate_indicators(df: pd.DataFrame, indicators_config: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+from app.indicators.registry import get_indicator
+
+logger = logging.getLogger(__name__)
+
+def calculate_indicators(
+    df: pd.DataFrame,
+    indicators_config: Dict[str, Dict[str, Any]],
+    columns: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
     """
     Calculate technical indicators based on configuration.
     
+    Each indicator is looked up in the indicator registry. The new columns
+    are collected first and joined to the candles in a single step, the
+    input DataFrame is left unchanged.
+    
     Args:
         df: DataFrame with OHLCV data
         indicators_config: Dictionary of indicator configurations
+        columns: Indicator columns to keep, every output is kept when None
         
     Returns:
         DataFrame with added indicator columns
@@ -17,102 +29,91 @@ def calculate_indicators(df: pd.DataFrame, indicators_config: Dict[str, Dict[str
     if df.empty:
         return df
     
-    # Make a copy to avoid modifying the original
-    df = df.copy()
+    if columns is not None:
+        columns = set(columns)
+    
+    outputs = {}
     
     for indicator_name, config in indicators_config.items():
-        params = {**config.get("base_parameters", {}), **config.get("parameters", {})}
+        spec = get_indicator(indicator_name)
+        
+        if spec is None:
+            logger.warning(f"Unknown indicator {indicator_name}, skipping it")
+            continue
+        
+        missing = [column for column in spec.inputs if column not in df]
+        if missing:
+            logger.error(f"Error calculating {indicator_name}: missing columns {', '.join(missing)}")
+            continue
         
         try:
-            if indicator_name == "SMA":
-                period = params.get("period", 14)
-                df[f'SMA_{period}'] = ta.trend.sma_indicator(df['close'], window=period)
-            
-            elif indicator_name == "EMA":
-                period = params.get("period", 14)
-                df[f'EMA_{period}'] = ta.trend.ema_indicator(df['close'], window=period)
-            
-            elif indicator_name == "RSI":
-                period = params.get("period", 14)
-                df[f'RSI_{period}'] = ta.momentum.rsi(df['close'], window=period)
-            
-            elif indicator_name == "MACD":
-                fast = params.get("fast_period", 12)
-                slow = params.get("slow_period", 26)
-                signal = params.get("signal_period", 9)
-                
-                macd = ta.trend.MACD(
-                    close=df['close'],
-                    window_fast=fast,
-                    window_slow=slow,
-                    window_sign=signal
-                )
-                
-                df[f'MACD_line'] = macd.macd()
-                df[f'MACD_signal'] = macd.macd_signal()
-                df[f'MACD_histogram'] = macd.macd_diff()
-            
-            elif indicator_name == "Bollinger Bands":
-                period = params.get("period", 20)
-                std_dev = params.get("std_dev", 2)
-                
-                bb = ta.volatility.BollingerBands(
-                    close=df['close'],
-                    window=period,
-                    window_dev=std_dev
-                )
-                
-                df[f'BB_upper'] = bb.bollinger_hband()
-                df[f'BB_middle'] = bb.bollinger_mavg()
-                df[f'BB_lower'] = bb.bollinger_lband()
-                df[f'BB_width'] = bb.bollinger_wband()
-            
-            elif indicator_name == "Stochastic":
-                k_period = params.get("k_period", 14)
-                d_period = params.get("d_period", 3)
-                
-                stoch = ta.momentum.StochasticOscillator(
-                    high=df['high'],
-                    low=df['low'],
-                    close=df['close'],
-                    window=k_period,
-                    smooth_window=d_period
-                )
-                
-                df[f'Stoch_%K'] = stoch.stoch()
-                df[f'Stoch_%D'] = stoch.stoch_signal()
-            
-            elif indicator_name == "ATR":
-                period = params.get("period", 14)
-                df[f'ATR_{period}'] = ta.volatility.average_true_range(
-                    high=df['high'],
-                    low=df['low'],
-                    close=df['close'],
-                    window=period
-                )
-            
-            elif indicator_name == "OBV":
-                df['OBV'] = ta.volume.on_balance_volume(
-                    close=df['close'],
-                    volume=df.get('volume', df.get('tick_volume', df.get('real_volume')))
-                )
-            
-            elif indicator_name == "ADX":
-                period = params.get("period", 14)
-                adx = ta.trend.ADXIndicator(
-                    high=df['high'],
-                    low=df['low'],
-                    close=df['close'],
-                    window=period
-                )
-                
-                df[f'ADX_{period}'] = adx.adx()
-                df[f'DI+_{period}'] = adx.adx_pos()
-                df[f'DI-_{period}'] = adx.adx_neg()
-            
-            # Add more indicators as needed
-            
+            values = spec.compute(df, spec.resolve_parameters(config))
         except Exception as e:
-            print(f"Error calculating {indicator_name}: {e}")
+            logger.error(f"Error calculating {indicator_name}: {e}")
+            continue
+        
+        for name, series in values.items():
+            if columns is None or name in columns:
+                outputs[name] = series
+    
+    if not outputs:
+        return df.copy()
+    
+    return df.assign(**outputs)
+
+def required_indicators(
+    indicators_config: Dict[str, Dict[str, Any]],
+    names: Iterable[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Keep only the indicators whose outputs are referenced.
+    
+    Args:
+        indicators_config: Dictionary of indicator configurations
+        names: Names used by the buy/sell conditions
+        
+    Returns:
+        The configurations of the indicators the conditions depend on
+    """
+    names = set(names)
+    
+    return {
+        indicator_name: config
+        for indicator_name, config in indicators_config.items()
+        if names.intersection(indicator_columns(indicator_name, config))
+    }
+
+def indicator_columns(indicator_name: str, config: Dict[str, Any]) -> List[str]:
+    """
+    Get the names of the columns an indicator adds to the DataFrame.
+    
+    Args:
+        indicator_name: Name of the indicator (e.g. "RSI")
+        config: Indicator configuration with parameters and base_parameters
+        
+    Returns:
+        List of column names, in the order calculate_indicators adds them
+    """
+    spec = get_indicator(indicator_name)
+    if spec is None:
+        return []
+    return spec.columns(config)
+
+def warmup_period(indicators_config: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Get the number of candles needed before every indicator is reliable.
+    
+    Args:
+        indicators_config: Dictionary of indicator configurations
+        
+    Returns:
+        The longest warm-up of the configured indicators
+    """
+    periods = [0]
+    
+    for indicator_name, config in indicators_config.items():
+        spec = get_indicator(indicator_name)
+        if spec is not None:
+            periods.append(spec.warmup_period(config))
     
-    return df 
\ No newline at end of file
+    return max(periods)
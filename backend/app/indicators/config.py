@@ -0,0 +1,37 @@
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+def get_indicators_config(db: Session, bot_id: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the indicators configuration of a bot.
+
+    The bot's indicators are joined with their definitions, so the
+    configuration is loaded with one query whatever the number of indicators.
+
+    Args:
+        db: Database session
+        bot_id: ID of the bot
+
+    Returns:
+        Dictionary of indicator configurations keyed by indicator name
+    """
+    rows = db.query(
+        models.Indicator.name,
+        models.Indicator.parameters,
+        models.BotIndicator.parameters
+    ).join(
+        models.BotIndicator, models.BotIndicator.indicator_id == models.Indicator.id
+    ).filter(
+        models.BotIndicator.bot_id == bot_id
+    ).order_by(models.BotIndicator.id).all()
+
+    return {
+        name: {
+            "parameters": parameters,
+            "base_parameters": base_parameters
+        }
+        for name, base_parameters, parameters in rows
+    }
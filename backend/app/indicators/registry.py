@@ -0,0 +1,327 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import ta
+
+from app.indicators.streaming import (
+    StreamingIndicator,
+    StreamingIndicatorSet,
+    StreamingSMA,
+    StreamingEMA,
+    StreamingRSI,
+    StreamingMACD,
+    StreamingBollingerBands,
+    StreamingStochastic,
+    StreamingATR,
+    StreamingOBV,
+    StreamingADX,
+)
+
+logger = logging.getLogger(__name__)
+
+# Volume columns in order of preference, depending on the market data source
+VOLUME_COLUMNS = ('volume', 'tick_volume', 'real_volume')
+
+class IndicatorSpec:
+    """
+    Declaration of an indicator the calculator can compute.
+
+    Args:
+        name: Indicator name, as stored in the indicators table
+        compute: Vectorized implementation, called with the candles and the
+            resolved parameters and returning the output columns by name
+        outputs: Output column names for the resolved parameters
+        warmup: Number of candles needed before the values are reliable
+        inputs: Candle columns the indicator reads
+        parameters: Default parameter values
+        streaming: Optional factory of the incremental version used by live bots
+    """
+
+    def __init__(
+        self,
+        name: str,
+        compute: Callable[[pd.DataFrame, Dict[str, Any]], Dict[str, pd.Series]],
+        outputs: Callable[[Dict[str, Any]], List[str]],
+        warmup: Callable[[Dict[str, Any]], int],
+        inputs: Tuple[str, ...] = ('close',),
+        parameters: Optional[Dict[str, Any]] = None,
+        streaming: Optional[Callable[[Dict[str, Any]], StreamingIndicator]] = None,
+    ):
+        self.name = name
+        self.compute = compute
+        self.outputs = outputs
+        self.warmup = warmup
+        self.inputs = inputs
+        self.parameters = parameters or {}
+        self.streaming = streaming
+
+    def resolve_parameters(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge the defaults with the indicator's and the bot's parameters.
+
+        Args:
+            config: Indicator configuration with parameters and base_parameters
+
+        Returns:
+            The parameters to compute the indicator with
+        """
+        return {
+            **self.parameters,
+            **(config.get("base_parameters") or {}),
+            **(config.get("parameters") or {}),
+        }
+
+    def columns(self, config: Dict[str, Any]) -> List[str]:
+        """Get the output column names for a configuration"""
+        return self.outputs(self.resolve_parameters(config))
+
+    def warmup_period(self, config: Dict[str, Any]) -> int:
+        """Get the number of candles needed before the values are reliable"""
+        return self.warmup(self.resolve_parameters(config))
+
+_REGISTRY: Dict[str, IndicatorSpec] = {}
+
+def register_indicator(
+    name: str,
+    outputs: Callable[[Dict[str, Any]], List[str]],
+    warmup: Callable[[Dict[str, Any]], int],
+    inputs: Tuple[str, ...] = ('close',),
+    parameters: Optional[Dict[str, Any]] = None,
+    streaming: Optional[Callable[[Dict[str, Any]], StreamingIndicator]] = None,
+) -> Callable:
+    """
+    Decorator registering a vectorized indicator implementation.
+
+    Example:
+        @register_indicator(
+            "ROC",
+            parameters={"period": 10},
+            outputs=lambda p: [f"ROC_{p['period']}"],
+            warmup=lambda p: p["period"] + 1,
+        )
+        def roc(df, params):
+            return {f"ROC_{params['period']}": df['close'].pct_change(params['period']) * 100}
+
+    Args:
+        name: Indicator name, as stored in the indicators table
+        outputs: Output column names for the resolved parameters
+        warmup: Number of candles needed before the values are reliable
+        inputs: Candle columns the indicator reads
+        parameters: Default parameter values
+        streaming: Optional factory of the incremental version
+
+    Returns:
+        Decorator returning the implementation unchanged
+    """
+    def decorator(compute):
+        _REGISTRY[name] = IndicatorSpec(
+            name=name,
+            compute=compute,
+            outputs=outputs,
+            warmup=warmup,
+            inputs=inputs,
+            parameters=parameters,
+            streaming=streaming,
+        )
+        return compute
+
+    return decorator
+
+def get_indicator(name: str) -> Optional[IndicatorSpec]:
+    """Get a registered indicator by name"""
+    return _REGISTRY.get(name)
+
+def registered_indicators() -> List[str]:
+    """Get the names of all registered indicators"""
+    return list(_REGISTRY)
+
+def create_streaming_indicators(indicators_config: Dict[str, Dict[str, Any]]) -> Optional[StreamingIndicatorSet]:
+    """
+    Build the streaming versions of a bot's indicators.
+
+    Args:
+        indicators_config: Dictionary of indicator configurations
+
+    Returns:
+        The streaming indicator set, or None if an indicator has no
+        streaming version
+    """
+    indicators = []
+    for indicator_name, config in indicators_config.items():
+        spec = get_indicator(indicator_name)
+        if spec is None or spec.streaming is None:
+            return None
+
+        indicators.append(spec.streaming(spec.resolve_parameters(config)))
+
+    return StreamingIndicatorSet(indicators)
+
+def volume_column(df: pd.DataFrame) -> Optional[str]:
+    """Get the name of the volume column of a candles DataFrame"""
+    for column in VOLUME_COLUMNS:
+        if column in df:
+            return column
+    return None
+
+# Built-in indicators
+#
+# Exponentially smoothed indicators are given about three time constants of
+# warm-up so the seed no longer weighs on the value.
+
+@register_indicator(
+    "SMA",
+    parameters={"period": 14},
+    outputs=lambda p: [f'SMA_{p["period"]}'],
+    warmup=lambda p: p["period"],
+    streaming=lambda p: StreamingSMA(p["period"]),
+)
+def sma(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    period = params["period"]
+    return {f'SMA_{period}': ta.trend.sma_indicator(df['close'], window=period)}
+
+@register_indicator(
+    "EMA",
+    parameters={"period": 14},
+    outputs=lambda p: [f'EMA_{p["period"]}'],
+    warmup=lambda p: 3 * p["period"],
+    streaming=lambda p: StreamingEMA(p["period"]),
+)
+def ema(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    period = params["period"]
+    return {f'EMA_{period}': ta.trend.ema_indicator(df['close'], window=period)}
+
+@register_indicator(
+    "RSI",
+    parameters={"period": 14},
+    outputs=lambda p: [f'RSI_{p["period"]}'],
+    warmup=lambda p: 3 * p["period"] + 1,
+    streaming=lambda p: StreamingRSI(p["period"]),
+)
+def rsi(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    period = params["period"]
+    return {f'RSI_{period}': ta.momentum.rsi(df['close'], window=period)}
+
+@register_indicator(
+    "MACD",
+    parameters={"fast_period": 12, "slow_period": 26, "signal_period": 9},
+    outputs=lambda p: ['MACD_line', 'MACD_signal', 'MACD_histogram'],
+    warmup=lambda p: 3 * p["slow_period"] + p["signal_period"],
+    streaming=lambda p: StreamingMACD(p["fast_period"], p["slow_period"], p["signal_period"]),
+)
+def macd(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    indicator = ta.trend.MACD(
+        close=df['close'],
+        window_fast=params["fast_period"],
+        window_slow=params["slow_period"],
+        window_sign=params["signal_period"]
+    )
+
+    return {
+        'MACD_line': indicator.macd(),
+        'MACD_signal': indicator.macd_signal(),
+        'MACD_histogram': indicator.macd_diff(),
+    }
+
+@register_indicator(
+    "Bollinger Bands",
+    parameters={"period": 20, "std_dev": 2},
+    outputs=lambda p: ['BB_upper', 'BB_middle', 'BB_lower', 'BB_width'],
+    warmup=lambda p: p["period"],
+    streaming=lambda p: StreamingBollingerBands(p["period"], p["std_dev"]),
+)
+def bollinger_bands(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    bb = ta.volatility.BollingerBands(
+        close=df['close'],
+        window=params["period"],
+        window_dev=params["std_dev"]
+    )
+
+    return {
+        'BB_upper': bb.bollinger_hband(),
+        'BB_middle': bb.bollinger_mavg(),
+        'BB_lower': bb.bollinger_lband(),
+        'BB_width': bb.bollinger_wband(),
+    }
+
+@register_indicator(
+    "Stochastic",
+    inputs=('high', 'low', 'close'),
+    parameters={"k_period": 14, "d_period": 3},
+    outputs=lambda p: ['Stoch_%K', 'Stoch_%D'],
+    warmup=lambda p: p["k_period"] + p["d_period"] - 1,
+    streaming=lambda p: StreamingStochastic(p["k_period"], p["d_period"]),
+)
+def stochastic(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    stoch = ta.momentum.StochasticOscillator(
+        high=df['high'],
+        low=df['low'],
+        close=df['close'],
+        window=params["k_period"],
+        smooth_window=params["d_period"]
+    )
+
+    return {
+        'Stoch_%K': stoch.stoch(),
+        'Stoch_%D': stoch.stoch_signal(),
+    }
+
+@register_indicator(
+    "ATR",
+    inputs=('high', 'low', 'close'),
+    parameters={"period": 14},
+    outputs=lambda p: [f'ATR_{p["period"]}'],
+    warmup=lambda p: 3 * p["period"],
+    streaming=lambda p: StreamingATR(p["period"]),
+)
+def atr(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    period = params["period"]
+    return {
+        f'ATR_{period}': ta.volatility.average_true_range(
+            high=df['high'],
+            low=df['low'],
+            close=df['close'],
+            window=period
+        )
+    }
+
+# OBV is a running total from the first candle it is given, so its level
+# depends on where the candles start: a live bot's recent window or primed
+# stream and a backtest over the full history give different levels. Only
+# its changes are meaningful, conditions should not compare it to a fixed
+# value. The warm-up only covers the first change.
+@register_indicator(
+    "OBV",
+    outputs=lambda p: ['OBV'],
+    warmup=lambda p: 1,
+    streaming=lambda p: StreamingOBV(),
+)
+def obv(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    column = volume_column(df)
+    if column is None:
+        raise ValueError("No volume column in the candles")
+
+    return {'OBV': ta.volume.on_balance_volume(close=df['close'], volume=df[column])}
+
+@register_indicator(
+    "ADX",
+    inputs=('high', 'low', 'close'),
+    parameters={"period": 14},
+    outputs=lambda p: [f'ADX_{p["period"]}', f'DI+_{p["period"]}', f'DI-_{p["period"]}'],
+    warmup=lambda p: 4 * p["period"],
+    streaming=lambda p: StreamingADX(p["period"]),
+)
+def adx(df: pd.DataFrame, params: Dict[str, Any]) -> Dict[str, pd.Series]:
+    period = params["period"]
+    indicator = ta.trend.ADXIndicator(
+        high=df['high'],
+        low=df['low'],
+        close=df['close'],
+        window=period
+    )
+
+    return {
+        f'ADX_{period}': indicator.adx(),
+        f'DI+_{period}': indicator.adx_pos(),
+        f'DI-_{period}': indicator.adx_neg(),
+    }
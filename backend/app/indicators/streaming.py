@@ -0,0 +1,463 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+NAN = float("nan")
+
+class StreamingIndicator(ABC):
+    """
+    Indicator updated one candle at a time with constant work per candle.
+
+    Subclasses reproduce the output of the `ta` functions used by
+    calculate_indicators, including their warm-up values (NaN or 0), so a
+    live bot sees the same numbers as a backtest on the same candles.
+    """
+
+    columns: List[str] = []
+
+    @abstractmethod
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Add a closed candle to the indicator state.
+
+        Args:
+            candle: Mapping with the candle's OHLCV values
+
+        Returns:
+            The indicator values for this candle, keyed by column name
+        """
+
+    @abstractmethod
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Get the values update would return for a candle, without changing
+        the state, e.g. for a candle that is still forming.
+
+        Args:
+            candle: Mapping with the candle's OHLCV values
+
+        Returns:
+            The indicator values for this candle, keyed by column name
+        """
+
+class _Ema:
+    """Exponential moving average matching pandas ewm(adjust=False)"""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.count = 0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if not math.isnan(x):
+            self.value = self._next(x)
+            self.count += 1
+        return self.value if self.count >= self.min_periods else NAN
+
+    def peek(self, x: float) -> float:
+        if math.isnan(x):
+            return self.value if self.count >= self.min_periods else NAN
+        return self._next(x) if self.count + 1 >= self.min_periods else NAN
+
+    def _next(self, x: float) -> float:
+        return x if self.count == 0 else self.value + self.alpha * (x - self.value)
+
+class _RollingMean:
+    """Rolling mean over a fixed window, NaN until the window is full"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, x: float) -> Tuple[float, float]:
+        """Add a value, returning the mean and population standard deviation"""
+        self.total, self.total_sq = self._totals(x)
+        self.values.append(x)
+        return self._stats(self.total, self.total_sq, len(self.values))
+
+    def peek(self, x: float) -> Tuple[float, float]:
+        """Mean and standard deviation update would return, without adding x"""
+        total, total_sq = self._totals(x)
+        return self._stats(total, total_sq, len(self.values) + 1)
+
+    def _totals(self, x: float) -> Tuple[float, float]:
+        total, total_sq = self.total, self.total_sq
+        if len(self.values) == self.window:
+            old = self.values[0]
+            total -= old
+            total_sq -= old * old
+        return total + x, total_sq + x * x
+
+    def _stats(self, total: float, total_sq: float, count: int) -> Tuple[float, float]:
+        if count < self.window:
+            return NAN, NAN
+        mean = total / self.window
+        return mean, math.sqrt(max(total_sq / self.window - mean * mean, 0.0))
+
+class _RollingExtreme:
+    """Rolling min or max over a fixed window using a monotonic queue"""
+
+    def __init__(self, window: int, maximum: bool):
+        self.window = window
+        self.maximum = maximum
+        self.queue = deque()
+        self.index = 0
+
+    def update(self, x: float) -> float:
+        while self.queue and (self.queue[-1][1] <= x if self.maximum else self.queue[-1][1] >= x):
+            self.queue.pop()
+        self.queue.append((self.index, x))
+        if self.queue[0][0] <= self.index - self.window:
+            self.queue.popleft()
+        self.index += 1
+        return self.queue[0][1] if self.index >= self.window else NAN
+
+    def peek(self, x: float) -> float:
+        if self.index + 1 < self.window:
+            return NAN
+
+        # The front is the extreme of the window, unless it leaves it with x
+        front = None
+        for position, value in islice(self.queue, 2):
+            if position > self.index - self.window:
+                front = value
+                break
+
+        if front is None:
+            return x
+        return max(front, x) if self.maximum else min(front, x)
+
+class StreamingSMA(StreamingIndicator):
+    def __init__(self, period: int = 14):
+        self.columns = [f'SMA_{period}']
+        self._mean = _RollingMean(period)
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return {self.columns[0]: self._mean.update(candle['close'])[0]}
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return {self.columns[0]: self._mean.peek(candle['close'])[0]}
+
+class StreamingEMA(StreamingIndicator):
+    def __init__(self, period: int = 14):
+        self.columns = [f'EMA_{period}']
+        self._ema = _Ema(2 / (period + 1), period)
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return {self.columns[0]: self._ema.update(candle['close'])}
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return {self.columns[0]: self._ema.peek(candle['close'])}
+
+class StreamingRSI(StreamingIndicator):
+    def __init__(self, period: int = 14):
+        self.columns = [f'RSI_{period}']
+        self._up = _Ema(1 / period, period)
+        self._down = _Ema(1 / period, period)
+        self._prev_close = None
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        diff = self._diff(candle['close'])
+        self._prev_close = candle['close']
+        return self._values(self._up.update(max(diff, 0.0)), self._down.update(max(-diff, 0.0)))
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        diff = self._diff(candle['close'])
+        return self._values(self._up.peek(max(diff, 0.0)), self._down.peek(max(-diff, 0.0)))
+
+    def _diff(self, close: float) -> float:
+        # The first candle has no change, ta counts it as a zero move
+        return 0.0 if self._prev_close is None else close - self._prev_close
+
+    def _values(self, up: float, down: float) -> Dict[str, float]:
+        if down == 0:
+            rsi = 100.0
+        elif math.isnan(up) or math.isnan(down):
+            rsi = NAN
+        else:
+            rsi = 100 - 100 / (1 + up / down)
+
+        return {self.columns[0]: rsi}
+
+class StreamingMACD(StreamingIndicator):
+    columns = ['MACD_line', 'MACD_signal', 'MACD_histogram']
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self._fast = _Ema(2 / (fast_period + 1), fast_period)
+        self._slow = _Ema(2 / (slow_period + 1), slow_period)
+        self._signal = _Ema(2 / (signal_period + 1), signal_period)
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        close = candle['close']
+        line = self._fast.update(close) - self._slow.update(close)
+        return self._values(line, self._signal.update(line))
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        close = candle['close']
+        line = self._fast.peek(close) - self._slow.peek(close)
+        return self._values(line, self._signal.peek(line))
+
+    def _values(self, line: float, signal: float) -> Dict[str, float]:
+        return {
+            'MACD_line': line,
+            'MACD_signal': signal,
+            'MACD_histogram': line - signal,
+        }
+
+class StreamingBollingerBands(StreamingIndicator):
+    columns = ['BB_upper', 'BB_middle', 'BB_lower', 'BB_width']
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.std_dev = std_dev
+        self._window = _RollingMean(period)
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return self._values(*self._window.update(candle['close']))
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return self._values(*self._window.peek(candle['close']))
+
+    def _values(self, middle: float, std: float) -> Dict[str, float]:
+        deviation = self.std_dev * std
+        upper = middle + deviation
+        lower = middle - deviation
+
+        return {
+            'BB_upper': upper,
+            'BB_middle': middle,
+            'BB_lower': lower,
+            'BB_width': _divide(upper - lower, middle) * 100,
+        }
+
+class StreamingStochastic(StreamingIndicator):
+    columns = ['Stoch_%K', 'Stoch_%D']
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self._lowest = _RollingExtreme(k_period, maximum=False)
+        self._highest = _RollingExtreme(k_period, maximum=True)
+        self._k_values = deque(maxlen=d_period)
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        lowest = self._lowest.update(candle['low'])
+        highest = self._highest.update(candle['high'])
+        k = 100 * _divide(candle['close'] - lowest, highest - lowest)
+
+        self._k_values.append(k)
+        return {'Stoch_%K': k, 'Stoch_%D': self._d(list(self._k_values))}
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        lowest = self._lowest.peek(candle['low'])
+        highest = self._highest.peek(candle['high'])
+        k = 100 * _divide(candle['close'] - lowest, highest - lowest)
+
+        # The %D window is a few candles long
+        skip = 1 if len(self._k_values) == self._k_values.maxlen else 0
+        return {'Stoch_%K': k, 'Stoch_%D': self._d(list(islice(self._k_values, skip, None)) + [k])}
+
+    def _d(self, k_values: List[float]) -> float:
+        if len(k_values) < self._k_values.maxlen or any(math.isnan(v) for v in k_values):
+            return NAN
+        return sum(k_values) / len(k_values)
+
+class StreamingATR(StreamingIndicator):
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.columns = [f'ATR_{period}']
+        self._prev_close = None
+        self._count = 0
+        self._total = 0.0
+        self._atr = 0.0
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        state, values = self._advance(candle)
+        self.__dict__.update(state)
+        return values
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return self._advance(candle)[1]
+
+    def _advance(self, candle: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """State after a candle and the values for it, leaving the state as is"""
+        true_range = _true_range(candle['high'], candle['low'], self._prev_close)
+        count = self._count + 1
+        total, atr = self._total, self._atr
+
+        # ta seeds with the mean of the first true ranges and reports 0 before
+        if count < self.period:
+            total += true_range
+        elif count == self.period:
+            atr = (total + true_range) / self.period
+        else:
+            atr = (atr * (self.period - 1) + true_range) / self.period
+
+        state = {'_prev_close': candle['close'], '_count': count, '_total': total, '_atr': atr}
+        return state, {self.columns[0]: atr}
+
+class StreamingOBV(StreamingIndicator):
+    """Running total from the first candle added, see the OBV registration"""
+
+    columns = ['OBV']
+
+    def __init__(self):
+        self._prev_close = None
+        self._obv = 0.0
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        self._obv = self._next(candle)
+        self._prev_close = candle['close']
+        return {'OBV': self._obv}
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return {'OBV': self._next(candle)}
+
+    def _next(self, candle: Dict[str, Any]) -> float:
+        volume = _volume(candle)
+        if self._prev_close is not None and candle['close'] < self._prev_close:
+            return self._obv - volume
+        return self._obv + volume
+
+class StreamingADX(StreamingIndicator):
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.columns = [f'ADX_{period}', f'DI+_{period}', f'DI-_{period}']
+        self._prev = None
+        self._count = 0
+        self._tr = 0.0
+        self._plus = 0.0
+        self._minus = 0.0
+        self._dx_count = 0
+        self._dx_total = 0.0
+        self._adx = 0.0
+
+    def update(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        state, values = self._advance(candle)
+        self.__dict__.update(state)
+        return values
+
+    def preview(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        return self._advance(candle)[1]
+
+    def _advance(self, candle: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """State after a candle and the values for it, leaving the state as is"""
+        high, low, close = candle['high'], candle['low'], candle['close']
+        prev = self._prev
+        index = self._count
+        state = {'_prev': (high, low, close), '_count': index + 1}
+
+        if prev is None:
+            return state, self._values(self._adx, 0.0, 0.0)
+
+        prev_high, prev_low, prev_close = prev
+        true_range = max(high, prev_close) - min(low, prev_close)
+        up = high - prev_high
+        down = prev_low - low
+        plus_move = up if up > down and up > 0 else 0.0
+        minus_move = down if down > up and down > 0 else 0.0
+
+        # Wilder smoothing, seeded with the sum of the first `period` moves
+        tr, plus, minus = self._tr, self._plus, self._minus
+        if index <= self.period:
+            tr += true_range
+            plus += plus_move
+            minus += minus_move
+        else:
+            tr += true_range - tr / self.period
+            plus += plus_move - plus / self.period
+            minus += minus_move - minus / self.period
+        state.update(_tr=tr, _plus=plus, _minus=minus)
+
+        if index < self.period:
+            return state, self._values(self._adx, 0.0, 0.0)
+
+        plus_di = 100 * plus / tr if tr != 0 else 0.0
+        minus_di = 100 * minus / tr if tr != 0 else 0.0
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / di_sum if di_sum != 0 else 0.0
+
+        dx_count = self._dx_count + 1
+        dx_total, adx = self._dx_total, self._adx
+        if dx_count < self.period:
+            dx_total += dx
+        elif dx_count == self.period:
+            adx = (dx_total + dx) / self.period
+        else:
+            adx = (adx * (self.period - 1) + dx) / self.period
+        state.update(_dx_count=dx_count, _dx_total=dx_total, _adx=adx)
+
+        # ta leaves the directional indicators at 0 on the seeding candle
+        if index == self.period:
+            return state, self._values(adx, 0.0, 0.0)
+
+        return state, self._values(adx, plus_di, minus_di)
+
+    def _values(self, adx: float, plus_di: float, minus_di: float) -> Dict[str, float]:
+        return {self.columns[0]: adx, self.columns[1]: plus_di, self.columns[2]: minus_di}
+
+class StreamingIndicatorSet:
+    """
+    The streaming indicators of a bot, fed with the candles it receives.
+
+    The last candle of a live feed may still be forming, so only closed
+    candles are added to the state. The current candle is evaluated with
+    preview, which leaves the state as is.
+    """
+
+    def __init__(self, indicators: Iterable[StreamingIndicator]):
+        self.indicators = list(indicators)
+        self.last_time = None
+
+    def update(self, candles: pd.DataFrame) -> None:
+        """
+        Add the candles newer than the last one added.
+
+        Args:
+            candles: Closed candles indexed by time
+        """
+        if self.last_time is not None:
+            candles = candles[candles.index > self.last_time]
+
+        for time, candle in zip(candles.index, candles.to_dict('records')):
+            for indicator in self.indicators:
+                indicator.update(candle)
+            self.last_time = time
+
+    def peek(self, candle: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Get the indicator values for a candle without adding it to the state.
+
+        Args:
+            candle: Mapping with the candle's OHLCV values
+
+        Returns:
+            Indicator values keyed by column name
+        """
+        values = {}
+        for indicator in self.indicators:
+            values.update(indicator.preview(candle))
+        return values
+
+def _divide(numerator: float, denominator: float) -> float:
+    # Same results as pandas for a zero denominator
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+def _true_range(high: float, low: float, prev_close: Optional[float]) -> float:
+    if prev_close is None:
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+def _volume(candle: Dict[str, Any]) -> float:
+    for column in ('volume', 'tick_volume', 'real_volume'):
+        if column in candle:
+            return candle[column]
+    return NAN
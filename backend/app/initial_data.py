@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app import models
 from app.auth.jwt import get_password_hash
 from app.core.database import SessionLocal, Base, engine
+from app.utils.performance import rebuild_rollups
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,6 +18,12 @@ def init_db() -> None:
         # Create tables
         Base.metadata.create_all(bind=engine)
         
+        # Backfill the daily performance of trades closed before it existed
+        if not db.query(models.BotPerformanceDaily).first() and db.query(models.Trade).filter(
+            models.Trade.status == "closed"
+        ).first():
+            rebuild_rollups(db)
+        
         # Check if the database is already initialized
         user = db.query(models.User).first()
         if user:
@@ -130,7 +137,7 @@ def create_sample_data(db: Session) -> None:
         ),
         models.Indicator(
             name="OBV",
-            description="On-Balance Volume",
+            description="On-Balance Volume, a running total whose level depends on the first candle",
             parameters={},
             is_active=True,
         ),
@@ -224,6 +231,8 @@ Measures market volatility by decomposing the entire range of an asset price for
 ### On-Balance Volume (OBV)
 Uses volume flow to predict changes in stock price. It adds volume on up days and subtracts volume on down days.
 
+OBV is a running total starting from the first candle of the data, so its level differs between a backtest and a live bot, which only loads recent candles. Read its direction rather than its value: avoid conditions such as `OBV > 100000`.
+
 ## Creating Effective Trading Strategies
 
 Combining multiple indicators can create powerful trading strategies. For example, you might use RSI to identify overbought/oversold conditions and confirm with a moving average crossover.
@@ -2,6 +2,6 @@ from app.models.user import User
 from app.models.subscription import Subscription
 from app.models.indicator import Indicator
 from app.models.bot import Bot, BotIndicator
-from app.models.backtest import Backtest
+from app.models.backtest import Backtest, BacktestTrade, BacktestSweep
 from app.models.marketing import Tutorial, Opinion
-from app.models.performance import Trade 
\ No newline at end of file
+from app.models.performance import Trade, BotPerformanceDaily 
\ No newline at end of file
@@ -1,17 +1,22 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, JSON, ForeignKey, Float, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, JSON, ForeignKey, Float, Text, Index
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 
 from app.core.database import Base
 
 class Backtest(Base):
     __tablename__ = "backtests"
+    __table_args__ = (
+        # User's backtests, newest first
+        Index("ix_backtests_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
     status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
-    results = Column(JSON)  # JSON field to store backtest results
+    # Summary metrics, deferred since legacy rows also hold the whole ledger
+    results = deferred(Column(JSON))
     win_rate = Column(Float)
     profit_factor = Column(Float)
     total_trades = Column(Integer)
@@ -34,4 +39,64 @@ class Backtest(Base):
     timeframe = Column(String, nullable=False)
     buy_condition = Column(Text)
     sell_condition = Column(Text)
-    indicators_config = Column(JSON) 
\ No newline at end of file
+    indicators_config = Column(JSON)
+    
+    # Closed trades, stored apart from the results and read from the ledger endpoint
+    trades = relationship(
+        "BacktestTrade",
+        back_populates="backtest",
+        order_by="BacktestTrade.id",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+class BacktestTrade(Base):
+    __tablename__ = "backtest_trades"
+    __table_args__ = (
+        # Ledger of a backtest in trade order
+        Index("ix_backtest_trades_backtest_id_id", "backtest_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    backtest_id = Column(Integer, ForeignKey("backtests.id", ondelete="CASCADE"), nullable=False)
+    entry_time = Column(DateTime, nullable=False)
+    exit_time = Column(DateTime, nullable=False)
+    entry_price = Column(Float, nullable=False)
+    exit_price = Column(Float, nullable=False)
+    profit_loss = Column(Float, nullable=False)  # percent
+    profit_loss_amount = Column(Float, nullable=False)
+    equity = Column(Float, nullable=False)  # equity curve point after the trade, starting from 100
+    
+    backtest = relationship("Backtest", back_populates="trades")
+
+class BacktestSweep(Base):
+    __tablename__ = "backtest_sweeps"
+    __table_args__ = (
+        # User's sweeps, newest first
+        Index("ix_backtest_sweeps_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    parameter_grid = Column(JSON, nullable=False)  # Parameter ranges per indicator
+    rank_by = Column(String, nullable=False, default="sharpe_ratio")
+    total_combinations = Column(Integer, nullable=False)
+    # Ranked summary metrics, one entry per combination, only read with a single sweep
+    results = deferred(Column(JSON))
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships with user and bot
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    bot_id = Column(Integer, ForeignKey("bots.id"), nullable=False)
+    bot = relationship("Bot")
+    
+    # Store the bot configuration at the time of the sweep
+    pair = Column(String, nullable=False)
+    timeframe = Column(String, nullable=False)
+    buy_condition = Column(Text)
+    sell_condition = Column(Text)
+    indicators_config = Column(JSON)
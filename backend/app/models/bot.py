@@ -21,7 +21,7 @@ class Bot(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship with user
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     user = relationship("User", back_populates="bots")
     
     # Relationship with indicators
@@ -34,7 +34,7 @@ class BotIndicator(Base):
     __tablename__ = "bot_indicators"
 
     id = Column(Integer, primary_key=True, index=True)
-    bot_id = Column(Integer, ForeignKey("bots.id"))
+    bot_id = Column(Integer, ForeignKey("bots.id"), index=True)
     indicator_id = Column(Integer, ForeignKey("indicators.id"))
     parameters = Column(JSON)  # Custom parameters for this indicator instance
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Float, JSON
+from sqlalchemy import Boolean, Column, Integer, String, Date, DateTime, ForeignKey, Float, JSON, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -6,6 +6,18 @@ from app.core.database import Base
 
 class Trade(Base):
     __tablename__ = "trades"
+    __table_args__ = (
+        # Open trade lookup on every bot tick
+        Index("ix_trades_bot_id_status", "bot_id", "status"),
+        Index(
+            "ix_trades_open_bot_id",
+            "bot_id",
+            postgresql_where=text("status = 'open'"),
+            sqlite_where=text("status = 'open'")
+        ),
+        # Trades of a bot in exit order
+        Index("ix_trades_bot_id_exit_time", "bot_id", "exit_time", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     bot_id = Column(Integer, ForeignKey("bots.id"), nullable=False)
@@ -25,4 +37,26 @@ class Trade(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship with bot (not bi-directional to avoid circular imports)
-    bot = relationship("Bot") 
\ No newline at end of file
+    bot = relationship("Bot")
+
+class BotPerformanceDaily(Base):
+    """
+    Closed trades of a bot aggregated per day, updated as trades close.
+    
+    Performance endpoints read these rows instead of scanning the trades,
+    so their cost grows with the number of days rather than of trades.
+    """
+    __tablename__ = "bot_performance_daily"
+
+    bot_id = Column(Integer, ForeignKey("bots.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # Day of the trades' exit
+    total_trades = Column(Integer, nullable=False, default=0)
+    winning_trades = Column(Integer, nullable=False, default=0)
+    losing_trades = Column(Integer, nullable=False, default=0)
+    gross_profit = Column(Float, nullable=False, default=0)
+    gross_loss = Column(Float, nullable=False, default=0)  # Positive sum of the losses
+    profit_loss = Column(Float, nullable=False, default=0)
+    profit_loss_count = Column(Integer, nullable=False, default=0)  # Trades with a P/L
+    profit_loss_squares = Column(Float, nullable=False, default=0)  # For the standard deviation
+    log_return = Column(Float, nullable=False, default=0)  # Sum of ln(1 + P/L / 100)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
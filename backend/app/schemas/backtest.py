@@ -7,7 +7,6 @@ class BacktestBase(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     status: Optional[str] = None
-    results: Optional[Dict[str, Any]] = None
     win_rate: Optional[float] = None
     profit_factor: Optional[float] = None
     total_trades: Optional[int] = None
@@ -23,7 +22,7 @@ class BacktestCreate(BaseModel):
 
 # Properties to receive on backtest update
 class BacktestUpdate(BacktestBase):
-    pass
+    results: Optional[Dict[str, Any]] = None
 
 # Properties shared by models stored in DB
 class BacktestInDBBase(BacktestBase):
@@ -43,4 +42,59 @@ class BacktestInDBBase(BacktestBase):
 
 # Properties to return to client
 class Backtest(BacktestInDBBase):
-    pass 
\ No newline at end of file
+    results: Optional[Dict[str, Any]] = None
+
+# Properties to return in lists, without the results document
+class BacktestSummary(BacktestInDBBase):
+    pass
+
+# One closed trade of a backtest ledger, with the equity after it
+class BacktestTrade(BaseModel):
+    id: Optional[int] = None
+    entry_time: datetime
+    exit_time: datetime
+    entry_price: float
+    exit_price: float
+    profit_loss: float
+    profit_loss_amount: float
+    equity: float
+    
+    class Config:
+        orm_mode = True
+
+# Properties to receive on parameter sweep creation
+class BacktestSweepCreate(BaseModel):
+    bot_id: int
+    start_date: datetime
+    end_date: datetime
+    # Values to try per indicator parameter, e.g. {"RSI": {"period": {"start": 7, "stop": 28, "step": 1}}}
+    # or {"MACD": {"fast_period": [8, 12], "slow_period": [21, 26]}}
+    parameter_grid: Dict[str, Dict[str, Any]]
+    rank_by: str = "sharpe_ratio"
+
+# Properties to return in lists, without the ranked results
+class BacktestSweepSummary(BaseModel):
+    id: int
+    bot_id: int
+    user_id: int
+    start_date: datetime
+    end_date: datetime
+    status: str
+    pair: str
+    timeframe: str
+    buy_condition: Optional[str] = None
+    sell_condition: Optional[str] = None
+    indicators_config: Optional[Dict[str, Any]] = None
+    parameter_grid: Dict[str, Dict[str, Any]]
+    rank_by: str
+    total_combinations: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        orm_mode = True
+
+# Properties to return to client
+class BacktestSweep(BacktestSweepSummary):
+    results: Optional[List[Dict[str, Any]]] = None
@@ -1,8 +1,18 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 from app.schemas.indicator import BotIndicator, BotIndicatorCreate, BotIndicatorWithDetails
+from app.bots.conditions import ConditionError, compile_condition
+
+def _check_condition(v: Optional[str]) -> Optional[str]:
+    if v is None or not v.strip():
+        return v
+    try:
+        compile_condition(v)
+    except ConditionError as e:
+        raise ValueError(str(e))
+    return v
 
 # Shared properties
 class BotBase(BaseModel):
@@ -21,10 +31,18 @@ class BotCreate(BotBase):
     pair: str
     timeframe: str
     indicators: Optional[List[BotIndicatorCreate]] = []
+    
+    @validator('buy_condition', 'sell_condition')
+    def condition_is_valid(cls, v):
+        return _check_condition(v)
 
 # Properties to receive on bot update
 class BotUpdate(BotBase):
     indicators: Optional[List[BotIndicatorCreate]] = None
+    
+    @validator('buy_condition', 'sell_condition')
+    def condition_is_valid(cls, v):
+        return _check_condition(v)
 
 # Status update
 class BotStatusUpdate(BaseModel):
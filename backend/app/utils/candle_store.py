@@ -0,0 +1,382 @@
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows development setups
+    fcntl = None
+
+from app.core.config import settings
+from app.utils.timeframes import timeframe_to_timedelta
+
+TIME_COLUMN = "time"
+PRICE_COLUMNS = ("open", "high", "low", "close")
+COVERAGE_FILE = "coverage.json"
+SEGMENTS_DIR = "segments"
+
+class CandleStore:
+    """
+    Persistent local store of OHLCV candles keyed by (symbol, timeframe).
+
+    Each column is kept in its own NumPy file and read through a memory map,
+    so slicing a period only touches the pages it needs. Fetched candles are
+    appended as small segment files, merged into the column files once
+    max_segments of them have accumulated, so a write does not rewrite the
+    whole history.
+
+    A coverage file records which time ranges have already been fetched,
+    gaps in the candles themselves (weekends, market closures) are not
+    mistaken for missing data. A fetch returning no candles at all is only
+    trusted for empty_range_ttl seconds, the data may not be published yet.
+    """
+
+    def __init__(self, root: str, max_segments: int = 16, empty_range_ttl: float = 3600.0):
+        self.root = root
+        self.max_segments = max_segments
+        self.empty_range_ttl = empty_range_ttl
+        self._thread_lock = threading.Lock()
+
+    def missing_ranges(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: datetime
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Get the parts of a period that are not stored yet.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe of the candles
+            start: Start of the period
+            end: End of the period
+
+        Returns:
+            List of (start, end) ranges to fetch from the market data API
+        """
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+
+        with self._lock(symbol, timeframe, exclusive=False):
+            ranges, empty_ranges = self._read_coverage(self._path(symbol, timeframe))
+
+        now = time.time()
+        coverage = _merge_ranges(ranges + [[s, e] for s, e, expires_at in empty_ranges if expires_at > now])
+
+        missing = []
+        cursor = start_ns
+        for covered_start, covered_end in coverage:
+            if covered_end < cursor:
+                continue
+            if covered_start > end_ns:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+
+        if cursor < end_ns:
+            missing.append((cursor, end_ns))
+
+        return [(_to_timestamp(s), _to_timestamp(e)) for s, e in missing]
+
+    def read(self, symbol: str, timeframe: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Read the stored candles of a period.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe of the candles
+            start: Start of the period (inclusive)
+            end: End of the period (inclusive)
+
+        Returns:
+            DataFrame with OHLCV data indexed by UTC time
+        """
+        path = self._path(symbol, timeframe)
+
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+
+        with self._lock(symbol, timeframe, exclusive=False):
+            parts = [self._open_columns(path)] + self._load_segments(path)
+
+        # Later parts hold the most recently fetched values
+        frames = [frame for frame in (_slice_columns(columns, start_ns, end_ns) for columns in parts) if frame is not None]
+        if not frames:
+            return pd.DataFrame()
+
+        df = frames[0] if len(frames) == 1 else pd.concat(frames)
+        if len(frames) > 1:
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+
+        names = sorted(df.columns, key=lambda name: (PRICE_COLUMNS.index(name) if name in PRICE_COLUMNS else len(PRICE_COLUMNS), name))
+        df = df[names]
+        df.index = pd.DatetimeIndex(df.index.to_numpy().astype("datetime64[ns]"), name=TIME_COLUMN).tz_localize("UTC")
+        return df
+
+    def write(
+        self,
+        symbol: str,
+        timeframe: str,
+        candles: pd.DataFrame,
+        start: datetime,
+        end: datetime
+    ) -> None:
+        """
+        Add fetched candles to the store and mark their period as covered.
+
+        Candles newer than the last closed candle are stored but their
+        period is not marked as covered, so a still-forming candle is
+        fetched again on the next request. A period without any candle is
+        covered for empty_range_ttl seconds only.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe of the candles
+            candles: DataFrame with OHLCV data indexed by time
+            start: Start of the fetched period
+            end: End of the fetched period
+        """
+        path = self._path(symbol, timeframe)
+        os.makedirs(path, exist_ok=True)
+
+        covered_end = min(_to_ns(end), _to_ns(_last_closed_time(timeframe)))
+
+        fetched = _candle_columns(candles)
+
+        with self._lock(symbol, timeframe, exclusive=True):
+            if fetched:
+                if os.path.exists(os.path.join(path, f"{TIME_COLUMN}.npy")):
+                    self._append_segment(path, fetched)
+                else:
+                    self._save_columns(path, fetched)
+
+            now = time.time()
+            ranges, empty_ranges = self._read_coverage(path)
+            empty_ranges = [entry for entry in empty_ranges if entry[2] > now]
+            if covered_end > _to_ns(start):
+                if fetched:
+                    ranges = _merge_ranges(ranges + [[_to_ns(start), covered_end]])
+                else:
+                    empty_ranges.append([_to_ns(start), covered_end, now + self.empty_range_ttl])
+            _atomic_write_json(os.path.join(path, COVERAGE_FILE), {"ranges": ranges, "empty": empty_ranges})
+
+    def compact(self, symbol: str, timeframe: str) -> None:
+        """
+        Merge the segment files of a symbol and timeframe into its column
+        files, done by write once max_segments segments have accumulated.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe of the candles
+        """
+        path = self._path(symbol, timeframe)
+        if not os.path.isdir(path):
+            return
+
+        with self._lock(symbol, timeframe, exclusive=True):
+            self._compact(path)
+
+    def _path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, _safe_name(symbol), _safe_name(timeframe))
+
+    def _open_columns(self, path: str) -> Dict[str, np.ndarray]:
+        time_file = os.path.join(path, f"{TIME_COLUMN}.npy")
+        if not os.path.exists(time_file):
+            return {}
+
+        columns = {}
+        for filename in os.listdir(path):
+            if filename.endswith(".npy"):
+                columns[filename[:-4]] = np.load(os.path.join(path, filename), mmap_mode="r")
+        return columns
+
+    def _load_segments(self, path: str) -> List[Dict[str, np.ndarray]]:
+        segments = []
+        for filename in self._segment_files(path):
+            with np.load(os.path.join(path, SEGMENTS_DIR, filename)) as segment:
+                segments.append({name: segment[name] for name in segment.files})
+        return segments
+
+    def _segment_files(self, path: str) -> List[str]:
+        try:
+            return sorted(name for name in os.listdir(os.path.join(path, SEGMENTS_DIR)) if name.endswith(".npz"))
+        except FileNotFoundError:
+            return []
+
+    def _append_segment(self, path: str, columns: Dict[str, np.ndarray]) -> None:
+        segments_path = os.path.join(path, SEGMENTS_DIR)
+        os.makedirs(segments_path, exist_ok=True)
+
+        existing = self._segment_files(path)
+        sequence = int(existing[-1][:-4]) + 1 if existing else 0
+        _atomic_savez(os.path.join(segments_path, f"{sequence:08d}.npz"), columns)
+
+        if len(existing) + 1 >= self.max_segments:
+            self._compact(path)
+
+    def _compact(self, path: str) -> None:
+        segment_files = self._segment_files(path)
+        if not segment_files:
+            return
+
+        merged = _merge_columns([self._open_columns(path)] + self._load_segments(path))
+        self._save_columns(path, merged)
+
+        for filename in segment_files:
+            os.remove(os.path.join(path, SEGMENTS_DIR, filename))
+
+    def _save_columns(self, path: str, columns: Dict[str, np.ndarray]) -> None:
+        # The time column goes last, it marks the column files as complete
+        for name, values in sorted(columns.items(), key=lambda item: item[0] == TIME_COLUMN):
+            _atomic_save(os.path.join(path, f"{name}.npy"), values)
+
+    def _read_coverage(self, path: str) -> Tuple[List[List[int]], List[List[float]]]:
+        """Read the covered ranges and the empty ranges with their expiry time"""
+        try:
+            with open(os.path.join(path, COVERAGE_FILE)) as f:
+                coverage = json.load(f)
+        except FileNotFoundError:
+            return [], []
+
+        # Stores written before empty ranges expired hold a plain list
+        if isinstance(coverage, list):
+            return coverage, []
+        return coverage.get("ranges", []), coverage.get("empty", [])
+
+    @contextmanager
+    def _lock(self, symbol: str, timeframe: str, exclusive: bool) -> Iterator[None]:
+        # Backtest workers run in separate processes, so a file lock is needed
+        path = self._path(symbol, timeframe)
+        if fcntl is None or not os.path.isdir(path):
+            with self._thread_lock:
+                yield
+            return
+
+        with open(os.path.join(path, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+_store: Optional[CandleStore] = None
+
+def get_candle_store() -> CandleStore:
+    """Get the process-wide candle store"""
+    global _store
+    if _store is None:
+        _store = CandleStore(
+            settings.MARKET_DATA_CACHE_DIR,
+            max_segments=settings.MARKET_DATA_CACHE_MAX_SEGMENTS,
+            empty_range_ttl=settings.MARKET_DATA_CACHE_EMPTY_RANGE_TTL
+        )
+    return _store
+
+def _candle_columns(candles: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Convert fetched candles to the stored columns, sorted by time"""
+    if candles.empty:
+        return {}
+
+    fetched = candles.select_dtypes(include="number").astype("float64")
+    fetched.index = _index_to_ns(candles.index)
+    fetched = fetched[~fetched.index.duplicated(keep="last")].sort_index()
+
+    columns = {TIME_COLUMN: fetched.index.to_numpy(dtype="int64")}
+    for name in fetched.columns:
+        columns[str(name)] = fetched[name].to_numpy(dtype="float64")
+    return columns
+
+def _slice_columns(columns: Dict[str, np.ndarray], start_ns: int, end_ns: int) -> Optional[pd.DataFrame]:
+    """Get the rows of stored columns between two times (inclusive)"""
+    if not columns:
+        return None
+
+    times = columns[TIME_COLUMN]
+    first = np.searchsorted(times, start_ns, side="left")
+    last = np.searchsorted(times, end_ns, side="right")
+
+    if first >= last:
+        return None
+
+    return pd.DataFrame(
+        {name: np.array(values[first:last]) for name, values in columns.items() if name != TIME_COLUMN},
+        index=np.array(times[first:last])
+    )
+
+def _merge_columns(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Combine stored columns, later parts win on the same time"""
+    frames = [
+        pd.DataFrame(
+            {name: np.array(values) for name, values in columns.items() if name != TIME_COLUMN},
+            index=np.array(columns[TIME_COLUMN])
+        )
+        for columns in parts if columns
+    ]
+    if not frames:
+        return {}
+
+    merged = pd.concat(frames)
+    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+    columns = {TIME_COLUMN: merged.index.to_numpy(dtype="int64")}
+    for name in merged.columns:
+        columns[str(name)] = merged[name].to_numpy(dtype="float64")
+    return columns
+
+def _merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def _last_closed_time(timeframe: str) -> pd.Timestamp:
+    duration = timeframe_to_timedelta(timeframe) or pd.Timedelta(days=1)
+    return pd.Timestamp.now(tz="UTC") - duration
+
+def _atomic_save(path: str, values: np.ndarray) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, values)
+    os.replace(tmp_path, path)
+
+def _atomic_savez(path: str, columns: Dict[str, np.ndarray]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **columns)
+    os.replace(tmp_path, path)
+
+def _atomic_write_json(path: str, data: object) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", value)
+
+def _to_timestamp(value_ns: int) -> pd.Timestamp:
+    return pd.Timestamp(value_ns, tz="UTC")
+
+def _to_ns(value: datetime) -> int:
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.value
+
+def _index_to_ns(index: pd.Index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return index.tz_convert("UTC").asi8
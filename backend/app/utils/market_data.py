@@ -1,25 +1,187 @@
 import httpx
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Coroutine, Optional, Tuple, TypeVar
 from datetime import datetime
 import pandas as pd
 import asyncio
+import threading
+import time
+from jose import jwt, JOSEError
 
 from app.core.config import settings
+from app.utils.candle_store import get_candle_store
+
+# Refresh the token slightly before it expires
+TOKEN_EXPIRY_MARGIN = 30
+
+T = TypeVar("T")
+
+class MarketDataClient:
+    """
+    Client for the market data API.
+    
+    Keeps one pooled, keep-alive HTTP client and caches the access token
+    until it expires (or the API answers 401), so a request costs a single
+    round trip on an already open connection.
+    """
+    
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        token_ttl: int,
+        timeout: float,
+        max_connections: int,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.token_ttl = token_ttl
+        self.timeout = timeout
+        self.max_connections = max_connections
+        
+        # httpx connections belong to the loop that opened them, so there is
+        # one client per event loop (e.g. the bot runtime and a sweep thread)
+        self._clients: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Lock]] = {}
+        self._clients_lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+    
+    def _client(self) -> Tuple[httpx.AsyncClient, asyncio.Lock]:
+        """Get the HTTP client of the running event loop and its token lock"""
+        loop = asyncio.get_running_loop()
+        
+        with self._clients_lock:
+            if loop not in self._clients:
+                client = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                )
+                self._clients[loop] = (client, asyncio.Lock())
+            
+            return self._clients[loop]
+    
+    async def get_token(self) -> str:
+        """Get an access token, reusing the cached one while it is valid"""
+        client, token_lock = self._client()
+        
+        if self._token and time.time() < self._token_expires_at:
+            return self._token
+        
+        async with token_lock:
+            # Another request may have refreshed it while we were waiting
+            if self._token and time.time() < self._token_expires_at:
+                return self._token
+            
+            response = await client.post(
+                "/api/v1/token",
+                data={
+                    "username": self.username,
+                    "password": self.password,
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            self._token = data["access_token"]
+            self._token_expires_at = time.time() + self._token_lifetime(data) - TOKEN_EXPIRY_MARGIN
+            return self._token
+    
+    async def get(self, path: str, params: Dict[str, Any]) -> Any:
+        """
+        Send an authenticated GET request.
+        
+        Args:
+            path: API path (e.g., "/api/v1/data")
+            params: Query parameters
+            
+        Returns:
+            The decoded JSON response
+        """
+        client, _ = self._client()
+        
+        for attempt in range(2):
+            token = await self.get_token()
+            response = await client.get(
+                path,
+                params=params,
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            
+            # The token was revoked or expired early, fetch a new one once
+            if response.status_code == 401 and attempt == 0:
+                self.invalidate_token(token)
+                continue
+            
+            response.raise_for_status()
+            return response.json()
+    
+    def invalidate_token(self, token: Optional[str] = None) -> None:
+        """Drop the cached token so the next request logs in again"""
+        if token is None or token == self._token:
+            self._token = None
+            self._token_expires_at = 0.0
+    
+    async def aclose(self) -> None:
+        """Close the pooled connections of the running event loop"""
+        with self._clients_lock:
+            entry = self._clients.pop(asyncio.get_running_loop(), None)
+        
+        if entry is not None:
+            await entry[0].aclose()
+    
+    def _token_lifetime(self, data: Dict[str, Any]) -> float:
+        if data.get("expires_in"):
+            return float(data["expires_in"])
+        
+        # Fall back to the JWT expiry claim, then to the configured TTL
+        try:
+            exp = jwt.get_unverified_claims(data["access_token"]).get("exp")
+            if exp:
+                return float(exp) - time.time()
+        except JOSEError:
+            pass
+        
+        return float(self.token_ttl)
+
+market_data_client = MarketDataClient(
+    base_url=settings.MARKET_DATA_API,
+    username=settings.MARKET_DATA_API_USERNAME,
+    password=settings.MARKET_DATA_API_PASSWORD,
+    token_ttl=settings.MARKET_DATA_TOKEN_TTL,
+    timeout=settings.MARKET_DATA_TIMEOUT,
+    max_connections=settings.MARKET_DATA_MAX_CONNECTIONS,
+)
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine in a new event loop, like asyncio.run, closing the
+    market data connections opened in that loop before it ends.
+    
+    Used by the backtest workers, which have no running loop: the
+    connections are reused within one run and not left open afterwards.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine result
+    """
+    async def run_and_close() -> T:
+        try:
+            return await coro
+        finally:
+            await market_data_client.aclose()
+    
+    return asyncio.run(run_and_close())
 
 async def get_token() -> str:
     """Get authentication token from the market data API"""
-    async with httpx.AsyncClient() as client:
-        form_data = {
-            "username": settings.MARKET_DATA_API_USERNAME,
-            "password": settings.MARKET_DATA_API_PASSWORD,
-        }
-        response = await client.post(
-            f"{settings.MARKET_DATA_API}/api/v1/token",
-            data=form_data,
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["access_token"]
+    return await market_data_client.get_token()
 
 async def get_historical_data(
     symbol: str,
@@ -39,8 +201,6 @@ async def get_historical_data(
     Returns:
         List of dictionaries with OHLCV data
     """
-    token = await get_token()
-    
     params = {
         "symbol": symbol,
         "timeframe": timeframe,
@@ -48,16 +208,7 @@ async def get_historical_data(
         "end": end_date.isoformat()
     }
     
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.MARKET_DATA_API}/api/v1/data",
-            params=params,
-            headers=headers,
-        )
-        response.raise_for_status()
-        return response.json()
+    return await market_data_client.get("/api/v1/data", params)
 
 async def get_last_price(symbol: str, timeframe: str) -> Dict[str, Any]:
     """
@@ -70,23 +221,55 @@ async def get_last_price(symbol: str, timeframe: str) -> Dict[str, Any]:
     Returns:
         Dictionary with the last price data
     """
-    token = await get_token()
-    
     params = {
         "symbol": symbol,
         "timeframe": timeframe,
     }
     
-    headers = {"Authorization": f"Bearer {token}"}
+    return await market_data_client.get("/api/v1/data/last", params)
+
+async def get_historical_dataframe(
+    symbol: str,
+    timeframe: str,
+    start_date: datetime,
+    end_date: datetime
+) -> pd.DataFrame:
+    """
+    Get historical market data as a DataFrame, served from the local candle store.
+    
+    Only the parts of the period that are not stored yet are fetched from
+    the market data API.
+    
+    Args:
+        symbol: Trading pair symbol (e.g., "BTCUSD")
+        timeframe: Timeframe (e.g., "1h", "4h", "1d")
+        start_date: Start date for historical data
+        end_date: End date for historical data
+        
+    Returns:
+        pandas DataFrame with OHLCV data indexed by UTC time, with or
+        without the candle store
+    """
+    if not settings.MARKET_DATA_CACHE_ENABLED:
+        df = get_dataframe(await get_historical_data(symbol, timeframe, start_date, end_date))
+        return _to_utc_index(df)
+    
+    store = get_candle_store()
+    
+    for missing_start, missing_end in store.missing_ranges(symbol, timeframe, start_date, end_date):
+        data = await get_historical_data(symbol, timeframe, missing_start, missing_end)
+        store.write(symbol, timeframe, get_dataframe(data), missing_start, missing_end)
+    
+    return store.read(symbol, timeframe, start_date, end_date)
+
+def _to_utc_index(df: pd.DataFrame) -> pd.DataFrame:
+    # Same index as the candle store: naive times are UTC
+    if df.empty:
+        return df
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.MARKET_DATA_API}/api/v1/data/last",
-            params=params,
-            headers=headers,
-        )
-        response.raise_for_status()
-        return response.json()
+    index = pd.DatetimeIndex(df.index)
+    df.index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return df
 
 def get_dataframe(data: List[Dict[str, Any]]) -> pd.DataFrame:
     """
@@ -0,0 +1,69 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+# Header carrying the cursor of the next page, absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(time: Optional[datetime], row_id: int) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        time: Time the rows are sorted by, may be None
+        row_id: ID of the row, breaking ties between equal times
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"time": time.isoformat() if time else None, "id": row_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (time, row_id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        time = datetime.fromisoformat(payload["time"]) if payload["time"] is not None else None
+        return time, int(payload["id"])
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def after_descending(time_column: Any, id_column: Any, time: Optional[datetime], row_id: int) -> Any:
+    """
+    Build the filter selecting the rows after a cursor, for rows ordered by
+    time descending with NULL times first, then by ID descending.
+
+    Args:
+        time_column: Column the rows are sorted by
+        id_column: ID column breaking ties
+        time: Time of the cursor
+        row_id: ID of the cursor
+
+    Returns:
+        SQL filter expression
+    """
+    if time is None:
+        return or_(
+            and_(time_column.is_(None), id_column < row_id),
+            time_column.isnot(None)
+        )
+
+    return or_(
+        time_column < time,
+        and_(time_column == time, id_column < row_id)
+    )
@@ -0,0 +1,353 @@
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Starting equity of the performance summary's equity curve
+INITIAL_EQUITY = 1000
+
+# Bounds keeping exp()/ln() of the compounded equity inside double precision
+MIN_EQUITY_FACTOR = 1e-12
+MAX_LOG_EQUITY = 700
+
+def add_closed_trade(db: Session, trade: models.Trade) -> None:
+    """
+    Add a closed trade to the daily performance of its bot.
+
+    The rollup row is locked and updated in the caller's transaction, so it
+    is committed together with the trade.
+
+    Args:
+        db: Database session
+        trade: Trade that was just closed
+    """
+    day = (trade.exit_time or trade.entry_time).date()
+
+    rollup = db.query(models.BotPerformanceDaily).filter(
+        models.BotPerformanceDaily.bot_id == trade.bot_id,
+        models.BotPerformanceDaily.day == day
+    ).with_for_update().first()
+
+    if rollup is None:
+        rollup = models.BotPerformanceDaily(
+            bot_id=trade.bot_id,
+            day=day,
+            total_trades=0,
+            winning_trades=0,
+            losing_trades=0,
+            gross_profit=0,
+            gross_loss=0,
+            profit_loss=0,
+            profit_loss_count=0,
+            profit_loss_squares=0,
+            log_return=0
+        )
+
+    profit_loss = trade.profit_loss
+
+    rollup.total_trades += 1
+    if profit_loss is not None:
+        rollup.winning_trades += int(profit_loss > 0)
+        rollup.losing_trades += int(profit_loss < 0)
+        rollup.gross_profit += max(profit_loss, 0)
+        rollup.gross_loss += max(-profit_loss, 0)
+        rollup.profit_loss += profit_loss
+        rollup.profit_loss_count += 1
+        rollup.profit_loss_squares += profit_loss * profit_loss
+        rollup.log_return += math.log(max(1 + profit_loss / 100.0, MIN_EQUITY_FACTOR))
+
+    db.add(rollup)
+
+def rebuild_rollups(db: Session) -> int:
+    """
+    Recompute the daily performance of every bot from the closed trades.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of rollup rows written
+    """
+    trade = models.Trade
+    profit_loss = trade.profit_loss
+    day = func.date(func.coalesce(trade.exit_time, trade.entry_time))
+
+    rows = select(
+        trade.bot_id,
+        day,
+        func.count(trade.id),
+        func.coalesce(func.sum(case((profit_loss > 0, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((profit_loss < 0, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((profit_loss > 0, profit_loss), else_=0)), 0),
+        func.coalesce(func.sum(case((profit_loss < 0, -profit_loss), else_=0)), 0),
+        func.coalesce(func.sum(profit_loss), 0),
+        func.count(profit_loss),
+        func.coalesce(func.sum(profit_loss * profit_loss), 0),
+        # greatest() ignores NULLs, trades without P/L are left out explicitly
+        func.coalesce(func.sum(case(
+            (profit_loss.isnot(None), func.ln(func.greatest(1 + profit_loss / 100.0, MIN_EQUITY_FACTOR))),
+            else_=0
+        )), 0),
+    ).where(
+        trade.status == "closed"
+    ).group_by(trade.bot_id, day)
+
+    rollup = models.BotPerformanceDaily.__table__
+
+    db.execute(rollup.delete())
+    result = db.execute(rollup.insert().from_select([
+        "bot_id",
+        "day",
+        "total_trades",
+        "winning_trades",
+        "losing_trades",
+        "gross_profit",
+        "gross_loss",
+        "profit_loss",
+        "profit_loss_count",
+        "profit_loss_squares",
+        "log_return",
+    ], rows))
+    db.commit()
+
+    logger.info(f"Rebuilt {result.rowcount} daily performance rows")
+    return result.rowcount
+
+def rollup_filters(
+    user_id: Optional[int] = None,
+    bot_id: Optional[int] = None,
+    since: Optional[datetime] = None
+) -> List[Any]:
+    """
+    Build the filters selecting the daily performance of a user or a bot.
+
+    Args:
+        user_id: Only the days of this user's bots
+        bot_id: Only the days of this bot
+        since: Only the days from this one on
+
+    Returns:
+        List of SQL filter expressions on models.BotPerformanceDaily
+    """
+    filters = []
+
+    if user_id is not None:
+        filters.append(models.BotPerformanceDaily.bot_id.in_(
+            select(models.Bot.id).where(models.Bot.user_id == user_id)
+        ))
+    if bot_id is not None:
+        filters.append(models.BotPerformanceDaily.bot_id == bot_id)
+    if since is not None:
+        filters.append(models.BotPerformanceDaily.day >= since.date())
+
+    return filters
+
+def trade_statistics(db: Session, filters: List[Any]) -> Dict[str, Any]:
+    """
+    Sum the trade counts and profit figures of the daily performance rows.
+
+    A trade wins with a positive P/L and loses with a negative one, trades
+    without P/L only count towards the total.
+
+    Args:
+        db: Database session
+        filters: Filters from rollup_filters
+
+    Returns:
+        Dictionary with the counts, sums, mean and population standard
+        deviation of the trades' P/L
+    """
+    rollup = models.BotPerformanceDaily
+
+    row = db.query(
+        func.coalesce(func.sum(rollup.total_trades), 0).label("total_trades"),
+        func.coalesce(func.sum(rollup.winning_trades), 0).label("winning_trades"),
+        func.coalesce(func.sum(rollup.losing_trades), 0).label("losing_trades"),
+        func.coalesce(func.sum(rollup.gross_profit), 0).label("gross_profit"),
+        func.coalesce(func.sum(rollup.gross_loss), 0).label("gross_loss"),
+        func.coalesce(func.sum(rollup.profit_loss), 0).label("total_profit_loss"),
+        func.coalesce(func.sum(rollup.profit_loss_count), 0).label("profit_loss_count"),
+        func.coalesce(func.sum(rollup.profit_loss_squares), 0).label("profit_loss_squares"),
+    ).filter(*filters).one()
+
+    total_profit_loss = float(row.total_profit_loss)
+    count = int(row.profit_loss_count)
+
+    mean = std = None
+    if count > 0:
+        mean = total_profit_loss / count
+        std = math.sqrt(max(float(row.profit_loss_squares) / count - mean * mean, 0))
+
+    return {
+        "total_trades": int(row.total_trades),
+        "winning_trades": int(row.winning_trades),
+        "losing_trades": int(row.losing_trades),
+        "gross_profit": float(row.gross_profit),
+        "gross_loss": float(row.gross_loss),
+        "total_profit_loss": total_profit_loss,
+        "mean_profit_loss": mean,
+        "std_profit_loss": std,
+    }
+
+def cumulative_profit_series(
+    db: Session,
+    filters: List[Any],
+    max_points: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get the running total of P/L at the end of each day.
+
+    Args:
+        db: Database session
+        filters: Filters from rollup_filters
+        max_points: Maximum number of points returned, the series is
+            downsampled evenly and always ends with the last day
+
+    Returns:
+        List of {"time", "value"} points ordered by day
+    """
+    rollup = models.BotPerformanceDaily
+
+    series = db.query(
+        rollup.day.label("time"),
+        func.sum(func.sum(rollup.profit_loss)).over(order_by=rollup.day).label("value"),
+        func.row_number().over(order_by=rollup.day).label("row_number"),
+        func.count().over().label("row_count"),
+    ).filter(*filters).group_by(
+        rollup.day
+    ).having(func.sum(rollup.profit_loss_count) > 0).subquery()
+
+    rows = db.query(series.c.time, series.c.value).filter(
+        _sample(series, max_points or settings.PERFORMANCE_MAX_POINTS)
+    ).order_by(series.c.row_number).all()
+
+    return [
+        {"time": time.isoformat(), "value": float(value)}
+        for time, value in rows
+    ]
+
+def equity_curve(
+    db: Session,
+    filters: List[Any],
+    max_points: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compound the trades' P/L into a daily equity curve and its drawdown.
+
+    The equity is INITIAL_EQUITY times the running product of
+    (1 + P/L / 100), computed as a windowed sum of logarithms. A trade
+    losing 100 or more brings the equity down to (almost) zero. The
+    drawdown is measured on the equity at the end of each day.
+
+    Args:
+        db: Database session
+        filters: Filters from rollup_filters
+        max_points: Maximum number of points returned
+
+    Returns:
+        Dictionary with the max_drawdown over every day and the
+        downsampled time_series of {"time", "equity", "drawdown"} points
+    """
+    rollup = models.BotPerformanceDaily
+
+    compounded = db.query(
+        rollup.day.label("time"),
+        func.sum(func.sum(rollup.log_return)).over(order_by=rollup.day).label("log_equity"),
+        func.row_number().over(order_by=rollup.day).label("row_number"),
+        func.count().over().label("row_count"),
+    ).filter(*filters).group_by(
+        rollup.day
+    ).having(func.sum(rollup.profit_loss_count) > 0).subquery()
+
+    peaks = db.query(
+        compounded,
+        func.max(compounded.c.log_equity).over(order_by=compounded.c.row_number).label("log_peak"),
+    ).subquery()
+
+    # The curve starts at INITIAL_EQUITY, which is the first peak
+    drawdown = (1 - func.exp(peaks.c.log_equity - func.greatest(peaks.c.log_peak, 0))) * 100
+    equity = INITIAL_EQUITY * func.exp(func.least(peaks.c.log_equity, MAX_LOG_EQUITY))
+
+    max_drawdown = db.query(func.max(drawdown)).scalar()
+
+    rows = db.query(peaks.c.time, equity, drawdown).filter(
+        _sample(peaks, max_points or settings.PERFORMANCE_MAX_POINTS)
+    ).order_by(peaks.c.row_number).all()
+
+    return {
+        "max_drawdown": max(_to_float(max_drawdown) or 0, 0),
+        "time_series": [
+            {
+                "time": time.isoformat(),
+                "equity": float(point_equity),
+                "drawdown": max(float(point_drawdown), 0),
+            }
+            for time, point_equity, point_drawdown in rows
+        ],
+    }
+
+def bot_comparison(db: Session, user_id: int) -> List[Dict[str, Any]]:
+    """
+    Get the trade count, win rate and P/L of every bot of a user.
+
+    Args:
+        db: Database session
+        user_id: Owner of the bots
+
+    Returns:
+        One entry per bot, best P/L first
+    """
+    rollup = models.BotPerformanceDaily
+    profit_loss = func.coalesce(func.sum(rollup.profit_loss), 0)
+
+    rows = db.query(
+        models.Bot.id,
+        models.Bot.name,
+        models.Bot.pair,
+        models.Bot.timeframe,
+        models.Bot.is_active,
+        models.Bot.is_running,
+        func.coalesce(func.sum(rollup.total_trades), 0).label("total_trades"),
+        func.coalesce(func.sum(rollup.winning_trades), 0).label("winning_trades"),
+        profit_loss.label("profit_loss"),
+    ).outerjoin(
+        rollup, rollup.bot_id == models.Bot.id
+    ).filter(
+        models.Bot.user_id == user_id
+    ).group_by(
+        models.Bot.id
+    ).order_by(
+        profit_loss.desc(),
+        models.Bot.id
+    ).all()
+
+    return [
+        {
+            "bot_id": row.id,
+            "bot_name": row.name,
+            "pair": row.pair,
+            "timeframe": row.timeframe,
+            "total_trades": row.total_trades,
+            "win_rate": (row.winning_trades / row.total_trades) * 100 if row.total_trades > 0 else 0,
+            "profit_loss": float(row.profit_loss),
+            "is_active": row.is_active,
+            "is_running": row.is_running,
+        }
+        for row in rows
+    ]
+
+def _sample(series: Any, max_points: int) -> Any:
+    """Keep every n-th row of a numbered series so at most max_points remain, plus the last row"""
+    step = func.greatest((series.c.row_count + (max_points - 1)) // max_points, 1)
+    return or_((series.c.row_number - 1) % step == 0, series.c.row_number == series.c.row_count)
+
+def _to_float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
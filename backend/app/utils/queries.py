@@ -0,0 +1,57 @@
+import logging
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+class QueryCounter:
+    """
+    Count the SQL statements executed on an engine.
+
+    Used to check that a code path runs a constant number of queries, so
+    loading a list of rows does not issue one extra query per row.
+
+    Example:
+        with QueryCounter() as counter:
+            client.get("/api/v1/performance/bots/comparison")
+        counter.assert_at_most(3)
+
+    Args:
+        engine: Engine to listen on, defaults to the application engine
+    """
+
+    def __init__(self, engine: Optional[Engine] = None):
+        self.engine = engine or default_engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        """Number of statements executed so far"""
+        return len(self.statements)
+
+    def assert_at_most(self, limit: int) -> None:
+        """
+        Check that no more than `limit` statements were executed.
+
+        Raises:
+            AssertionError: Listing the executed statements otherwise
+        """
+        if self.count > limit:
+            statements = "\n".join(self.statements)
+            raise AssertionError(f"Expected at most {limit} queries, {self.count} executed:\n{statements}")
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+        logger.debug(f"{self.count} queries executed")
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
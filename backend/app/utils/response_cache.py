@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.responses import type_adapter
+
+class ResponseCache:
+    """
+    In-memory cache of serialized JSON responses for public, read-mostly
+    endpoints whose response is the same for every visitor.
+
+    Entries are grouped in namespaces (e.g. "tutorials") so the endpoints
+    writing the underlying rows can drop every cached page of a namespace
+    at once. Cached responses carry an ETag and a request sending it back
+    in If-None-Match gets a 304 without a body.
+
+    The cache lives in each worker process: an invalidation only reaches
+    the worker handling the write, the others serve their copy until the
+    TTL expires.
+    """
+
+    def __init__(self, max_entries: int, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def respond(
+        self,
+        request: Request,
+        namespace: str,
+        ttl: float,
+        response_model: Any,
+        load: Callable[[], Any],
+    ) -> Response:
+        """
+        Build the response of a cached endpoint.
+
+        Args:
+            request: Incoming request, its path and query string are the key
+            namespace: Namespace of the entry, see invalidate
+            ttl: Seconds the response is cached
+            response_model: Type the loaded data is serialized as
+            load: Function loading the data on a cache miss, exceptions it
+                raises (e.g. a 404 HTTPException) are not cached
+
+        Returns:
+            JSON response, or an empty 304 if the client copy is current
+        """
+        key = (namespace, request.url.path + "?" + str(request.query_params))
+        cached = self._get(key) if self.enabled else None
+
+        if cached is None:
+            generation = self._generation(namespace)
+            adapter = type_adapter(response_model)
+            body = adapter.dump_json(adapter.validate_python(load(), from_attributes=True))
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.enabled:
+                self._set(key, generation, ttl, etag, body)
+        else:
+            etag, body = cached
+
+        # Clients keep their copy but revalidate it on every use, so a write
+        # invalidating the namespace is seen at once through the ETag
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def invalidate(self, namespace: str) -> None:
+        """
+        Drop the cached responses of a namespace, called after its rows were
+        created, updated or deleted.
+
+        Args:
+            namespace: Namespace to clear
+        """
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key in [key for key in self._entries if key[0] == namespace]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            for namespace in {key[0] for key in self._entries}:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self._entries.clear()
+
+    def _get(self, key: Tuple[str, str]) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, etag, body = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return etag, body
+
+    def _set(self, key: Tuple[str, str], generation: int, ttl: float, etag: str, body: bytes) -> None:
+        with self._lock:
+            # The namespace was invalidated while loading, the data may be stale
+            if self._generations.get(key[0], 0) != generation:
+                return
+
+            self._entries[key] = (time.monotonic() + ttl, etag, body)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    enabled=settings.RESPONSE_CACHE_ENABLED
+)
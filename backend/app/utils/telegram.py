@@ -1,10 +1,192 @@
 import asyncio
-from typing import Optional
+import logging
+import threading
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from telegram import Bot
+from telegram.constants import MessageLimit
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+class TelegramDispatcher:
+    """
+    Background sender for Telegram notifications.
+
+    Messages are queued per chat and sent from a dedicated event loop with a
+    single persistent Bot client, so callers never wait on the Telegram API.
+    Each chat is paced to TELEGRAM_CHAT_MIN_INTERVAL and all chats together
+    to TELEGRAM_MAX_MESSAGES_PER_SECOND. Messages queued for a chat while it
+    waits for its turn are sent together as one message, and flood control
+    errors are retried after the delay Telegram asks for.
+    """
+
+    def __init__(self, token: str):
+        self.token = token
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # Only touched from the dispatcher thread
+        self._bot: Optional[Bot] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[str, List[str]] = {}
+        self._active = set()
+        self._tasks = set()
+        self._next_allowed: Dict[str, float] = {}
+        self._next_global = 0.0
+
+    def enqueue(self, chat_id: str, message: str) -> bool:
+        """
+        Queue a message for a chat.
+
+        Args:
+            chat_id: The chat ID where to send the message
+            message: The message to send, in Markdown
+
+        Returns:
+            bool: True if the message was queued
+        """
+        try:
+            self._ensure_started()
+            self._loop.call_soon_threadsafe(self._enqueue, str(chat_id), message)
+            return True
+        except Exception as e:
+            logger.error(f"Error queueing Telegram message: {e}")
+            return False
+
+    def shutdown(self, timeout: float = 5) -> None:
+        """Send what is still queued, within the timeout, and stop the sender"""
+        with self._start_lock:
+            if self._loop is None:
+                return
+
+            try:
+                asyncio.run_coroutine_threadsafe(self._drain(), self._loop).result(timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Telegram messages left unsent at shutdown: {e}")
+
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=timeout)
+            self._loop = None
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._loop is not None:
+                return
+
+            ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                args=(ready,),
+                name="telegram-dispatcher",
+                daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._bot = Bot(token=self.token)
+        self._semaphore = asyncio.Semaphore(settings.TELEGRAM_MAX_CONCURRENT_SENDS)
+        ready.set()
+
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(self._close_bot())
+            self._loop.close()
+
+    def _enqueue(self, chat_id: str, message: str) -> None:
+        self._pending.setdefault(chat_id, []).append(message)
+
+        # A chat already waiting for its turn picks the message up with the others
+        if chat_id not in self._active:
+            self._active.add(chat_id)
+            self._schedule(chat_id, settings.TELEGRAM_COALESCE_DELAY)
+
+    def _schedule(self, chat_id: str, delay: float) -> None:
+        due = max(self._loop.time() + delay, self._next_allowed.get(chat_id, 0.0))
+        self._loop.call_at(due, self._start_flush, chat_id)
+
+    def _start_flush(self, chat_id: str) -> None:
+        task = self._loop.create_task(self._flush(chat_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, chat_id: str) -> None:
+        messages = self._pending.pop(chat_id, [])
+        try:
+            async with self._semaphore:
+                for text in _coalesce(messages):
+                    await self._send(chat_id, text)
+        except Exception as e:
+            logger.error(f"Error sending Telegram message to {chat_id}: {e}")
+        finally:
+            if chat_id in self._pending:
+                self._schedule(chat_id, 0)
+            else:
+                self._active.discard(chat_id)
+
+    async def _send(self, chat_id: str, text: str) -> None:
+        for attempt in range(settings.TELEGRAM_MAX_RETRIES + 1):
+            await self._wait_turn(chat_id)
+            try:
+                await self._bot.send_message(chat_id=chat_id, text=text, parse_mode="Markdown")
+                return
+            except RetryAfter as e:
+                # Flood control, Telegram tells how long to back off this chat
+                logger.warning(f"Telegram flood control for {chat_id}, retrying in {e.retry_after}s")
+                self._next_allowed[chat_id] = self._loop.time() + float(e.retry_after)
+            except BadRequest as e:
+                logger.error(f"Telegram rejected message to {chat_id}: {e}")
+                return
+            except NetworkError as e:
+                logger.warning(f"Telegram network error for {chat_id}: {e}")
+                self._next_allowed[chat_id] = self._loop.time() + 2 ** attempt
+            except TelegramError as e:
+                logger.error(f"Error sending Telegram message to {chat_id}: {e}")
+                return
+
+        logger.error(f"Giving up on Telegram message to {chat_id} after {settings.TELEGRAM_MAX_RETRIES} retries")
+
+    async def _wait_turn(self, chat_id: str) -> None:
+        now = self._loop.time()
+
+        # Reserve the global slot before sleeping so concurrent sends queue up
+        slot = max(now, self._next_global, self._next_allowed.get(chat_id, 0.0))
+        self._next_global = max(self._next_global, slot) + 1 / settings.TELEGRAM_MAX_MESSAGES_PER_SECOND
+        self._next_allowed[chat_id] = slot + settings.TELEGRAM_CHAT_MIN_INTERVAL
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _drain(self) -> None:
+        while self._active:
+            await asyncio.sleep(0.1)
+
+    async def _close_bot(self) -> None:
+        try:
+            await self._bot.shutdown()
+        except Exception:
+            pass
+
+def _coalesce(messages: List[str]) -> List[str]:
+    """Join messages into as few texts as the Telegram length limit allows"""
+    texts = []
+    for message in messages:
+        if texts and len(texts[-1]) + 2 + len(message) <= MessageLimit.MAX_TEXT_LENGTH:
+            texts[-1] = f"{texts[-1]}\n\n{message}"
+        else:
+            texts.append(message)
+    return texts
+
+telegram_dispatcher = TelegramDispatcher(settings.TELEGRAM_BOT_TOKEN)
+
 async def send_message(chat_id: str, message: str) -> bool:
     """
     Send a message to a Telegram chat.
@@ -33,7 +215,7 @@ def send_trade_signal(
     indicators_values: Optional[dict] = None
 ) -> bool:
     """
-    Send a trade signal notification.
+    Queue a trade signal notification.
     
     Args:
         chat_id: The chat ID where to send the message
@@ -44,7 +226,7 @@ def send_trade_signal(
         indicators_values: Dictionary with indicator values
         
     Returns:
-        bool: True if the message was sent successfully
+        bool: True if the message was queued
     """
     now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
     message = f"*{action.upper()} SIGNAL - {bot_name}*\n\n"
@@ -61,10 +243,5 @@ def send_trade_signal(
                 formatted_value = str(value)
             message += f"- {name}: *{formatted_value}*\n"
     
-    # Run in a separate thread to avoid blocking
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    result = loop.run_until_complete(send_message(chat_id, message))
-    loop.close()
-    
-    return result 
\ No newline at end of file
+    # Sent in the background, the trading loop never waits on Telegram
+    return telegram_dispatcher.enqueue(chat_id, message) 
\ No newline at end of file
@@ -0,0 +1,44 @@
+import re
+from typing import Optional
+
+import pandas as pd
+
+# "1m", "15m", "4h", "1d", "1w"
+_SUFFIX_FORMAT = re.compile(r"^(\d+)\s*(m|min|h|d|w)$", re.IGNORECASE)
+# MetaTrader style: "M1", "M15", "H4", "D1", "W1"
+_PREFIX_FORMAT = re.compile(r"^(M|H|D|W)(\d+)$", re.IGNORECASE)
+
+_UNITS = {
+    "m": "minutes",
+    "min": "minutes",
+    "h": "hours",
+    "d": "days",
+    "w": "weeks",
+}
+
+def timeframe_to_timedelta(timeframe: str) -> Optional[pd.Timedelta]:
+    """
+    Get the duration of one candle for a timeframe.
+
+    Args:
+        timeframe: Timeframe (e.g., "1h", "4h", "1d", "H4")
+
+    Returns:
+        The candle duration, or None if the timeframe is not recognised
+    """
+    if not timeframe:
+        return None
+
+    timeframe = timeframe.strip()
+
+    match = _SUFFIX_FORMAT.match(timeframe)
+    if match:
+        count, unit = match.groups()
+        return pd.Timedelta(**{_UNITS[unit.lower()]: int(count)})
+
+    match = _PREFIX_FORMAT.match(timeframe)
+    if match:
+        unit, count = match.groups()
+        return pd.Timedelta(**{_UNITS[unit.lower()]: int(count)})
+
+    return None
@@ -0,0 +1,126 @@
+"""
+Benchmark of the JSON serialization of a large backtest response.
+
+Compares FastAPI's default path (response model validation, then
+jsonable_encoder, then JSONResponse) with fast_json_response, rendered with
+orjson and with the stdlib fallback of app.utils.fastjson.
+
+Run from the backend directory:
+
+    python -m benchmarks.json_serialization --trades 20000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app import models, schemas
+from app.core.responses import fast_json_response
+from app.utils import fastjson
+
+def make_backtest(trade_count: int) -> models.Backtest:
+    """Build a completed backtest with results the size of trade_count trades"""
+    start = datetime(2024, 1, 1)
+    trades, positions, equity_curve = [], [], []
+    equity = 100.0
+
+    for i in range(trade_count):
+        entry_time = start + timedelta(hours=i)
+        exit_time = entry_time + timedelta(minutes=45)
+        entry_price = 100 + random.random() * 10
+        exit_price = entry_price * (1 + random.gauss(0, 0.01))
+        profit_loss = (exit_price - entry_price) / entry_price * 100
+        equity *= 1 + profit_loss / 100
+
+        trades.append({
+            "entry_time": entry_time.isoformat(),
+            "exit_time": exit_time.isoformat(),
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "profit_loss": profit_loss,
+            "profit_loss_amount": exit_price - entry_price,
+        })
+        positions.append({"type": "buy", "time": entry_time.isoformat(), "price": entry_price})
+        positions.append({"type": "sell", "time": exit_time.isoformat(), "price": exit_price})
+        equity_curve.append({"time": exit_time.isoformat(), "equity": equity})
+
+    return models.Backtest(
+        id=1,
+        bot_id=1,
+        user_id=1,
+        pair="BTCUSDT",
+        timeframe="1h",
+        start_date=start,
+        end_date=start + timedelta(hours=trade_count),
+        status="completed",
+        buy_condition="RSI < 30",
+        sell_condition="RSI > 70",
+        indicators_config={"RSI": {"parameters": {"period": 14}}},
+        results={
+            "total_trades": trade_count,
+            "profit_factor": 1.5,
+            "trades": trades,
+            "positions": positions,
+            "equity_curve": equity_curve,
+        },
+        total_trades=trade_count,
+        win_rate=50.0,
+        profit_factor=1.5,
+        average_profit=0.1,
+        max_drawdown=12.5,
+        sharpe_ratio=0.8,
+        created_at=start,
+        updated_at=start,
+    )
+
+def default_response(backtest: models.Backtest) -> bytes:
+    """What FastAPI does for a route returning the ORM object"""
+    model = schemas.Backtest.model_validate(backtest, from_attributes=True)
+    return JSONResponse(jsonable_encoder(model)).body
+
+def fast_response(backtest: models.Backtest) -> bytes:
+    return fast_json_response(schemas.Backtest, backtest).body
+
+def measure(fn: Callable[[], bytes], repeat: int) -> Dict[str, Any]:
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started_at)
+
+    timings.sort()
+    return {"median_ms": timings[len(timings) // 2] * 1000, "best_ms": timings[0] * 1000, "size": len(body)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, default=20000, help="Trades in the backtest results")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per serializer")
+    args = parser.parse_args()
+
+    backtest = make_backtest(args.trades)
+    orjson = fastjson.orjson
+
+    cases = [("FastAPI default (jsonable_encoder + json)", lambda: default_response(backtest))]
+    if orjson is not None:
+        cases.append(("fast_json_response (orjson)", lambda: fast_response(backtest)))
+    cases.append(("fast_json_response (stdlib fallback)", lambda: fast_response(backtest)))
+
+    print(f"Backtest with {args.trades} trades, {args.repeat} runs each")
+    baseline = None
+    for name, fn in cases:
+        fastjson.orjson = None if "fallback" in name else orjson
+        result = measure(fn, args.repeat)
+        baseline = baseline or result["median_ms"]
+        print(
+            f"{name:<45} median {result['median_ms']:9.1f} ms  best {result['best_ms']:9.1f} ms  "
+            f"{result['size'] / 1e6:6.2f} MB  x{baseline / result['median_ms']:.1f}"
+        )
+    fastjson.orjson = orjson
+
+if __name__ == "__main__":
+    main()
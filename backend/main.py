@@ -25,12 +25,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination cursor of list endpoints
 )
 
 # Include API router
 from app.api.api import api_router
 app.include_router(api_router, prefix="/api/v1")
 
+from app.auth.hashing import password_hasher
+from app.backtesting.executor import backtest_executor
+from app.bots.runtime import bot_runtime
+from app.utils.telegram import telegram_dispatcher
+from app.core.database import async_engine
+
+@app.on_event("shutdown")
+def shutdown_event():
+    bot_runtime.shutdown()
+    telegram_dispatcher.shutdown()
+    backtest_executor.shutdown(wait=False)
+    password_hasher.shutdown(wait=False)
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await async_engine.dispose()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -1,7 +1,10 @@
 #!/bin/bash
 
-# Run migrations
+# Create the tables, then run migrations. New tables are created from the
+# models by app.initial_data (create_all), migrations only change tables
+# that already exist, e.g. indexes added to them.
 python -m app.initial_data
+alembic upgrade head
 
 # Run any other startup scripts
 echo "Pre-start script completed" 
\ No newline at end of file
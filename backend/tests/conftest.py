@@ -0,0 +1,41 @@
+import os
+
+# Settings are read when the app is imported, the tests do not use these
+for name, value in {
+    "APP_NAME": "TradeForge",
+    "SECRET_KEY": "test",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_PORT": "5432",
+    "MARKET_DATA_API": "http://localhost",
+    "MARKET_DATA_API_USERNAME": "test",
+    "MARKET_DATA_API_PASSWORD": "test",
+    "TELEGRAM_BOT_TOKEN": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models  # noqa: F401, registers the tables
+from app.core.database import Base
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite database with the application tables"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    """Session on the test database"""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
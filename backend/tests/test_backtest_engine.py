@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.backtesting.engine import simulate_trades_legacy, simulate_trades_vectorized
+from app.indicators.calculator import calculate_indicators
+
+def seeded_candles(count: int = 500, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    open_ = close + rng.normal(0, 0.5, count)
+    df = pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + rng.random(count),
+            "low": np.minimum(open_, close) - rng.random(count),
+            "close": close,
+            "volume": rng.integers(1, 1000, count).astype(float),
+        },
+        index=pd.date_range("2024-01-01", periods=count, freq="1h", tz="UTC"),
+    )
+    return calculate_indicators(df, {"RSI": {"parameters": {}}, "SMA": {"parameters": {"period": 20}}})
+
+@pytest.mark.parametrize("buy_condition, sell_condition", [
+    ("RSI_14 < 40", "RSI_14 > 60"),
+    # Buy and sell signals on the same candles
+    ("close > SMA_20", "close > SMA_20"),
+    ("close > open and RSI_14 < 50", "close < open or RSI_14 > 65"),
+    # Entered on the first candle and still open on the last one
+    ("close > 0", "close < 0"),
+    # NaN warm-up values are false in both engines
+    ("SMA_20 != SMA_20 or close < SMA_20", "close > SMA_20 + 1"),
+])
+def test_vectorized_engine_matches_legacy_engine(buy_condition, sell_condition):
+    df = seeded_candles()
+
+    legacy = simulate_trades_legacy(df, buy_condition, sell_condition)
+    vectorized = simulate_trades_vectorized(df, buy_condition, sell_condition)
+
+    assert legacy["trades"]
+    for key in ("trades", "positions", "equity_curve"):
+        assert vectorized[key] == legacy[key], key
+    assert vectorized == legacy
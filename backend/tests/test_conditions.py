@@ -0,0 +1,49 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.bots.conditions import ConditionError, compile_condition
+
+@pytest.mark.parametrize("expression", [
+    '"a" * 10**10 == close',
+    'max("a", "b") == close',
+    '-"a" == close',
+    "round(5, -10**10) > close",
+    "round(close, RSI) > 1",
+    "round(close, 2.5) > 1",
+])
+def test_hostile_conditions_are_rejected(expression):
+    with pytest.raises(ConditionError):
+        compile_condition(expression)
+
+@pytest.mark.parametrize("expression", [
+    "9**9**9**9 > close",
+    "(9**10+0)**10 > close",
+    "abs(9**10)**10 > close",
+    "abs(abs(abs(9**10)**10)**10)**10 > close",
+    "round(close) ** round(close) ** 10 > 1",
+])
+def test_powers_are_computed_in_floating_point(expression):
+    condition = compile_condition(expression)
+    df = pd.DataFrame({"close": [1e300, 2.0, 3.0]})
+
+    started_at = time.perf_counter()
+    with np.errstate(over="ignore"):
+        condition.evaluate({"close": 2.0})
+        condition.evaluate_vectorized(df)
+    assert time.perf_counter() - started_at < 1
+
+@pytest.mark.parametrize("expression, expected", [
+    ("close ** 2 > 4", [False, False, True]),
+    ("close ** RSI > 7", [False, True, True]),
+    ("round(close ** 0.5, 1) == 1.4", [False, True, False]),
+    ("trend == 'up' and close > 1", [False, True, False]),
+])
+def test_conditions_match_in_both_modes(expression, expected):
+    condition = compile_condition(expression)
+    df = pd.DataFrame({"close": [1.0, 2.0, 3.0], "RSI": [1.0, 3.0, 2.0], "trend": ["up", "up", "down"]})
+
+    assert condition.evaluate_vectorized(df).tolist() == expected
+    assert [condition.evaluate(row) for row in df.to_dict("records")] == expected
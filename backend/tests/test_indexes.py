@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import insert, select, text
+
+from app import models
+
+def query_plan(db, query) -> List[str]:
+    """Details of the SQLite query plan of a query"""
+    sql = query.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+def seed_trades(db, bots: int = 20, trades_per_bot: int = 50) -> None:
+    start = datetime(2024, 1, 1)
+    db.execute(insert(models.Trade), [
+        {
+            "bot_id": bot_id,
+            "pair": "BTCUSDT",
+            "timeframe": "1h",
+            "type": "buy",
+            "quantity": 1.0,
+            "entry_time": start + timedelta(hours=i),
+            "entry_price": 100.0,
+            "exit_time": start + timedelta(hours=i, minutes=30) if i < trades_per_bot - 1 else None,
+            "exit_price": 101.0 if i < trades_per_bot - 1 else None,
+            "status": "closed" if i < trades_per_bot - 1 else "open",
+        }
+        for bot_id in range(1, bots + 1)
+        for i in range(trades_per_bot)
+    ])
+    db.execute(text("ANALYZE"))
+
+def test_open_trade_lookup_uses_index(db):
+    seed_trades(db)
+
+    # Query of TradingBot._execute, run on every candle of every bot
+    query = db.query(models.Trade).filter(
+        models.Trade.bot_id == 3,
+        models.Trade.status == "open"
+    ).limit(1)
+
+    plan = query_plan(db, query.statement)
+    assert any("ix_trades_open_bot_id" in step or "ix_trades_bot_id_status" in step for step in plan), plan
+
+def test_bot_trades_in_exit_order_use_index(db):
+    seed_trades(db)
+
+    query = select(models.Trade).where(
+        models.Trade.bot_id == 3
+    ).order_by(models.Trade.exit_time.desc(), models.Trade.id.desc()).limit(20)
+
+    plan = query_plan(db, query)
+    assert any("ix_trades_bot_id_exit_time" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+def test_backtest_listing_uses_index(db):
+    start = datetime(2024, 1, 1)
+    db.execute(insert(models.Backtest), [
+        {
+            "user_id": user_id,
+            "bot_id": 1,
+            "pair": "BTCUSDT",
+            "timeframe": "1h",
+            "start_date": start,
+            "end_date": start + timedelta(days=30),
+            "buy_condition": "close > open",
+            "sell_condition": "close < open",
+            "created_at": start + timedelta(minutes=i),
+        }
+        for user_id in range(1, 21)
+        for i in range(50)
+    ])
+    db.execute(text("ANALYZE"))
+
+    # Query of GET /backtests
+    query = select(models.Backtest).where(
+        models.Backtest.user_id == 3
+    ).order_by(models.Backtest.created_at.desc()).offset(0).limit(100)
+
+    plan = query_plan(db, query)
+    assert any("ix_backtests_user_id_created_at" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
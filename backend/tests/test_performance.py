@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from app import models
+from app.utils.performance import add_closed_trade
+
+def test_break_even_trades_count_as_neither_winning_nor_losing(db):
+    exit_time = datetime(2024, 1, 1, 12)
+    for profit_loss in (2.0, -1.0, 0.0, None):
+        add_closed_trade(db, models.Trade(
+            bot_id=1,
+            pair="BTCUSDT",
+            timeframe="1h",
+            type="buy",
+            entry_price=100.0,
+            quantity=1.0,
+            status="closed",
+            entry_time=exit_time,
+            exit_time=exit_time,
+            profit_loss=profit_loss,
+        ))
+        db.flush()
+
+    rollup = db.query(models.BotPerformanceDaily).one()
+    assert rollup.total_trades == 4
+    assert rollup.winning_trades == 1
+    assert rollup.losing_trades == 1
+    assert rollup.profit_loss_count == 3
@@ -0,0 +1,25 @@
+from app import models
+from app.indicators.config import get_indicators_config
+from app.utils.queries import QueryCounter
+
+def test_get_indicators_config_runs_one_query(db, engine):
+    indicators = [
+        models.Indicator(name=name, parameters={"period": {"default": 14}})
+        for name in ("RSI", "SMA", "EMA", "ATR", "MACD")
+    ]
+    bot = models.Bot(name="Bot", pair="BTCUSDT", timeframe="1h", user_id=1)
+    db.add_all(indicators + [bot])
+    db.flush()
+    bot_id = bot.id
+    db.add_all([
+        models.BotIndicator(bot_id=bot_id, indicator_id=indicator.id, parameters={"period": i + 5})
+        for i, indicator in enumerate(indicators)
+    ])
+    db.commit()
+
+    with QueryCounter(engine) as counter:
+        config = get_indicators_config(db, bot_id)
+
+    counter.assert_at_most(1)
+    assert list(config) == ["RSI", "SMA", "EMA", "ATR", "MACD"]
+    assert config["ATR"] == {"parameters": {"period": 8}, "base_parameters": {"period": {"default": 14}}}
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.indicators.calculator import calculate_indicators
+from app.indicators.registry import create_streaming_indicators, get_indicator
+
+INDICATORS = ["SMA", "EMA", "RSI", "MACD", "Bollinger Bands", "Stochastic", "ATR", "OBV", "ADX"]
+
+def random_candles(count: int = 300, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    open_ = close + rng.normal(0, 0.5, count)
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + rng.random(count),
+            "low": np.minimum(open_, close) - rng.random(count),
+            "close": close,
+            "volume": rng.integers(1, 1000, count).astype(float),
+        },
+        index=pd.date_range("2024-01-01", periods=count, freq="1h", tz="UTC"),
+    )
+
+@pytest.mark.parametrize("name", INDICATORS)
+def test_streaming_indicators_match_batch_values(name):
+    config = {name: {"parameters": {}}}
+    df = random_candles()
+    columns = get_indicator(name).columns(config[name])
+    expected = calculate_indicators(df, config)[columns].to_numpy()
+
+    # Closed candles are added one at a time, the last one is only peeked at
+    stream = create_streaming_indicators(config)
+    candles = df.to_dict("records")
+    streamed = []
+    for time, candle in zip(df.index[:-1], candles[:-1]):
+        streamed.append(stream.peek(candle))
+        stream.update(df.loc[[time]])
+    streamed.append(stream.peek(candles[-1]))
+
+    actual = np.array([[values[column] for column in columns] for values in streamed])
+    assert np.allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
@@ -67,6 +67,9 @@ export const backtestsApi = {
   getById: (id: number) => api.get(`/backtests/${id}`),
   create: (backtestData: any) => api.post('/backtests', backtestData),
   delete: (id: number) => api.delete(`/backtests/${id}`),
+  getSweeps: () => api.get('/backtests/sweeps'),
+  getSweep: (id: number) => api.get(`/backtests/sweeps/${id}`),
+  createSweep: (sweepData: any) => api.post('/backtests/sweeps', sweepData),
 };
 
 // Performance